@@ -0,0 +1,279 @@
+"""
+Synthetic Schwab API payloads shaped like recorded responses, generated deterministically from a seed
+"""
+
+import random
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+EPOCH = datetime(2024, 1, 2, 9, 30, tzinfo=ZoneInfo("America/New_York"))
+
+
+def symbols(count: int) -> list[str]:
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return [
+        "".join(letters[(index // 26**power) % 26] for power in range(3, -1, -1))
+        for index in range(count)
+    ]
+
+
+def quote_json(symbol: str, rng: random.Random) -> dict:
+    price = round(rng.uniform(5, 500), 2)
+    time = int(EPOCH.timestamp() * 1000) + rng.randrange(23_400_000)
+    return {
+        "assetMainType": "EQUITY",
+        "assetSubType": "COE",
+        "quoteType": "NBBO",
+        "realtime": True,
+        "ssid": rng.randrange(10**9),
+        "symbol": symbol,
+        "extended": {
+            "askPrice": price + 0.02,
+            "askSize": rng.randrange(1, 10),
+            "bidPrice": price - 0.02,
+            "bidSize": rng.randrange(1, 10),
+            "lastPrice": price,
+            "lastSize": rng.randrange(1, 500),
+            "mark": price,
+            "quoteTime": time,
+            "totalVolume": rng.randrange(10**6),
+            "tradeTime": time,
+        },
+        "fundamental": {
+            "avg10DaysVolume": rng.uniform(10**5, 10**8),
+            "avg1YearVolume": rng.uniform(10**5, 10**8),
+            "divAmount": round(rng.uniform(0, 4), 2),
+            "divFreq": 4,
+            "divPayAmount": round(rng.uniform(0, 1), 2),
+            "divYield": round(rng.uniform(0, 5), 2),
+            "eps": round(rng.uniform(-5, 20), 2),
+            "fundLeverageFactor": 0.0,
+            "peRatio": round(rng.uniform(5, 80), 2),
+            "declarationDate": "2024-02-01T05:00:00Z",
+            "divExDate": "2024-02-09T05:00:00Z",
+            "divPayDate": "2024-02-15T05:00:00Z",
+            "nextDivExDate": "2024-05-10T04:00:00Z",
+            "nextDivPayDate": "2024-05-16T04:00:00Z",
+        },
+        "quote": {
+            "52WeekHigh": round(price * 1.3, 2),
+            "52WeekLow": round(price * 0.7, 2),
+            "askMICId": "ARCX",
+            "askPrice": price + 0.01,
+            "askSize": rng.randrange(1, 20),
+            "askTime": time,
+            "bidMICId": "XNAS",
+            "bidPrice": price - 0.01,
+            "bidSize": rng.randrange(1, 20),
+            "bidTime": time,
+            "closePrice": round(price * 0.99, 2),
+            "highPrice": round(price * 1.01, 2),
+            "lastMICId": "XNAS",
+            "lastPrice": price,
+            "lastSize": rng.randrange(1, 500),
+            "lowPrice": round(price * 0.98, 2),
+            "mark": price,
+            "markChange": round(price * 0.01, 2),
+            "markPercentChange": 1.0,
+            "netChange": round(price * 0.01, 2),
+            "netPercentChange": 1.0,
+            "openPrice": round(price * 0.995, 2),
+            "quoteTime": time,
+            "securityStatus": "Normal",
+            "totalVolume": rng.randrange(10**8),
+            "tradeTime": time,
+            "volatility": rng.uniform(0, 1),
+        },
+        "reference": {
+            "cusip": f"{rng.randrange(10**9):09d}",
+            "description": f"{symbol} Common Stock",
+            "exchange": "Q",
+            "exchangeName": "NASDAQ",
+            "isHardToBorrow": False,
+            "isShortable": True,
+            "htbRate": 0,
+        },
+        "regular": {
+            "regularMarketLastPrice": price,
+            "regularMarketLastSize": rng.randrange(1, 500),
+            "regularMarketNetChange": round(price * 0.01, 2),
+            "regularMarketPercentChange": 1.0,
+            "regularMarketTradeTime": time,
+        },
+    }
+
+
+def quotes_payload(count: int, seed: int = 0) -> dict:
+    """
+    `QuoteResponse` of `count` equities with every root node
+    """
+    rng = random.Random(seed)
+    return {symbol: quote_json(symbol, rng) for symbol in symbols(count)}
+
+
+def price_history_payload(days: int, seed: int = 0) -> dict:
+    """
+    `CandleList` of regular session one-minute candles over `days` trading days
+    """
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    day = EPOCH
+    for _ in range(days):
+        while day.weekday() >= 5:
+            day += timedelta(days=1)
+        start = int(day.timestamp() * 1000)
+        for minute in range(390):
+            open_price = price
+            price = max(1.0, price + rng.gauss(0, 0.05))
+            candles.append(
+                {
+                    "open": round(open_price, 2),
+                    "high": round(max(open_price, price) + rng.uniform(0, 0.05), 2),
+                    "low": round(min(open_price, price) - rng.uniform(0, 0.05), 2),
+                    "close": round(price, 2),
+                    "volume": rng.randrange(100, 100_000),
+                    "datetime": start + minute * 60_000,
+                }
+            )
+        day += timedelta(days=1)
+
+    return {
+        "symbol": "AAPL",
+        "empty": False,
+        "previousClose": 100.0,
+        "previousCloseDate": int(EPOCH.timestamp() * 1000) - 86_400_000,
+        "candles": candles,
+    }
+
+
+def transaction_json(index: int, rng: random.Random) -> dict:
+    time = EPOCH + timedelta(minutes=index)
+    price = round(rng.uniform(5, 500), 2)
+    amount = rng.randrange(1, 200)
+    return {
+        "activityId": 10**10 + index,
+        "time": time.isoformat(),
+        "accountNumber": "12345678",
+        "type": "TRADE",
+        "status": "VALID",
+        "subAccount": "CASH",
+        "tradeDate": time.isoformat(),
+        "settlementDate": (time + timedelta(days=1)).isoformat(),
+        "positionId": 10**9 + index,
+        "orderId": 10**12 + index,
+        "netAmount": -round(price * amount, 2),
+        "activityType": "EXECUTION",
+        "transferItems": [
+            {
+                "instrument": {
+                    "assetType": "CURRENCY",
+                    "status": "ACTIVE",
+                    "symbol": "CURRENCY_USD",
+                    "description": "USD currency",
+                    "instrumentId": 1,
+                    "closingPrice": 0,
+                },
+                "amount": 0,
+                "cost": 0,
+                "feeType": fee_type,
+            }
+            for fee_type in ("COMMISSION", "SEC_FEE", "TAF_FEE")
+        ]
+        + [
+            {
+                "instrument": {
+                    "assetType": "EQUITY",
+                    "status": "ACTIVE",
+                    "symbol": "AAPL",
+                    "cusip": "037833100",
+                    "instrumentId": 1973757747,
+                    "closingPrice": price,
+                    "type": "COMMON_STOCK",
+                },
+                "amount": amount,
+                "cost": -round(price * amount, 2),
+                "price": price,
+                "positionEffect": "OPENING",
+            }
+        ],
+    }
+
+
+def transactions_payload(count: int, seed: int = 0) -> list:
+    """
+    `TransactionResponse` of `count` equity trades with fee items
+    """
+    rng = random.Random(seed)
+    return [transaction_json(index, rng) for index in range(count)]
+
+
+def order_json(index: int, rng: random.Random) -> dict:
+    entered = EPOCH + timedelta(minutes=index)
+    filled = rng.random() < 0.7
+    quantity = rng.randrange(1, 200)
+    price = round(rng.uniform(5, 500), 2)
+    order = {
+        "session": "NORMAL",
+        "duration": "DAY",
+        "orderType": "LIMIT",
+        "complexOrderStrategyType": "NONE",
+        "quantity": quantity,
+        "filledQuantity": quantity if filled else 0,
+        "remainingQuantity": 0 if filled else quantity,
+        "requestedDestination": "AUTO",
+        "destinationLinkName": "AutoRoute",
+        "price": price,
+        "orderLegCollection": [
+            {
+                "orderLegType": "EQUITY",
+                "legId": 1,
+                "instrument": {
+                    "assetType": "EQUITY",
+                    "cusip": "037833100",
+                    "symbol": "AAPL",
+                    "instrumentId": 1973757747,
+                },
+                "instruction": "BUY",
+                "positionEffect": "OPENING",
+                "quantity": quantity,
+            }
+        ],
+        "orderStrategyType": "SINGLE",
+        "orderId": 10**12 + index,
+        "cancelable": not filled,
+        "editable": not filled,
+        "status": "FILLED" if filled else "CANCELED",
+        "enteredTime": entered.isoformat(),
+        "closeTime": (entered + timedelta(seconds=5)).isoformat(),
+        "tag": "API_TOS",
+        "accountNumber": 12345678,
+    }
+    if filled:
+        order["orderActivityCollection"] = [
+            {
+                "activityType": "EXECUTION",
+                "executionType": "FILL",
+                "quantity": quantity,
+                "orderRemainingQuantity": 0,
+                "executionLegs": [
+                    {
+                        "legId": 1,
+                        "price": price,
+                        "quantity": quantity,
+                        "mismarkedQuantity": 0,
+                        "instrumentId": 1973757747,
+                        "time": (entered + timedelta(seconds=5)).isoformat(),
+                    }
+                ],
+            }
+        ]
+    return order
+
+
+def orders_payload(count: int, seed: int = 0) -> list:
+    """
+    `OrderResponse` of `count` single-leg equity orders, most of them filled
+    """
+    rng = random.Random(seed)
+    return [order_json(index, rng) for index in range(count)]
@@ -0,0 +1,309 @@
+"""
+Offline benchmarks of `FileClient` against a local Schwab API stand-in
+
+Every endpoint is called against a local HTTP server replaying a large payload (recorded responses from
+`--payloads`, `<endpoint>.json`, or generated ones) and measured for:
+
+- latency: wall time of the client call (min, median, p95, mean) in milliseconds
+- throughput: calls and payload megabytes per second
+- parse time: `json.loads` and model validation of the payload on their own, in milliseconds
+- memory: peak Python allocations during one call (tracemalloc) in megabytes
+
+Usage, from the repository root:
+
+    PYTHONPATH=src python -m benchmarks.run --output results.json
+    PYTHONPATH=src python -m benchmarks.run --compare results.json
+    PYTHONPATH=src python -m benchmarks.run --http2  # needs httpx[http2]
+
+`--compare` exits with status 1 when the median latency, parse time or peak memory of an endpoint regressed by more
+than `--threshold` against the saved results.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from urllib.parse import urlparse
+from zoneinfo import ZoneInfo
+
+from schwab_api_wrapper import FileClient, __version__
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.schemas.market_data import CandleList, QuoteResponse
+from schwab_api_wrapper.schemas.trader_api import (
+    OrderResponse,
+    TransactionResponse,
+    TransactionType,
+)
+
+from benchmarks import payloads
+from benchmarks.server import H2StandInServer, StandInServer, redirect
+
+ACCOUNT_HASH = "BENCHMARKACCOUNTHASH"
+START = datetime(2024, 1, 2, tzinfo=ZoneInfo("America/New_York"))
+
+# regression checks of `--compare`: metric -> path in the endpoint results
+COMPARED_METRICS = {
+    "latency": ("latency_ms", "median"),
+    "decode": ("parse_ms", "decode"),
+    "validate": ("parse_ms", "validate"),
+    "memory": ("memory_mb", "peak"),
+}
+
+
+@dataclass
+class Endpoint:
+    name: str
+    url: str
+    payload: object
+    call: Callable[[FileClient], tuple]
+    parse: Callable[[object], object]  # model validation as done by the client
+
+
+def endpoints(scale: float) -> list[Endpoint]:
+    quotes_count = max(1, int(500 * scale))
+
+    return [
+        Endpoint(
+            "quotes",
+            QUOTES_URL,
+            payloads.quotes_payload(quotes_count),
+            lambda client: client.quotes(payloads.symbols(quotes_count)),
+            lambda payload: QuoteResponse(**payload),
+        ),
+        Endpoint(
+            "price_history",
+            PRICE_HISTORY_URL,
+            payloads.price_history_payload(max(1, int(252 * scale))),
+            lambda client: client.price_history(
+                "AAPL",
+                PeriodFrequencyParameters(
+                    PeriodType.DAY, Period.TEN, FrequencyType.MINUTE, Frequency.ONE
+                ),
+                start_date=START,
+                end_date=START + timedelta(days=365),
+            ),
+            lambda payload: CandleList(**payload),
+        ),
+        Endpoint(
+            "get_transactions",
+            f"{TRADER_API_ENDPOINT}/accounts/{ACCOUNT_HASH}/transactions",
+            payloads.transactions_payload(max(1, int(5000 * scale))),
+            lambda client: client.get_transactions(
+                ACCOUNT_HASH,
+                START,
+                START + timedelta(days=60),
+                TransactionType.TRADE,
+            ),
+            lambda payload: TransactionResponse(payload),
+        ),
+        Endpoint(
+            "get_all_orders",
+            ORDERS_URL,
+            payloads.orders_payload(max(1, int(3000 * scale))),
+            lambda client: client.get_all_orders(START, START + timedelta(days=60)),
+            lambda payload: OrderResponse(payload),
+        ),
+    ]
+
+
+def parameters() -> dict:
+    now = datetime.now(ZoneInfo("America/New_York"))
+    return {
+        KEY_CLIENT_ID: "benchmark_client_id",
+        KEY_CLIENT_SECRET: "benchmark_client_secret",
+        KEY_URI_REDIRECT: "https://127.0.0.1",
+        KEY_TOKEN_REFRESH: "benchmark_refresh_token",
+        KEY_TOKEN_ACCESS: "benchmark_access_token",
+        KEY_TOKEN_ID: "benchmark_id_token",
+        KEY_ACCESS_TOKEN_VALID_UNTIL: (now + timedelta(days=1)).isoformat(),
+        KEY_REFRESH_TOKEN_VALID_UNTIL: (now + timedelta(days=7)).isoformat(),
+    }
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def timed(function: Callable, iterations: int) -> list[float]:
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def measure(
+    client: FileClient, endpoint: Endpoint, body: bytes, iterations: int, warmup: int
+) -> dict:
+    for _ in range(warmup):
+        _, error = endpoint.call(client)
+        if error is not None:
+            raise RuntimeError(f"{endpoint.name} failed: {error}")
+
+    latencies = timed(lambda: endpoint.call(client), iterations)
+    decode = timed(lambda: json.loads(body), iterations)
+    validate = timed(lambda: endpoint.parse(endpoint.payload), iterations)
+
+    tracemalloc.start()
+    endpoint.call(client)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = sum(latencies) / 1000
+    return {
+        "payload_bytes": len(body),
+        "iterations": iterations,
+        "latency_ms": {
+            "min": min(latencies),
+            "median": statistics.median(latencies),
+            "p95": percentile(latencies, 0.95),
+            "mean": statistics.fmean(latencies),
+        },
+        "throughput": {
+            "calls_per_second": iterations / seconds,
+            "megabytes_per_second": iterations * len(body) / seconds / 1e6,
+        },
+        "parse_ms": {
+            "decode": statistics.median(decode),
+            "validate": statistics.median(validate),
+        },
+        "memory_mb": {"peak": peak / 1e6},
+    }
+
+
+def run(
+    iterations: int,
+    warmup: int,
+    scale: float,
+    payloads_dir: Optional[str] = None,
+    only: Optional[list[str]] = None,
+    http2: bool = False,
+) -> dict:
+    selected = [
+        endpoint
+        for endpoint in endpoints(scale)
+        if only is None or endpoint.name in only
+    ]
+
+    if payloads_dir is not None:
+        for endpoint in selected:
+            filepath = os.path.join(payloads_dir, f"{endpoint.name}.json")
+            if os.path.exists(filepath):
+                with open(filepath, "r") as fin:
+                    endpoint.payload = json.load(fin)
+
+    bodies = {
+        endpoint.name: json.dumps(endpoint.payload).encode() for endpoint in selected
+    }
+    routes = {
+        urlparse(endpoint.url).path: bodies[endpoint.name] for endpoint in selected
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        parameters_file = os.path.join(directory, "parameters.json")
+        with open(parameters_file, "w") as fout:
+            json.dump(parameters(), fout)
+
+        client = FileClient(parameters_file, immediate_refresh=False, http2=http2)
+        client.account_hashes = {"12345678": ACCOUNT_HASH}
+
+        results = {}
+        server = H2StandInServer(routes) if http2 else StandInServer(routes)
+        with server:
+            redirect(client, server.url)
+            for endpoint in selected:
+                results[endpoint.name] = measure(
+                    client, endpoint, bodies[endpoint.name], iterations, warmup
+                )
+                print(
+                    f"{endpoint.name:<18} {len(bodies[endpoint.name]) / 1e6:8.2f} MB"
+                    f" | median {results[endpoint.name]['latency_ms']['median']:9.2f} ms"
+                    f" | validate {results[endpoint.name]['parse_ms']['validate']:9.2f} ms"
+                    f" | peak {results[endpoint.name]['memory_mb']['peak']:8.2f} MB"
+                )
+
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(ZoneInfo("America/New_York")).isoformat(),
+        "config": {
+            "iterations": iterations,
+            "warmup": warmup,
+            "scale": scale,
+            "http2": http2,
+        },
+        "endpoints": results,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Metrics of `results` that are more than `threshold` (a fraction) worse than in `baseline`
+    """
+    regressions = []
+    for name, endpoint in results["endpoints"].items():
+        previous = baseline["endpoints"].get(name)
+        if previous is None:
+            continue
+
+        for metric, (group, key) in COMPARED_METRICS.items():
+            before = previous[group][key]
+            after = endpoint[group][key]
+            change = (after - before) / before if before else 0.0
+            print(
+                f"{name:<18} {metric:<9} {before:10.2f} -> {after:10.2f} ({change:+.1%})"
+            )
+            if change > threshold:
+                regressions.append(f"{name} {metric} {change:+.1%}")
+
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", help="file the results are saved to as JSON")
+    parser.add_argument("--compare", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="multiplier of the payload sizes"
+    )
+    parser.add_argument(
+        "--payloads", help="directory of recorded payloads, `<endpoint>.json`"
+    )
+    parser.add_argument("--only", nargs="+", help="endpoints to run")
+    parser.add_argument("--http2", action="store_true", help="use the HTTP/2 transport")
+    args = parser.parse_args(argv)
+
+    results = run(
+        args.iterations, args.warmup, args.scale, args.payloads, args.only, args.http2
+    )
+
+    if args.output:
+        with open(args.output, "w") as fout:
+            json.dump(results, fout, indent=4)
+
+    if args.compare:
+        with open(args.compare, "r") as fin:
+            regressions = compare(results, json.load(fin), args.threshold)
+        if regressions:
+            print("Regressions: " + ", ".join(regressions))
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
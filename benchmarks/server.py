@@ -0,0 +1,232 @@
+"""
+Local stand-in for the Schwab API serving prerecorded payloads over HTTP
+"""
+
+import select
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from schwab_api_wrapper.transport import HTTPXSession
+from schwab_api_wrapper.utils import BASE_URL
+
+NOT_FOUND = b'{"errors": [{"status": 404}]}'
+
+
+class StandInServer:
+    """
+    Threaded HTTP server answering GET requests with the pre-encoded JSON body registered for the request path
+    (query parameters are ignored) and 404 otherwise. Connections are kept alive like the real API.
+    """
+
+    def __init__(self, routes: dict[str, bytes]):
+        """
+        Parameters:
+            routes: url path, e.g. `/marketdata/v1/quotes` -> encoded JSON body
+        """
+        self.routes = routes
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                body = server.routes.get(urlparse(self.path).path)
+                status = 200
+                if body is None:
+                    status, body = 404, NOT_FOUND
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join(5)
+
+
+class H2StandInServer:
+    """
+    HTTP/2 variant of `StandInServer`, over plain text with prior knowledge (h2c). The streams of a connection are
+    answered by one thread, every response held for `delay` seconds so concurrent streams can be observed.
+    Needs the `h2` package.
+    """
+
+    def __init__(self, routes: dict[str, bytes], delay: float = 0.0):
+        """
+        Parameters:
+            routes: url path, e.g. `/marketdata/v1/quotes` -> encoded JSON body
+            delay: seconds before each response is sent
+        """
+        self.routes = routes
+        self.delay = delay
+
+        self.connections = 0  # connections accepted
+        self.max_streams = 0  # most streams open at the same time on a connection
+
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self.listener.getsockname()[1]}"
+        self.thread = threading.Thread(target=self._accept, daemon=True)
+
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._closed.set()
+        try:
+            self.listener.shutdown(socket.SHUT_RDWR)  # wakes up the accept
+        except OSError:
+            pass
+        self.listener.close()
+        self.thread.join(5)
+
+    def _accept(self) -> None:
+        while not self._closed.is_set():
+            try:
+                connection, _ = self.listener.accept()
+            except OSError:
+                return
+            with self._lock:
+                self.connections += 1
+            threading.Thread(
+                target=self._serve, args=(connection,), daemon=True
+            ).start()
+
+    def _serve(self, sock: socket.socket) -> None:
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        connection = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        connection.initiate_connection()
+        sock.sendall(connection.data_to_send())
+
+        waiting: dict[int, tuple[float, bytes]] = {}  # stream id -> (send time, body)
+        sending: dict[int, bytes] = {}  # stream id -> body left to send
+
+        with sock:
+            while not self._closed.is_set():
+                timeout = 0.5
+                if waiting:
+                    ready = min(ready for ready, _ in waiting.values())
+                    timeout = max(0.0, min(timeout, ready - time.monotonic()))
+
+                readable, _, _ = select.select([sock], [], [], timeout)
+                if readable:
+                    data = sock.recv(65536)
+                    if not data:
+                        return
+                    for event in connection.receive_data(data):
+                        if isinstance(event, h2.events.RequestReceived):
+                            path = urlparse(dict(event.headers)[":path"]).path
+                            waiting[event.stream_id] = (
+                                time.monotonic() + self.delay,
+                                self.routes.get(path),
+                            )
+                            with self._lock:
+                                self.max_streams = max(
+                                    self.max_streams, len(waiting) + len(sending)
+                                )
+                        elif isinstance(event, h2.events.ConnectionTerminated):
+                            return
+
+                now = time.monotonic()
+                for stream_id, (ready, body) in list(waiting.items()):
+                    if ready > now:
+                        continue
+                    del waiting[stream_id]
+                    status = 200
+                    if body is None:
+                        status, body = 404, NOT_FOUND
+                    connection.send_headers(
+                        stream_id,
+                        [
+                            (":status", str(status)),
+                            ("content-type", "application/json"),
+                            ("content-length", str(len(body))),
+                        ],
+                    )
+                    sending[stream_id] = body
+
+                for stream_id, body in list(sending.items()):
+                    while body:
+                        window = min(
+                            connection.local_flow_control_window(stream_id),
+                            connection.max_outbound_frame_size,
+                        )
+                        if window <= 0:
+                            break
+                        connection.send_data(stream_id, body[:window])
+                        body = body[window:]
+                    if body:
+                        sending[stream_id] = body
+                    else:
+                        connection.end_stream(stream_id)
+                        del sending[stream_id]
+
+                sock.sendall(connection.data_to_send())
+
+
+class StandInAdapter(HTTPAdapter):
+    """
+    Transport adapter sending requests for the Schwab API to the stand-in server instead
+    """
+
+    def __init__(self, url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+
+    def send(self, request, **kwargs):
+        request.url = request.url.replace(BASE_URL, self.url, 1)
+        return super().send(request, **kwargs)
+
+
+class StandInHTTPXSession(HTTPXSession):
+    """
+    HTTP/2 session sending requests for the Schwab API to the `H2StandInServer` instead
+    """
+
+    def __init__(self, url: str):
+        super().__init__(http1=False)
+        self.url = url
+
+    def request(self, method: str, url: str, **kwargs):
+        return super().request(method, url.replace(BASE_URL, self.url, 1), **kwargs)
+
+
+def redirect(client, url: str) -> None:
+    """
+    Give `client` its own session pointed at the stand-in server at `url`, an HTTP/2 one if the client uses HTTP/2
+    """
+    if client.http2:
+        client.session = StandInHTTPXSession(url)
+    else:
+        client.session = requests.Session()
+        client.session.mount(BASE_URL, StandInAdapter(url))
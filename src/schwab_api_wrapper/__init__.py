@@ -3,6 +3,38 @@ from logging import NullHandler
 
 from schwab_api_wrapper.file_client import FileClient
 from schwab_api_wrapper.redis_client import RedisClient
+from schwab_api_wrapper.order_watcher import OrderWatcher
+from schwab_api_wrapper.order_store import OrderStore, OrderDelta, OrderDeltaType
+from schwab_api_wrapper.account_snapshots import (
+    AccountSnapshotCache,
+    PositionDelta,
+    PositionDeltaType,
+)
+from schwab_api_wrapper.portfolio import PositionsFrame
+from schwab_api_wrapper.trading_calendar import TradingCalendar
+from schwab_api_wrapper.market_hours_cache import MarketHoursCache
+from schwab_api_wrapper.instrument_store import InstrumentStore
+from schwab_api_wrapper.instrument_index import InstrumentIndex
+from schwab_api_wrapper.streaming import StreamClient, StreamLoginError
+from schwab_api_wrapper.quote_book import QuoteBook
+from schwab_api_wrapper.candles import CandleBuilder
+from schwab_api_wrapper.metrics import ClientMetrics, RequestRecord
+from schwab_api_wrapper.cassette import Cassette, CassetteError, CassetteMode
+from schwab_api_wrapper.retry import RetryPolicy
+from schwab_api_wrapper.hedging import HedgePolicy
+from schwab_api_wrapper.circuit_breaker import (
+    CircuitBreakers,
+    CircuitOpenError,
+    CircuitState,
+)
+from schwab_api_wrapper.timeouts import DeadlineExceeded, Timeouts, deadline
+from schwab_api_wrapper.transport import HTTPXSession
+from schwab_api_wrapper.client_pool import ClientCreationError, ClientPool
+from schwab_api_wrapper.tracing import OpenTelemetryTracer, RecordingTracer, Tracer
+from schwab_api_wrapper.account_activity import (
+    AccountActivityEvent,
+    AccountActivityStream,
+)
 
 from schwab_api_wrapper.schemas.oauth import Token
 from schwab_api_wrapper.oauth_exception import OAuthException
@@ -19,6 +51,7 @@ from schwab_api_wrapper.utils import (
 )
 
 from schwab_api_wrapper.schemas.trader_api import OrderRequest, TransactionType
+from schwab_api_wrapper.schemas.streaming import Service
 
 __version__ = "0.2.3"
 
@@ -0,0 +1,290 @@
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from zoneinfo import ZoneInfo
+
+from .base_client import BaseClient
+from .order_store import OrderDelta, OrderStore
+from .streaming import StreamClient
+
+from schwab_api_wrapper.schemas.streaming import AccountActivity, Service, StreamData
+from schwab_api_wrapper.schemas.trader_api.orders_schemas import OrderActivity
+
+
+ORDER_ID_KEYS = ("SchwabOrderID", "SchwabOrderId", "orderId", "OrderId")
+
+IGNORED_MESSAGE_TYPES = frozenset({"SUBSCRIBED", "ERROR"})
+
+
+@dataclass(frozen=True)
+class AccountActivityEvent:
+    account_number: str
+    message_type: str  # e.g. OrderAccepted, ExecutionCreated, OrderFillCompleted
+    order_id: Optional[int]
+    data: dict = field(default_factory=dict)  # decoded message data
+
+
+AccountActivityCallback = Callable[[AccountActivityEvent], None]
+OrderDeltaCallback = Callable[[list[OrderDelta]], None]
+
+
+def find_order_id(data) -> Optional[int]:
+    """
+    First order id found in the decoded message data of an ACCT_ACTIVITY message
+    """
+    if isinstance(data, dict):
+        for key in ORDER_ID_KEYS:
+            if key in data:
+                try:
+                    return int(data[key])
+                except (TypeError, ValueError):
+                    pass
+        values = data.values()
+    elif isinstance(data, list):
+        values = data
+    else:
+        return None
+
+    for value in values:
+        order_id = find_order_id(value)
+        if order_id is not None:
+            return order_id
+
+    return None
+
+
+def new_activities(delta: OrderDelta) -> list[OrderActivity]:
+    """
+    Order activities (executions) of `delta.order` that were not in the previous snapshot of the order
+    """
+    activities = delta.order.orderActivityCollection or []
+    previous = (
+        (delta.previous.orderActivityCollection or [])
+        if delta.previous is not None
+        else []
+    )
+
+    return activities[len(previous) :]
+
+
+class AccountActivityStream:
+    """
+    Order and execution events pushed by the ACCT_ACTIVITY streamer service
+
+    Every event is passed to the event listeners as soon as it arrives. Events that reference an order trigger a
+    `get_single_order` fetch, and the fetched order is merged into an `OrderStore` so the delta listeners get the
+    same `OrderDelta`s a poller would, at push latency. Fetches run on a single worker thread, in event order,
+    so the streamer thread is never blocked on HTTP.
+
+    Events sent while the stream is disconnected are lost, so after every login the stream reconciles with one
+    `get_account_orders` call per account, covering the open orders and everything entered since the previous login.
+    """
+
+    def __init__(
+        self,
+        client: BaseClient,
+        stream: StreamClient,
+        store: Optional[OrderStore] = None,
+        accounts: Optional[list[str]] = None,
+        subscription_key: str = "Account Activity",
+        reconcile_margin: timedelta = timedelta(minutes=1),
+    ):
+        """
+        Parameters:
+            client: client used to fetch orders
+            stream: streamer client the subscription is added to
+            store: order store the fetched orders are merged into, a new store by default
+            accounts: plain text account numbers reconciled after a login, every linked account by default
+            subscription_key: key of the ACCT_ACTIVITY subscription
+            reconcile_margin: how far before the previous login the reconciliation window starts
+        """
+        self.client = client
+        self.stream = stream
+        self.store = store if store is not None else OrderStore()
+        self.accounts = accounts
+        self.subscription_key = subscription_key
+        self.reconcile_margin = reconcile_margin
+
+        self.event_listeners: list[AccountActivityCallback] = []
+        self.listeners: list[OrderDeltaCallback] = []
+
+        self.last_login: Optional[datetime] = None
+
+        # running between start and stop
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._registered = False
+        self._lock = threading.Lock()
+
+    def add_event_listener(self, callback: AccountActivityCallback) -> None:
+        """
+        Register `callback(event)`, called for every account activity event
+        """
+        self.event_listeners.append(callback)
+
+    def add_listener(self, callback: OrderDeltaCallback) -> None:
+        """
+        Register `callback(deltas)`, called whenever a fetch or a reconciliation changed the order store
+        """
+        self.listeners.append(callback)
+
+    def start(self) -> None:
+        """
+        Subscribe to ACCT_ACTIVITY on the streamer. The streamer itself is started by the caller.
+
+        Does nothing if already started; a stopped stream can be started again.
+        """
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="schwab-account-activity"
+            )
+            # the streamer has no way to remove handlers, they are added once and ignore data while stopped
+            if not self._registered:
+                self.stream.add_handler(self._on_data, Service.ACCT_ACTIVITY)
+                self.stream.add_connection_listener(self._on_login)
+                self._registered = True
+
+        self.stream.subscribe(
+            Service.ACCT_ACTIVITY, [self.subscription_key], fields=[0, 1, 2, 3]
+        )
+
+    def stop(self) -> None:
+        """
+        Unsubscribe and wait for the pending fetches. Does nothing if not started.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+
+        self.stream.unsubscribe(Service.ACCT_ACTIVITY)
+        executor.shutdown(wait=True)
+
+    def _submit(self, task: Callable, *args) -> None:
+        # under the lock, so stop cannot shut the executor down in between
+        with self._lock:
+            if self._executor is None:
+                logging.getLogger(__name__).debug(
+                    f"Account activity | Stopped, {task.__name__} skipped"
+                )
+                return
+            self._executor.submit(self._run, task, *args)
+
+    @staticmethod
+    def _run(task: Callable, *args) -> None:
+        # nobody waits on the futures, failures would be lost without this
+        try:
+            task(*args)
+        except Exception:
+            logging.getLogger(__name__).exception(
+                f"Account activity | {task.__name__} failed"
+            )
+
+    def _notify(self, deltas: list[OrderDelta]) -> None:
+        if deltas:
+            for callback in self.listeners:
+                callback(deltas)
+
+    def _on_data(self, data: StreamData) -> None:
+        if self._executor is None:
+            return
+
+        for activity in data.content:
+            event = self.parse(activity)
+            if event is None:
+                continue
+
+            logging.getLogger(__name__).info(
+                f"Account activity | {event.message_type} | Order: {event.order_id}"
+            )
+
+            for callback in self.event_listeners:
+                callback(event)
+
+            if event.order_id is not None:
+                self._submit(self._fetch, event)
+
+    @staticmethod
+    def parse(activity: AccountActivity) -> Optional[AccountActivityEvent]:
+        if (
+            activity.messageType is None
+            or activity.messageType in IGNORED_MESSAGE_TYPES
+        ):
+            return None
+
+        try:
+            data = json.loads(activity.messageData) if activity.messageData else {}
+        except json.JSONDecodeError:
+            data = {}
+
+        return AccountActivityEvent(
+            activity.account or "",
+            activity.messageType,
+            find_order_id(data),
+            data if isinstance(data, dict) else {"data": data},
+        )
+
+    def _fetch(self, event: AccountActivityEvent) -> None:
+        order, error = self.client.get_single_order(
+            event.account_number, event.order_id
+        )
+        if error is not None:
+            logging.getLogger(__name__).warning(
+                f"Account activity | Unable to fetch order {event.order_id}: {error.message}"
+            )
+            return
+
+        self._notify(self.store.ingest(order))
+
+    def _on_login(self) -> None:
+        if self._executor is None:
+            return
+
+        now = datetime.now(ZoneInfo("America/New_York"))
+        with self._lock:
+            previous_login = self.last_login
+            self.last_login = now
+
+        self._submit(self.reconcile, previous_login or now)
+
+    def reconcile(self, since: datetime) -> list[OrderDelta]:
+        """
+        Merge the orders of every account entered since `since` (or since the oldest open order in the store) and
+        return the deltas
+        """
+        from_entered_time = (
+            min([order.enteredTime for order in self.store.open_orders()] + [since])
+            - self.reconcile_margin
+        )
+        now = datetime.now(ZoneInfo("America/New_York"))
+
+        accounts = self.accounts
+        if accounts is None:
+            account_hashes, error = self.client.account_hash_map()
+            if error is not None:
+                logging.getLogger(__name__).warning(
+                    f"Account activity | Unable to reconcile: {error.message}"
+                )
+                return []
+            accounts = list(account_hashes)
+
+        deltas = []
+        for account_number in accounts:
+            response, error = self.client.get_account_orders(
+                account_number, from_entered_time, now
+            )
+            if error is not None:
+                logging.getLogger(__name__).warning(
+                    f"Account activity | Unable to reconcile account orders: {error.message}"
+                )
+                continue
+            deltas.extend(self.store.ingest(response))
+
+        self._notify(deltas)
+
+        return deltas
@@ -0,0 +1,267 @@
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional
+
+from .base_client import BaseClient
+from .utils import AccountsField
+
+from schwab_api_wrapper.schemas.trader_api import (
+    Account,
+    AccountsAndTradingError,
+    Position,
+)
+
+
+class PositionDeltaType(Enum):
+    OPENED = "OPENED"
+    CHANGED = "CHANGED"
+    CLOSED = "CLOSED"
+
+
+@dataclass(frozen=True)
+class PositionDelta:
+    type: PositionDeltaType
+    encrypted_account_number: str
+    symbol: str
+    position: Optional[Position]  # None when the position was closed
+    previous: Optional[Position]  # None when the position was opened
+    quantity_change: float
+    market_value_change: float
+    day_profit_loss_change: float
+    open_profit_loss_change: float
+
+
+PositionDeltaCallback = Callable[[list[PositionDelta]], None]
+
+
+def net_quantity(position: Optional[Position]) -> float:
+    if position is None:
+        return 0.0
+    return position.longQuantity - position.shortQuantity
+
+
+def open_profit_loss(position: Optional[Position]) -> float:
+    if position is None:
+        return 0.0
+    return (position.longOpenProfitLoss or 0.0) + (position.shortOpenProfitLoss or 0.0)
+
+
+def diff_positions(
+    encrypted_account_number: str,
+    previous: Optional[Account],
+    current: Account,
+) -> list[PositionDelta]:
+    """
+    Compare the positions of two snapshots of the same account
+
+    Only quantity, market value and profit/loss changes produce a delta.
+    """
+    before = {
+        position.instrument.symbol: position
+        for position in (
+            (previous.securitiesAccount.positions or []) if previous else []
+        )
+    }
+    after = {
+        position.instrument.symbol: position
+        for position in current.securitiesAccount.positions or []
+    }
+
+    deltas = []
+    for symbol in before.keys() | after.keys():
+        old = before.get(symbol)
+        new = after.get(symbol)
+
+        if old is None:
+            delta_type = PositionDeltaType.OPENED
+        elif new is None:
+            delta_type = PositionDeltaType.CLOSED
+        else:
+            delta_type = PositionDeltaType.CHANGED
+
+        quantity_change = net_quantity(new) - net_quantity(old)
+        market_value_change = (new.marketValue if new else 0.0) - (
+            old.marketValue if old else 0.0
+        )
+        day_profit_loss_change = (new.currentDayProfitLoss if new else 0.0) - (
+            old.currentDayProfitLoss if old else 0.0
+        )
+        open_profit_loss_change = open_profit_loss(new) - open_profit_loss(old)
+
+        if delta_type == PositionDeltaType.CHANGED and not (
+            quantity_change
+            or market_value_change
+            or day_profit_loss_change
+            or open_profit_loss_change
+        ):
+            continue
+
+        deltas.append(
+            PositionDelta(
+                delta_type,
+                encrypted_account_number,
+                symbol,
+                new,
+                old,
+                quantity_change,
+                market_value_change,
+                day_profit_loss_change,
+                open_profit_loss_change,
+            )
+        )
+
+    return deltas
+
+
+class AccountSnapshotCache:
+    """
+    Shared, staleness-bounded cache of `Account` snapshots keyed by encrypted account number
+
+    Reads younger than `max_age` seconds are served from memory, so any number of consumers share one
+    `single_account`/`accounts` fetch. Every refresh is diffed against the previous snapshot and the
+    resulting position deltas are passed to the registered listeners.
+    """
+
+    def __init__(
+        self,
+        client: BaseClient,
+        max_age: float = 5.0,
+        account_field: Optional[AccountsField] = AccountsField.POSITIONS,
+    ):
+        """
+        Parameters:
+            client: client used to fetch accounts
+            max_age: seconds a snapshot is served from the cache before being refetched
+            account_field: fields requested from the accounts endpoints, positions by default
+        """
+        self.client = client
+        self.max_age = max_age
+        self.account_field = account_field
+
+        self.snapshots: dict[str, tuple[float, Account]] = {}
+        self.listeners: list[PositionDeltaCallback] = []
+
+        self._lock = threading.Lock()
+        self._fetch_locks: dict[str, threading.Lock] = {}
+
+    def add_listener(self, callback: PositionDeltaCallback) -> None:
+        """
+        Register `callback(deltas)`, called after every refresh that produced at least one delta
+        """
+        self.listeners.append(callback)
+
+    def _fetch_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._fetch_locks.setdefault(key, threading.Lock())
+
+    def _fresh(self, key: str, max_age: float) -> Optional[Account]:
+        snapshot = self.snapshots.get(key)
+        if snapshot is not None and time.monotonic() - snapshot[0] < max_age:
+            return snapshot[1]
+        return None
+
+    def _store(
+        self, encrypted_account_number: str, account: Account, fetched_at: float
+    ) -> list[PositionDelta]:
+        with self._lock:
+            previous = self.snapshots.get(encrypted_account_number)
+            self.snapshots[encrypted_account_number] = (fetched_at, account)
+
+        return diff_positions(
+            encrypted_account_number, previous[1] if previous else None, account
+        )
+
+    def _notify(self, deltas: list[PositionDelta]) -> None:
+        if deltas:
+            for callback in self.listeners:
+                callback(deltas)
+
+    def get(
+        self, encrypted_account_number: str, max_age: Optional[float] = None
+    ) -> tuple[Optional[Account], Optional[AccountsAndTradingError]]:
+        """
+        Get an account snapshot no older than `max_age` seconds (defaults to the cache's `max_age`)
+
+        Concurrent callers asking for the same stale account wait for a single fetch.
+        """
+        if max_age is None:
+            max_age = self.max_age
+
+        account = self._fresh(encrypted_account_number, max_age)
+        if account is not None:
+            return account, None
+
+        with self._fetch_lock(encrypted_account_number):
+            account = self._fresh(encrypted_account_number, max_age)
+            if account is not None:
+                return account, None
+
+            fetched_at = time.monotonic()
+            account, error = self.client.single_account(
+                encrypted_account_number, account_field=self.account_field
+            )
+            if error is not None:
+                return None, error
+
+            deltas = self._store(encrypted_account_number, account, fetched_at)
+
+        self._notify(deltas)
+
+        return account, None
+
+    def get_all(
+        self, max_age: Optional[float] = None
+    ) -> tuple[Optional[dict[str, Account]], Optional[AccountsAndTradingError]]:
+        """
+        Get snapshots of every linked account, keyed by encrypted account number, refreshing them with a single
+        `accounts()` call if any is older than `max_age` seconds
+        """
+        if max_age is None:
+            max_age = self.max_age
+
+        with self._fetch_lock(""):
+            account_hashes, error = self.client.account_hash_map()
+            if error is not None:
+                return None, error
+
+            accounts = {
+                hash_value: self._fresh(hash_value, max_age)
+                for hash_value in account_hashes.values()
+            }
+            if all(account is not None for account in accounts.values()):
+                return accounts, None
+
+            fetched_at = time.monotonic()
+            response, error = self.client.accounts(account_field=self.account_field)
+            if error is not None:
+                return None, error
+
+            accounts = {}
+            deltas = []
+            for account in response:
+                hash_value = account_hashes.get(account.securitiesAccount.accountNumber)
+                if hash_value is None:
+                    continue
+                accounts[hash_value] = account
+                deltas.extend(self._store(hash_value, account, fetched_at))
+
+        self._notify(deltas)
+
+        return accounts, None
+
+    def invalidate(self, encrypted_account_number: Optional[str] = None) -> None:
+        """
+        Mark one account's snapshot (or all snapshots) stale so the next read refetches.
+        The stale snapshot is still used as the base for the next diff.
+        """
+        with self._lock:
+            keys = (
+                list(self.snapshots)
+                if encrypted_account_number is None
+                else [encrypted_account_number]
+            )
+            for key in keys:
+                if key in self.snapshots:
+                    self.snapshots[key] = (float("-inf"), self.snapshots[key][1])
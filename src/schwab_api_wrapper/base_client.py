@@ -1,4 +1,8 @@
 import requests
+import contextvars
+import dataclasses
+import functools
+import threading
 from abc import ABC, abstractmethod
 from requests import Response
 from requests.adapters import HTTPAdapter
@@ -6,12 +10,28 @@ from requests.auth import HTTPBasicAuth
 from datetime import datetime, timedelta, date
 from typing import Union
 from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import json
 import logging
+import time
 from devtools import pformat
 from urllib.parse import quote
 from zoneinfo import ZoneInfo
 
-from .response_aware_retry import ResponseAwareRetry
+from .market_hours_cache import MarketHoursCache
+from .metrics import ClientMetrics, RequestRecord
+from .tracing import NOOP_TRACER, Tracer, traced
+from .cassette import Cassette, CassetteMode
+from .retry import RetryPolicy
+from .hedging import HedgePolicy
+from .circuit_breaker import (
+    CircuitBreakers,
+    CircuitOpenError,
+    CircuitState,
+    failed,
+)
+from .timeouts import DeadlineExceeded, Timeouts, remaining
+from .transport import HTTPXSession
 from .utils import *
 
 from schwab_api_wrapper.schemas.market_data.quotes_schemas import QuoteResponse
@@ -21,6 +41,8 @@ from schwab_api_wrapper.schemas.market_data.market_hours_schemas import (
 from schwab_api_wrapper.schemas.market_data import CandleList
 from schwab_api_wrapper.schemas.market_data.errors_schema import MarketDataError
 from schwab_api_wrapper.schemas.market_data.instruments_schemas import (
+    AssetType,
+    InstrumentResponse,
     InstrumentsRoot,
     default_instrument_response,
 )
@@ -35,6 +57,7 @@ from schwab_api_wrapper.schemas.trader_api import (
     Transaction,
     TransactionType,
 )
+from schwab_api_wrapper.schemas.trader_api import UserPreference
 from schwab_api_wrapper.schemas.trader_api.orders_schemas import (
     Order,
     OrderRequest,
@@ -54,37 +77,140 @@ from .token_censor_filter import TokenCensorFilter
 # Either this or we specifically check for a missing json field in an otherwise well-formed response
 
 
+# records of the requests sent by the current `accepts_plain_account_number` call, None outside of one
+_call_records: contextvars.ContextVar[Optional[list[RequestRecord]]] = (
+    contextvars.ContextVar("schwab_api_call_records", default=None)
+)
+
+# statuses of a request made with a stale account hash value
+STALE_HASH_STATUS_CODES = (401, 404)
+
+
+def accepts_plain_account_number(method):
+    """
+    Let a trader API method take either an encrypted or a plain text account number as its first argument.
+
+    Plain account numbers are swapped for their hash value from the client's cached account number map.
+    If the call fails with a cached hash value and a status a stale hash gets (401 or 404), the map is refreshed
+    once and the call is retried only if the account's hash value actually changed, so a failure unrelated to the
+    hash never repeats a request.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if "encrypted_account_number" in kwargs:
+            account_number = kwargs.pop("encrypted_account_number")
+        else:
+            account_number, *args = args
+        account_number = str(account_number)
+
+        encrypted_account_number = self.encrypted_account_number(account_number)
+
+        records = []
+        token = _call_records.set(records)
+        try:
+            result, error = method(self, encrypted_account_number, *args, **kwargs)
+        finally:
+            _call_records.reset(token)
+
+        if (
+            error is not None
+            and encrypted_account_number != account_number
+            and records
+            and records[-1].status_code in STALE_HASH_STATUS_CODES
+        ):
+            refreshed_account_number = self.encrypted_account_number(
+                account_number, refresh=True
+            )
+            if refreshed_account_number != encrypted_account_number:
+                result, error = method(self, refreshed_account_number, *args, **kwargs)
+
+        return result, error
+
+    return wrapper
+
+
+@dataclasses.dataclass(frozen=True)
+class TokenSnapshot:
+    """
+    OAuth tokens of a client at one point in time, replaced as a whole when they change
+    """
+
+    access_token: Optional[str] = None
+    access_token_valid_until: Optional[datetime] = None
+    refresh_token: Optional[str] = None
+    refresh_token_valid_until: Optional[datetime] = None
+    id_token: Optional[str] = None
+
+
+def token_field(name: str) -> property:
+    """
+    Client attribute reading and replacing one field of the client's `TokenSnapshot`
+    """
+
+    def getter(self):
+        return getattr(self.tokens, name)
+
+    def setter(self, value):
+        self.tokens = dataclasses.replace(self.tokens, **{name: value})
+
+    return property(getter, setter)
+
+
 class BaseClient(ABC):
+    """
+    Client of the Schwab trader and market data APIs, subclasses store the OAuth tokens
+
+    A client can be shared by worker threads. Every client has its own session, token refreshes are serialized by a
+    lock so an expired access token is refreshed once while the other threads wait for it, and the tokens are kept in
+    an immutable `TokenSnapshot` replaced as a whole, so a request never reads the token of one refresh and the
+    expiration of another.
+    """
+
     parameters: dict = None
 
     client_id: str = None  # client id is "app key" on the dev site
     client_secret: str = None  # client secret is the "app secret" on dev site
     redirect_uri: str = None  # "callback url" on dev site
-    refresh_token: str = None
-    access_token: str = None
-    id_token: str = None
-    refresh_token_valid_until: datetime = None
-    access_token_valid_until: datetime = None
-
-    retry_strategy = ResponseAwareRetry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 501, 502, 503],
-        allowed_methods=["GET"],
-    )
 
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    tokens: TokenSnapshot = TokenSnapshot()
+    refresh_token = token_field("refresh_token")
+    access_token = token_field("access_token")
+    id_token = token_field("id_token")
+    refresh_token_valid_until = token_field("refresh_token_valid_until")
+    access_token_valid_until = token_field("access_token_valid_until")
 
-    retry_session = requests.Session()
-    retry_session.mount("http://", adapter)
-    retry_session.mount("https://", adapter)
+    account_hashes: dict[str, str] = None  # plain text account number -> hash value
 
-    session = requests.Session()
+    session: requests.Session = None  # or `HTTPXSession`, created for each client
+    # transport adapter mounted on the client's sessions, e.g. a connection pool shared by a `ClientPool`
+    adapter: Optional[HTTPAdapter] = None
+
+    tracer: Tracer = NOOP_TRACER  # spans of the request pipeline, see `tracing`
+    cassette: Optional[Cassette] = (
+        None  # records or replays the requests, see `cassette`
+    )
 
     # Instantiate and configure the global filter
     token_filter = TokenCensorFilter()
     logging.getLogger(__name__).addFilter(token_filter)
 
+    def __init__(self, http2: bool = False):
+        """
+        Parameters:
+            http2: send the requests over HTTP/2 with httpx (`HTTPXSession`), requires the `httpx[http2]` package
+        """
+        self.http2 = http2
+        self.session = HTTPXSession() if http2 else self.__new_session()
+        self._refresh_lock = threading.RLock()
+
+        self.metrics = ClientMetrics()
+        self.timeouts = Timeouts()  # connect and read timeouts per endpoint
+        self.retry_policy = RetryPolicy()  # applied to the requests made with `retry`
+        self.hedge_policy: Optional[HedgePolicy] = None  # no hedged requests if None
+        # fail fast while an endpoint group is down, e.g. `CircuitBreakers()`, no circuit breaking if None
+        self.circuit_breakers: Optional[CircuitBreakers] = None
+
     def assert_refresh_token_not_expired(self, renew_refresh_token) -> None:
         if (
             not renew_refresh_token
@@ -104,7 +230,8 @@ class BaseClient(ABC):
     @property
     def need_refresh(self) -> bool:
         return (
-            datetime.now(ZoneInfo("America/New_York")) >= self.access_token_valid_until
+            datetime.now(ZoneInfo("America/New_York"))
+            >= self.tokens.access_token_valid_until
         )
 
     @property
@@ -112,34 +239,58 @@ class BaseClient(ABC):
         """
         Return's headers containing access token authorization. If access token is invalid, token will be refreshed here
         """
-        if self.need_refresh:
-            self.refresh()
+        with self.tracer.start_span("schwab_api.auth") as span:
+            if self.need_refresh:
+                with self._refresh_lock:
+                    # another thread may have refreshed the token while this one waited
+                    if self.need_refresh:
+                        span.set_attribute("schwab_api.token.refreshed", True)
+                        self.refresh()
 
         return {
             "accept": "application/json",
-            "Authorization": f"Bearer {self.access_token}",
+            "Authorization": f"Bearer {self.tokens.access_token}",
         }
 
     def get_refresh_token_expiration(self) -> datetime:
         return self.refresh_token_valid_until
 
     def refresh(self):
-        token, error = self.refresh_access_token()
+        with self._refresh_lock:
+            token, error = self.refresh_access_token()
 
-        if error is not None:
-            raise OAuthException(
-                f"Unable to generate refresh token", error, self.parameters
-            )
+            if error is not None:
+                raise OAuthException(
+                    f"Unable to generate refresh token", error, self.parameters
+                )
+
+            self.save_token(token)
 
-        self.save_token(token)
+            # requests in flight keep the session they started with
+            if (
+                not self.http2
+            ):  # the HTTP/2 session is kept, its connection is multiplexed
+                self.session = self.__new_session()
 
-        self.retry_session = requests.Session()
-        self.retry_session.mount("http://", self.adapter)
-        self.retry_session.mount("https://", self.adapter)
+            self.configurable_refresh()
 
-        self.session = requests.Session()
+    def __new_session(self) -> requests.Session:
+        session = requests.Session()
+        if self.adapter is not None:
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+        return session
 
-        self.configurable_refresh()
+    def mount(self, adapter: HTTPAdapter) -> None:
+        """
+        Send the requests of the client through `adapter`, on the current session and the ones created by later
+        token refreshes. Not available with the HTTP/2 transport.
+        """
+        if self.http2:
+            raise ValueError("Adapters cannot be mounted on the HTTP/2 session")
+        self.adapter = adapter
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def app_authorization(self) -> str:
         # request template:
@@ -154,11 +305,8 @@ class BaseClient(ABC):
             "App Authorization Params:\n" + pformat(params)
         )
 
-        response = self.__get(AUTH_URL, params=params)
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{AUTH_URL}` | Status: {response.status_code}"
-        )
+        response = self.__request("GET", AUTH_URL, "app_authorization", params=params)
+        self.__complete(response)
 
         assert (
             response.status_code == STATUS_CODE_FORBIDDEN
@@ -194,15 +342,15 @@ class BaseClient(ABC):
         return self.__get_token(payload)
 
     def __get_token(self, payload) -> tuple[Optional[Token], Optional[OAuthError]]:
-        response = requests.post(
+        response = self.__request(
+            "POST",
             TOKEN_URL,
+            "token",
+            session=requests,  # token requests are not sent with the client sessions
             auth=HTTPBasicAuth(username=self.client_id, password=self.client_secret),
             data=payload,
         )
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | POST `{TOKEN_URL}` | Status: {response.status_code}"
-        )
+        self.__complete(response)
 
         if response.status_code == STATUS_CODE_OK:
             token = Token(**response.json())
@@ -263,31 +411,31 @@ class BaseClient(ABC):
 
         self.redirect_uri = parameters[KEY_URI_REDIRECT]  # "callback url" on dev site
 
-        self.refresh_token = parameters[KEY_TOKEN_REFRESH]
-        self.access_token = parameters[KEY_TOKEN_ACCESS]
-        self.id_token = parameters[KEY_TOKEN_ID]
-        self.refresh_token_valid_until = datetime.fromisoformat(
-            parameters[KEY_REFRESH_TOKEN_VALID_UNTIL]
-        )
-        self.access_token_valid_until = datetime.fromisoformat(
-            parameters[KEY_ACCESS_TOKEN_VALID_UNTIL]
+        self.tokens = TokenSnapshot(
+            access_token=parameters[KEY_TOKEN_ACCESS],
+            access_token_valid_until=datetime.fromisoformat(
+                parameters[KEY_ACCESS_TOKEN_VALID_UNTIL]
+            ),
+            refresh_token=parameters[KEY_TOKEN_REFRESH],
+            refresh_token_valid_until=datetime.fromisoformat(
+                parameters[KEY_REFRESH_TOKEN_VALID_UNTIL]
+            ),
+            id_token=parameters[KEY_TOKEN_ID],
         )
 
     def update_parameters(self, token: Token, refresh_token_reset: bool = False):
-        self.refresh_token = token.refresh_token  # valid for 7 days
-        if refresh_token_reset:
-            self.refresh_token_valid_until = datetime.now(
-                ZoneInfo("America/New_York")
-            ) + timedelta(
-                days=7
-            )  # utc time refresh token is valid until
-        self.access_token = token.access_token  # valid for 30 minutes
-        self.access_token_valid_until = datetime.now(
-            ZoneInfo("America/New_York")
-        ) + timedelta(
-            seconds=1800
-        )  # utc time when access token is invalid
-        self.id_token = token.id_token
+        now = datetime.now(ZoneInfo("America/New_York"))
+        self.tokens = TokenSnapshot(
+            access_token=token.access_token,  # valid for 30 minutes
+            access_token_valid_until=now + timedelta(seconds=1800),
+            refresh_token=token.refresh_token,  # valid for 7 days
+            refresh_token_valid_until=(
+                now + timedelta(days=7)
+                if refresh_token_reset
+                else self.tokens.refresh_token_valid_until
+            ),
+            id_token=token.id_token,
+        )
 
         self.parameters[KEY_ACCESS_TOKEN_VALID_UNTIL] = (
             self.access_token_valid_until.isoformat()
@@ -320,26 +468,371 @@ class BaseClient(ABC):
 
         return self.__get_token(payload)
 
+    def __request(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        retry: bool = False,
+        session=None,
+        idempotent: Optional[bool] = None,
+        **kwargs,
+    ) -> Response:
+        """
+        Send a request and start its `RequestRecord`, attached to the response as `response.record`.
+        The record is published to `self.metrics` once the response is parsed, or by `__complete`, and right away
+        with the exception class as `error` when no response is returned.
+        Raises `CircuitOpenError` without sending the request while the circuit of the endpoint is open, and
+        `DeadlineExceeded` once the deadline of the call (see `timeouts.deadline`) has passed.
+
+        Parameters:
+            method: HTTP method
+            url: request url
+            endpoint: name of the endpoint in the metrics, the client method name
+            retry: repeat the request on transient failures following `self.retry_policy`
+            session: session sending the request, `self.session` by default
+            idempotent: whether the request can be repeated safely, decided by its method if None
+            kwargs: arguments of `requests.Session.request`
+        """
+        if session is None:
+            session = self.session
+
+        policy = self.retry_policy
+        retries = policy.retries(endpoint) if retry else 0
+        if retry:
+            policy.budget(endpoint).deposit()
+
+        breaker = (
+            self.circuit_breakers.breaker(endpoint)
+            if self.circuit_breakers is not None
+            else None
+        )
+
+        record = RequestRecord(endpoint, method, url)
+        records = _call_records.get()
+        if records is not None:
+            records.append(record)
+
+        start = time.perf_counter()
+        try:
+            with self.tracer.start_span(
+                "schwab_api.http",
+                {
+                    "http.request.method": method,
+                    "url.full": url,
+                    "schwab_api.endpoint": endpoint,
+                },
+            ) as span:
+                exhausted = False
+                while True:
+                    left = remaining()
+                    if left is not None and left <= 0:
+                        if record.retries == 0:
+                            raise DeadlineExceeded(
+                                f"Deadline exceeded before {method} `{url}`", url
+                            )
+                        exhausted = True
+                        break
+
+                    if breaker is not None and not breaker.allow():
+                        if record.retries == 0:
+                            raise CircuitOpenError(
+                                f"Circuit of {breaker.group} is open",
+                                breaker.group,
+                                breaker.retry_at,
+                            )
+                        exhausted = True
+                        break
+
+                    try:
+                        response, exception = self.__attempt(
+                            session,
+                            method,
+                            url,
+                            endpoint,
+                            record,
+                            {
+                                "timeout": self.timeouts.timeout(endpoint, left),
+                                **kwargs,
+                            },
+                        )
+                    except BaseException:
+                        if breaker is not None:
+                            breaker.release()
+                        raise
+                    if breaker is not None:
+                        if failed(response, exception):
+                            breaker.failure()
+                        else:
+                            breaker.success()
+
+                    if not retry or not policy.retryable(
+                        method, response, exception, idempotent
+                    ):
+                        break
+
+                    if record.retries >= retries or (
+                        breaker is not None and breaker.state == CircuitState.OPEN
+                    ):
+                        exhausted = True
+                        break
+                    delay = policy.backoff(record.retries + 1, response)
+                    left = remaining()
+                    if (
+                        delay is None
+                        or (left is not None and delay >= left)
+                        or not policy.budget(endpoint).withdraw()
+                    ):
+                        exhausted = True
+                        break
+
+                    record.retries += 1
+                    reason = (
+                        repr(exception)
+                        if exception is not None
+                        else f"status {response.status_code}"
+                    )
+                    logging.getLogger(__name__).info(
+                        f"Schwab API | {method} `{url}` | Retry {record.retries} in {delay:.2f}s after {reason}"
+                    )
+                    with self.tracer.start_span(
+                        "schwab_api.retry",
+                        {
+                            "http.request.resend_count": record.retries,
+                            "schwab_api.delay": delay,
+                        },
+                    ):
+                        policy.sleep(delay)
+                record.network_time = time.perf_counter() - start
+
+                if record.retries:
+                    span.set_attribute("http.request.resend_count", record.retries)
+                if record.hedged:
+                    span.set_attribute("schwab_api.hedged", True)
+                    span.set_attribute("schwab_api.hedge_won", record.hedge_won)
+                if exhausted:
+                    span.set_error("Maximum number of retries reached")
+                    logging.getLogger(__name__).warning(
+                        "Maximum number of retries reached."
+                    )
+                if exception is not None:
+                    raise exception
+                if exhausted:
+                    self.__mark_exhausted(response)
+
+                record.status_code = response.status_code
+                record.bytes_received = len(response.content or b"")
+                response.record = record
+
+                span.set_attribute("http.response.status_code", response.status_code)
+                span.set_attribute("http.response.body.size", record.bytes_received)
+        except BaseException as e:
+            # the request failed without a response to parse, e.g. network error, open circuit or deadline
+            record.network_time = time.perf_counter() - start
+            record.error = type(e).__name__
+            self.metrics.record(record)
+            raise
+
+        logging.getLogger(__name__).info(
+            f"Schwab API | {method} `{url}` | Status: {response.status_code}"
+        )
+
+        return response
+
+    def __attempt(
+        self,
+        session,
+        method: str,
+        url: str,
+        endpoint: str,
+        record: RequestRecord,
+        kwargs: dict,
+    ) -> tuple[Optional[Response], Optional[Exception]]:
+        """
+        Send the request once, from the cassette when replaying, and return the response or the network error
+        """
+        if self.cassette is not None and self.cassette.mode == CassetteMode.REPLAY:
+            return self.cassette.play(method, url, kwargs.get("params")), None
+
+        hedge_policy = self.hedge_policy
+        if hedge_policy is not None and hedge_policy.hedged(method, endpoint):
+            response, exception = self.__send_hedged(
+                hedge_policy, session, method, url, endpoint, record, kwargs
+            )
+        else:
+            response, exception = self.__send(session, method, url, kwargs)
+
+        if response is not None and self.cassette is not None:
+            self.cassette.record(method, url, kwargs.get("params"), response)
+        return response, exception
+
+    @staticmethod
+    def __send(
+        session, method: str, url: str, kwargs: dict
+    ) -> tuple[Optional[Response], Optional[Exception]]:
+        try:
+            return session.request(method, url, **kwargs), None
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            return None, e
+
+    def __send_hedged(
+        self,
+        policy: HedgePolicy,
+        session,
+        method: str,
+        url: str,
+        endpoint: str,
+        record: RequestRecord,
+        kwargs: dict,
+    ) -> tuple[Optional[Response], Optional[Exception]]:
+        """
+        Send the request, and its hedge if no response arrived after the hedge delay; the first response wins.
+        Both go through the policy's thread pool, which bounds the threads hedged requests use. The delay runs from
+        when the request leaves the pool's queue, so queueing cannot trigger hedges.
+        """
+        budget = policy.budget(endpoint)
+        budget.deposit()
+
+        sent: Optional[float] = None
+        started = threading.Event()
+
+        def send() -> tuple[Optional[Response], Optional[Exception]]:
+            nonlocal sent
+            sent = time.perf_counter()
+            started.set()
+            return self.__send(session, method, url, kwargs)
+
+        primary = policy.executor.submit(contextvars.copy_context().run, send)
+        primary.add_done_callback(lambda _: started.set())  # cancelled in the queue
+        futures = [primary]
+        winner = None
+
+        try:
+            started.wait()
+            if not primary.done():
+                wait(
+                    futures, timeout=sent + policy.delay(endpoint) - time.perf_counter()
+                )
+            if not primary.done() and budget.withdraw():
+                record.hedged = True
+                futures.append(
+                    policy.executor.submit(
+                        contextvars.copy_context().run,
+                        self.__send,
+                        session,
+                        method,
+                        url,
+                        kwargs,
+                    )
+                )
+                logging.getLogger(__name__).info(
+                    f"Schwab API | {method} `{url}` | Hedge sent"
+                )
+
+            pending = set(futures)
+            while True:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                # a response wins over a network error or an exception, unless no request is left
+                winner = min(done, key=self.__lost)
+                if not self.__lost(winner) or not pending:
+                    break
+
+            response, exception = winner.result()
+        finally:
+            # on every path, including a raising winner, nothing sent is left holding a connection
+            for future in futures:
+                if future is not winner and not future.cancel():
+                    future.add_done_callback(self.__discard)
+
+        record.hedge_won = winner is not primary
+        if response is not None:
+            # from the request, so a winning hedge counts the delay it was sent after
+            policy.observe(endpoint, time.perf_counter() - sent)
+        return response, exception
+
+    @staticmethod
+    def __lost(future: Future) -> bool:
+        return future.exception() is not None or future.result()[0] is None
+
+    @staticmethod
+    def __discard(future: Future) -> None:
+        """
+        Release the connection of the losing request of a hedge
+        """
+        if future.exception() is not None:
+            return
+        response, _ = future.result()
+        if response is not None:
+            response.close()
+
+    @staticmethod
+    def __mark_exhausted(response: Response) -> None:
+        """
+        Add the retries exhaustion message to the JSON body of the last response
+        """
+        try:
+            body = json.loads(response.content or b"{}")
+        except ValueError:
+            body = {}
+        if not isinstance(body, dict):
+            body = {}
+
+        body["message"] = "Maximum number of retries reached"
+        response._content = json.dumps(body).encode("utf-8")
+
     def __get(
         self,
         url: str,
+        endpoint: str,
         params: Optional[dict] = None,
         retry: bool = False,
         headers: Optional[dict] = None,
     ) -> Response:
-        if retry:
+        return self.__request(
+            "GET", url, endpoint, retry=retry, params=params, headers=headers
+        )
+
+    def __complete(self, response: Response) -> None:
+        self.metrics.record(response.record)
+
+    def __decode(self, response: Response):
+        with self.tracer.start_span("schwab_api.decode"):
+            start = time.perf_counter()
             try:
-                response = self.retry_session.get(url, params=params, headers=headers)
-            except requests.exceptions.RetryError as e:
-                response = e.args[0].response
-                logging.getLogger(__name__).warning(
-                    "Maximum number of retries reached."
-                )
-        else:
-            response = self.session.get(url, params=params, headers=headers)
+                data = response.json()
+            except ValueError:
+                self.__complete(response)
+                raise
+            response.record.decode_time = time.perf_counter() - start
 
-        return response
+        if logging.getLogger(__name__).isEnabledFor(logging.DEBUG):
+            logging.getLogger(__name__).debug("Response JSON:\n" + pformat(data))
 
+        return data
+
+    def __validate(self, response: Response, model, data):
+        with self.tracer.start_span(
+            "schwab_api.validate", {"schwab_api.model": model.__name__}
+        ):
+            start = time.perf_counter()
+            try:
+                return model.model_validate(data)
+            finally:
+                response.record.validation_time = time.perf_counter() - start
+                self.__complete(response)
+
+    def __parse(self, response: Response, model, error_model) -> tuple:
+        """
+        Decode the response body and validate it as `model` if the status is 200 OK, as `error_model` otherwise
+        """
+        data = self.__decode(response)
+
+        if response.status_code == STATUS_CODE_OK:
+            return self.__validate(response, model, data), None
+        else:
+            return None, self.__validate(response, error_model, data)
+
+    @traced
     def quotes(
         self,
         symbols: list[str],
@@ -367,20 +860,12 @@ class BaseClient(ABC):
         logging.getLogger(__name__).debug("Quotes Params:\n" + pformat(params))
 
         response = self.__get(
-            QUOTES_URL, params=params, headers=self.headers, retry=retry
+            QUOTES_URL, "quotes", params=params, headers=self.headers, retry=retry
         )
 
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{QUOTES_URL}` | Status: {response.status_code}"
-        )
-
-        logging.getLogger(__name__).debug("Response JSON:\n" + pformat(response.json()))
-
-        if response.status_code == STATUS_CODE_OK:
-            return QuoteResponse(**response.json()), None
-        else:
-            return None, MarketDataError(**response.json())
+        return self.__parse(response, QuoteResponse, MarketDataError)
 
+    @traced
     def instruments(
         self, symbols: list[str], projection: Projection, retry: bool = False
     ) -> tuple[Optional[InstrumentsRoot], Optional[MarketDataError]]:
@@ -398,27 +883,99 @@ class BaseClient(ABC):
         logging.getLogger(__name__).debug("Instruments Params:\n" + pformat(params))
 
         response = self.__get(
-            INSTRUMENTS_URL, params=params, headers=self.headers, retry=retry
-        )
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{INSTRUMENTS_URL}` | Status: {response.status_code}"
+            INSTRUMENTS_URL,
+            "instruments",
+            params=params,
+            headers=self.headers,
+            retry=retry,
         )
 
-        logging.getLogger(__name__).debug("Response JSON:\n" + pformat(response.json()))
+        data = self.__decode(response)
 
         if response.status_code == STATUS_CODE_OK:
-            data = response.json()
-            if len(data) == 1:
-                return InstrumentsRoot(**response.json()), None
-            else:
-                instruments = [
-                    default_instrument_response(symbol) for symbol in symbols
-                ]
-                return InstrumentsRoot(instruments=instruments), None
+            root = self.__validate(
+                response,
+                InstrumentsRoot,
+                {"instruments": data.get("instruments", [])},
+            )
+
+            if projection in (Projection.SYMBOL_SEARCH, Projection.FUNDAMENTAL):
+                # symbols Schwab doesn't know are left out of the response
+                returned = {
+                    instrument.symbol.upper() for instrument in root.instruments
+                }
+                root.instruments.extend(
+                    default_instrument_response(symbol)
+                    for symbol in symbols
+                    if symbol.upper() not in returned
+                )
+
+            return root, None
         else:
-            return None, MarketDataError(**response.json())
+            return None, self.__validate(response, MarketDataError, data)
+
+    @traced
+    def instruments_map(
+        self,
+        symbols: list[str],
+        projection: Projection = Projection.FUNDAMENTAL,
+        chunk_size: int = 100,
+        max_workers: int = 8,
+        retry: bool = False,
+    ) -> tuple[Optional[dict[str, InstrumentResponse]], Optional[MarketDataError]]:
+        """
+        Get Instruments details of many symbols, splitting them into chunks fetched concurrently
+
+        Parameters:
+            symbols: list of symbols of a security
+            projection: symbol-search or fundamental
+            chunk_size: maximum number of symbols per request
+            max_workers: maximum number of concurrent requests
+            retry: retry the requests if they fail
+
+        Returns the instruments keyed by upper-case symbol. Symbols unknown to Schwab are left out.
+        """
+
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        chunks = [
+            symbols[start : start + chunk_size]
+            for start in range(0, len(symbols), chunk_size)
+        ]
+
+        logging.getLogger(__name__).debug(
+            f"Instruments Map: {len(symbols)} symbols in {len(chunks)} requests"
+        )
+
+        instruments: dict[str, InstrumentResponse] = {}
 
+        if not chunks:
+            return instruments, None
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            # each request runs in a copy of the caller's context so its spans keep their parent
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self.instruments,
+                    chunk,
+                    projection,
+                    retry,
+                )
+                for chunk in chunks
+            ]
+            results = [future.result() for future in futures]
+
+        for response, error in results:
+            if error is not None:
+                return None, error
+
+            for instrument in response.instruments:
+                if instrument.assetType != AssetType.UNKNOWN:
+                    instruments[instrument.symbol.upper()] = instrument
+
+        return instruments, None
+
+    @traced
     def market_hours(
         self,
         markets: list[MarketID],
@@ -456,20 +1013,16 @@ class BaseClient(ABC):
         logging.getLogger(__name__).debug("Market Hours Params:\n" + pformat(params))
 
         response = self.__get(
-            MARKET_HOURS_URL, params=params, headers=self.headers, retry=retry
-        )
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{MARKET_HOURS_URL}` | Status: {response.status_code}"
+            MARKET_HOURS_URL,
+            "market_hours",
+            params=params,
+            headers=self.headers,
+            retry=retry,
         )
 
-        logging.getLogger(__name__).debug("Response JSON:\n" + pformat(response.json()))
-
-        if response.status_code == STATUS_CODE_OK:
-            return MarketHoursResponse(**response.json()), None
-        else:
-            return None, MarketDataError(**response.json())
+        return self.__parse(response, MarketHoursResponse, MarketDataError)
 
+    @traced
     def single_market_hours(
         self,
         market_id: MarketID,
@@ -508,20 +1061,106 @@ class BaseClient(ABC):
         )
 
         response = self.__get(
-            single_market_hours_url, params=params, headers=self.headers, retry=retry
+            single_market_hours_url,
+            "single_market_hours",
+            params=params,
+            headers=self.headers,
+            retry=retry,
         )
 
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{single_market_hours_url}` | Status: {response.status_code}"
+        return self.__parse(response, MarketHoursResponse, MarketDataError)
+
+    @traced
+    def market_hours_range(
+        self,
+        markets: list[MarketID],
+        start: date,
+        end: date,
+        cache: Optional[MarketHoursCache] = None,
+        max_workers: int = 8,
+        retry: bool = True,
+    ) -> tuple[Optional[dict[date, MarketHoursResponse]], Optional[MarketDataError]]:
+        """
+        Get market hours for every date in [start, end], fetching dates concurrently
+
+        Parameters:
+            markets: list of markets, available values: equity, option, bond, future, forex
+            start: first date, must be within [today, today + 1 year] unless cached
+            end: last date, must be within [today, today + 1 year] unless cached
+            cache: dates found in the cache are not fetched, fetched dates are added to it and the cache is saved
+            max_workers: maximum number of concurrent requests
+            retry: retry the requests if they fail
+
+        Raises:
+            ValueError: if end is before start, or a date to fetch is outside [today, today + 1 year]
+        """
+
+        if end < start:
+            raise ValueError(f"End date ({end}) is before start date ({start})")
+
+        query_dates = [
+            start + timedelta(days=offset) for offset in range((end - start).days + 1)
+        ]
+
+        hours: dict[date, MarketHoursResponse] = {}
+        missing_dates = []
+
+        for query_date in query_dates:
+            cached = cache.get(query_date, markets) if cache is not None else None
+            if cached is not None:
+                hours[query_date] = cached
+            else:
+                missing_dates.append(query_date)
+
+        # checked here, the requests run in worker threads
+        today = datetime.now(ZoneInfo("America/New_York")).date()
+        range_ending = today + timedelta(days=365)
+        outside = [d for d in missing_dates if not today <= d <= range_ending]
+        if outside:
+            raise ValueError(
+                f"Query dates {outside[0]} to {outside[-1]} outside range [today ({today}), today + 1 year ({range_ending})]"
+            )
+
+        logging.getLogger(__name__).debug(
+            f"Market Hours Range: {len(hours)} dates cached, {len(missing_dates)} to fetch"
         )
 
-        logging.getLogger(__name__).debug("Response JSON:\n" + pformat(response.json()))
+        error = None
+
+        if missing_dates:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(missing_dates))
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        self.market_hours,
+                        markets,
+                        query_date,
+                        retry,
+                    )
+                    for query_date in missing_dates
+                ]
+                results = [future.result() for future in futures]
 
-        if response.status_code == STATUS_CODE_OK:
-            return MarketHoursResponse(**response.json()), None
-        else:
-            return None, MarketDataError(**response.json())
+                for query_date, (response, date_error) in zip(missing_dates, results):
+                    if date_error is not None:
+                        error = error or date_error
+                        continue
+
+                    hours[query_date] = response
+                    if cache is not None:
+                        cache.put(query_date, markets, response)
+
+            if cache is not None:
+                cache.dump()
 
+        if error is not None:
+            return None, error
+
+        return dict(sorted(hours.items())), None
+
+    @traced
     def price_history(
         self,
         symbol: str,
@@ -565,20 +1204,16 @@ class BaseClient(ABC):
         logging.getLogger(__name__).debug("Price History Params:\n" + pformat(params))
 
         response = self.__get(
-            PRICE_HISTORY_URL, params=params, headers=self.headers, retry=retry
-        )
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{PRICE_HISTORY_URL}` | Status: {response.status_code}"
+            PRICE_HISTORY_URL,
+            "price_history",
+            params=params,
+            headers=self.headers,
+            retry=retry,
         )
 
-        logging.getLogger(__name__).debug("Response JSON:\n" + pformat(response.json()))
-
-        if response.status_code == STATUS_CODE_OK:
-            return CandleList(**response.json()), None
-        else:
-            return None, MarketDataError(**response.json())
+        return self.__parse(response, CandleList, MarketDataError)
 
+    @traced
     def account_numbers(
         self, retry: bool = False
     ) -> tuple[Optional[AccountNumbersResponse], Optional[AccountsAndTradingError]]:
@@ -590,22 +1225,81 @@ class BaseClient(ABC):
         and use encrypted account values for all subsequent calls for any accountNumber request.
         """
 
-        response = self.__get(ACCOUNT_NUMBERS_URL, headers=self.headers, retry=retry)
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{ACCOUNT_NUMBERS_URL}` | Status: {response.status_code}"
+        response = self.__get(
+            ACCOUNT_NUMBERS_URL, "account_numbers", headers=self.headers, retry=retry
         )
 
-        logging.getLogger(__name__).debug("Response JSON:\n" + pformat(response.json()))
+        return self.__parse(response, AccountNumbersResponse, AccountsAndTradingError)
 
-        if response.status_code == STATUS_CODE_OK:
-            return (
-                AccountNumbersResponse(response.json()),
-                None,
-            )  # response.json() is a list if 200 OK so don't destructure
-        else:
-            return None, AccountsAndTradingError(**response.json())
+    def account_hash_map(
+        self, refresh: bool = False
+    ) -> tuple[Optional[dict[str, str]], Optional[AccountsAndTradingError]]:
+        """
+        Get the cached (plain text account number -> hash value) map
+
+        The map is loaded from the client's persistent store (see `load_account_hashes`) or fetched with
+        `account_numbers()` the first time it is needed, and refetched when `refresh` is set.
+        """
+        if not refresh and self.account_hashes:
+            return self.account_hashes, None
+
+        if not refresh:
+            account_hashes = self.load_account_hashes()
+            if account_hashes:
+                self.account_hashes = account_hashes
+                return self.account_hashes, None
+
+        account_numbers, error = self.account_numbers(retry=True)
+
+        if error is not None:
+            return None, error
+
+        self.account_hashes = {
+            account_hash.accountNumber: account_hash.hashValue
+            for account_hash in account_numbers
+        }
+        self.dump_account_hashes(self.account_hashes)
+
+        return self.account_hashes, None
+
+    def encrypted_account_number(
+        self, account_number: Union[str, int], refresh: bool = False
+    ) -> str:
+        """
+        Resolve a plain text account number to its hash value. Values that are not plain account numbers
+        (i.e. are already encrypted) or that are unknown to the account number map are returned unchanged.
+
+        Parameters:
+            account_number: plain text or encrypted account number
+            refresh: refetch the account number map before resolving
+        """
+        account_number = str(account_number)
+        if not refresh and (
+            not account_number.isdigit()
+            or (self.account_hashes and account_number in self.account_hashes.values())
+        ):
+            return account_number
+
+        account_hashes, error = self.account_hash_map(refresh=refresh)
+
+        if error is not None:
+            logging.getLogger(__name__).warning(
+                "Unable to load account numbers, using account number as given"
+            )
+            return account_number
+
+        return account_hashes.get(account_number, account_number)
 
+    def load_account_hashes(self) -> Optional[dict[str, str]]:
+        """
+        Load a persisted account number map. Clients without a shared store keep the map in memory only.
+        """
+        return None
+
+    def dump_account_hashes(self, account_hashes: dict[str, str]):
+        pass
+
+    @traced
     def accounts(
         self, account_field: Optional[AccountsField] = None, retry: bool = False
     ) -> tuple[Optional[AccountsResponse], Optional[AccountsAndTradingError]]:
@@ -625,20 +1319,13 @@ class BaseClient(ABC):
         logging.getLogger(__name__).debug("Accounts Params:\n" + pformat(params))
 
         response = self.__get(
-            ACCOUNTS_URL, params=params, headers=self.headers, retry=retry
+            ACCOUNTS_URL, "accounts", params=params, headers=self.headers, retry=retry
         )
 
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{ACCOUNTS_URL}` | Status: {response.status_code}"
-        )
-
-        logging.getLogger(__name__).debug("Response JSON:\n" + pformat(response.json()))
-
-        if response.status_code == STATUS_CODE_OK:
-            return AccountsResponse(response.json()), None  # json is a list not a dict
-        else:
-            return None, AccountsAndTradingError(**response.json())
+        return self.__parse(response, AccountsResponse, AccountsAndTradingError)
 
+    @traced
+    @accepts_plain_account_number
     def single_account(
         self,
         encrypted_account_number: str,
@@ -653,7 +1340,7 @@ class BaseClient(ABC):
         however the positions on these accounts will be displayed based on the "positions" flag
 
         Parameters:
-            encrypted_account_number: encrypted ID of the account
+            encrypted_account_number: encrypted ID of the account, or its plain text account number
             account_field: this allows one to determine which fields they want returned
             retry: retry the request if it fails
         """
@@ -665,26 +1352,23 @@ class BaseClient(ABC):
         logging.getLogger(__name__).debug("Single Account Params:\n" + pformat(params))
 
         response = self.__get(
-            account_url, params=params, headers=self.headers, retry=retry
-        )
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{account_url}` | Status: {response.status_code}"
+            account_url,
+            "single_account",
+            params=params,
+            headers=self.headers,
+            retry=retry,
         )
 
-        logging.getLogger(__name__).debug("Response JSON:\n" + pformat(response.json()))
-
-        if response.status_code == STATUS_CODE_OK:
-            return Account(**response.json()), None
-        else:
-            return None, AccountsAndTradingError(**response.json())
+        return self.__parse(response, Account, AccountsAndTradingError)
 
+    @traced
     def get_all_orders(
         self,
         from_entered_time: datetime,
         to_entered_time: datetime,
         max_results: int = 3000,
         status: Optional[OrderStatus] = None,
+        retry: bool = False,
     ) -> tuple[Optional[OrderResponse], Optional[AccountsAndTradingError]]:
         """
         Get all orders for all accounts
@@ -693,6 +1377,7 @@ class BaseClient(ABC):
         to_entered_time: Specifies that no orders entered after this time should be returned
         status: Specifies that only orders of this status should be returned
         max_results: The max number of orders to retrieve. Default is 3000
+        retry: retry the request if it fails
         """
 
         if (
@@ -720,19 +1405,18 @@ class BaseClient(ABC):
 
         logging.getLogger(__name__).debug("Get All Orders Params:\n" + pformat(params))
 
-        response = self.__get(ORDERS_URL, params=params, headers=self.headers)
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{ORDERS_URL}` | Status: {response.status_code}"
+        response = self.__get(
+            ORDERS_URL,
+            "get_all_orders",
+            params=params,
+            headers=self.headers,
+            retry=retry,
         )
 
-        logging.getLogger(__name__).debug("Response JSON:\n" + pformat(response.json()))
-
-        if response.status_code == STATUS_CODE_OK:
-            return OrderResponse(response.json()), None
-        else:
-            return None, AccountsAndTradingError(**response.json())
+        return self.__parse(response, OrderResponse, AccountsAndTradingError)
 
+    @traced
+    @accepts_plain_account_number
     def get_account_orders(
         self,
         encrypted_account_number: str,
@@ -740,15 +1424,17 @@ class BaseClient(ABC):
         to_entered_time: datetime,
         max_results: int = 3000,
         status: Optional[OrderStatus] = None,
+        retry: bool = False,
     ) -> tuple[Optional[OrderResponse], Optional[AccountsAndTradingError]]:
         """
         Get all orders for all accounts
 
-        encrypted_account_number: The exrypted ID of the account
+        encrypted_account_number: The exrypted ID of the account, or its plain text account number
         from_entered_time: Specifies that no orders entered before this time should be returned. Date must be within 60 days from today's date
         to_entered_time: Specifies that no orders entered after this time should be returned
         status: Specifies that only orders of this status should be returned
         max_results: The max number of orders to retrieve. Default is 3000
+        retry: retry the request if it fails
         """
 
         url = f"{TRADER_API_ENDPOINT}/accounts/{encrypted_account_number}/orders"
@@ -778,53 +1464,48 @@ class BaseClient(ABC):
 
         logging.getLogger(__name__).debug("Get All Orders Params:\n" + pformat(params))
 
-        response = self.__get(url, params=params, headers=self.headers)
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{url}` | Status: {response.status_code}"
+        response = self.__get(
+            url, "get_account_orders", params=params, headers=self.headers, retry=retry
         )
 
-        logging.getLogger(__name__).debug("Response JSON:\n" + pformat(response.json()))
-
-        if response.status_code == STATUS_CODE_OK:
-            return OrderResponse(response.json()), None
-        else:
-            return None, AccountsAndTradingError(**response.json())
+        return self.__parse(response, OrderResponse, AccountsAndTradingError)
 
+    @traced
+    @accepts_plain_account_number
     def get_single_order(
-        self, encrypted_account_number: str, order_id: int
+        self, encrypted_account_number: str, order_id: int, retry: bool = False
     ) -> tuple[Optional[Order], Optional[AccountsAndTradingError]]:
         """
         Get all orders for all accounts
 
-        encrypted_account_number: The exrypted ID of the account
+        encrypted_account_number: The exrypted ID of the account, or its plain text account number
         order_id: the ID of the order being retrieved
+        retry: retry the request if it fails
         """
 
         url = f"{TRADER_API_ENDPOINT}/accounts/{encrypted_account_number}/orders/{order_id}"
 
-        response = self.__get(url, headers=self.headers)
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{url}` | Status: {response.status_code}"
+        response = self.__get(
+            url, "get_single_order", headers=self.headers, retry=retry
         )
 
-        logging.getLogger(__name__).debug("Response JSON:\n" + pformat(response.json()))
-
-        if response.status_code == STATUS_CODE_OK:
-            return Order(**response.json()), None
-        else:
-            return None, AccountsAndTradingError(**response.json())
+        return self.__parse(response, Order, AccountsAndTradingError)
 
+    @traced
+    @accepts_plain_account_number
     def place_order(
-        self, encrypted_account_number: str, order_request: OrderRequest
+        self,
+        encrypted_account_number: str,
+        order_request: OrderRequest,
+        retry: bool = False,
     ) -> tuple[Optional[Order], Optional[AccountsAndTradingError]]:
         """
         Place order for a specific amount
 
         Parameters:
-            encrypted_account_number: The encrypted ID of the account
+            encrypted_account_number: The encrypted ID of the account, or its plain text account number
             order_request: The new order object for request body
+            retry: retry the request if it was not sent or was rejected unprocessed (429), see `RetryPolicy`
         """
         url = f"{TRADER_API_ENDPOINT}/accounts/{encrypted_account_number}/orders"
 
@@ -833,21 +1514,21 @@ class BaseClient(ABC):
             + pformat(order_request.model_dump(mode="json", exclude_none=True))
         )
 
-        response = self.session.post(
+        response = self.__request(
+            "POST",
             url,
+            "place_order",
             json=order_request.model_dump(mode="json", exclude_none=True),
             headers=self.headers,
-        )
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | POST `{url}` | Status: {response.status_code}"
+            retry=retry,
         )
 
         if response.status_code == STATUS_CODE_CREATED:
+            self.__complete(response)
             location = response.headers["Location"]
             order_id = location.split("/")[-1]
             order_details, error = self.get_single_order(
-                encrypted_account_number, int(order_id)
+                encrypted_account_number, int(order_id), retry=True
             )
             if order_details:
                 return order_details, None
@@ -860,44 +1541,54 @@ class BaseClient(ABC):
                     **{**order_error_json, "message": new_message}
                 )
         else:
-            return None, AccountsAndTradingError(**response.json())
+            return None, self.__validate(
+                response, AccountsAndTradingError, self.__decode(response)
+            )
 
     # TOOO the three methods left don't even work on scwhab, but i'll implement them anyways
+    @traced
+    @accepts_plain_account_number
     def cancel_order(
-        self, encrypted_account_number: str, order_id: int
+        self, encrypted_account_number: str, order_id: int, retry: bool = False
     ) -> tuple[None, Optional[AccountsAndTradingError]]:
         """
         Cancel a specific order for a specific account
 
-        encrypted_account_number: The enrypted ID of the account
+        encrypted_account_number: The enrypted ID of the account, or its plain text account number
         order_id: the ID of the order being cancelled
+        retry: retry the request if it fails
         """
 
         url = f"{TRADER_API_ENDPOINT}/accounts/{encrypted_account_number}/orders/{order_id}"
 
-        response = self.session.delete(url, headers=self.headers)
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | DELETE `{url}` | Status: {response.status_code}"
+        response = self.__request(
+            "DELETE", url, "cancel_order", headers=self.headers, retry=retry
         )
 
         if response.status_code == STATUS_CODE_OK:
+            self.__complete(response)
             return None, None  # is there something else we can return here?
         else:
-            logging.getLogger(__name__).debug(
-                "Response JSON:\n" + pformat(response.json())
+            return None, self.__validate(
+                response, AccountsAndTradingError, self.__decode(response)
             )
-            return None, AccountsAndTradingError(**response.json())
 
+    @traced
+    @accepts_plain_account_number
     def replace_order(
-        self, encrypted_account_number: str, order_id: int, order_request: OrderRequest
+        self,
+        encrypted_account_number: str,
+        order_id: int,
+        order_request: OrderRequest,
+        retry: bool = False,
     ) -> tuple[Optional[Order], Optional[AccountsAndTradingError]]:
         """
         Replace a specific order for a specific account
 
-        encrypted_account_number: The enrypted ID of the account
+        encrypted_account_number: The enrypted ID of the account, or its plain text account number
         order_id: the ID of the order being retrieved
         order_request: The new order object for request body
+        retry: retry the request if it was not sent or was rejected unprocessed (429), see `RetryPolicy`
         """
 
         url = f"{TRADER_API_ENDPOINT}/accounts/{encrypted_account_number}/orders/{order_id}"
@@ -907,21 +1598,21 @@ class BaseClient(ABC):
             + pformat(order_request.model_dump(mode="json", exclude_none=True))
         )
 
-        response = self.session.put(
+        response = self.__request(
+            "PUT",
             url,
+            "replace_order",
             json=order_request.model_dump(mode="json", exclude_none=True),
             headers=self.headers,
-        )
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | PUT `{url}` | Status: {response.status_code}"
+            retry=retry,
         )
 
         if response.status_code == STATUS_CODE_CREATED:
+            self.__complete(response)
             location = response.headers["Location"]
             order_id = location.split("/")[-1]
             order_details, error = self.get_single_order(
-                encrypted_account_number, int(order_id)
+                encrypted_account_number, int(order_id), retry=True
             )
             if order_details:
                 return order_details, None
@@ -934,17 +1625,25 @@ class BaseClient(ABC):
                     **{**order_error_json, "message": new_message}
                 )
         else:
-            return None, AccountsAndTradingError(**response.json())
+            return None, self.__validate(
+                response, AccountsAndTradingError, self.__decode(response)
+            )
 
+    @traced
+    @accepts_plain_account_number
     def preview_order(
-        self, encrypted_account_number: str, order_request: OrderRequest
+        self,
+        encrypted_account_number: str,
+        order_request: OrderRequest,
+        retry: bool = False,
     ) -> tuple[Optional[PreviewOrder], Optional[AccountsAndTradingError]]:
         """
         Preview an order for a specific amount
 
         Parameters:
-            encrypted_account_number: The encrypted ID of the account
+            encrypted_account_number: The encrypted ID of the account, or its plain text account number
             order_request: The new order object for request body
+            retry: retry the request if it fails, a preview has no side effect
         """
 
         url = f"{TRADER_API_ENDPOINT}/accounts/{encrypted_account_number}/previewOrder"
@@ -954,21 +1653,20 @@ class BaseClient(ABC):
             + pformat(order_request.model_dump(mode="json", exclude_none=True))
         )
 
-        response = self.session.post(
+        response = self.__request(
+            "POST",
             url,
+            "preview_order",
             json=order_request.model_dump(mode="json", exclude_none=True),
             headers=self.headers,
+            retry=retry,
+            idempotent=True,
         )
 
-        logging.getLogger(__name__).info(
-            f"Schwab API | POST `{url}` | Status: {response.status_code}"
-        )
-
-        if response.status_code == STATUS_CODE_OK:
-            return PreviewOrder(**response.json()), None
-        else:
-            return None, AccountsAndTradingError(**response.json())
+        return self.__parse(response, PreviewOrder, AccountsAndTradingError)
 
+    @traced
+    @accepts_plain_account_number
     def get_transactions(
         self,
         encrypted_account_number: str,
@@ -976,16 +1674,18 @@ class BaseClient(ABC):
         end_date: datetime,
         transaction_type: Union[TransactionType, Iterable[TransactionType]],
         symbol: Optional[str] = None,
+        retry: bool = False,
     ) -> tuple[Optional[TransactionResponse], Optional[AccountsAndTradingError]]:
         """
         Get all transactions information for a specific account
 
         Parameters:
-            encrypted_account_number: The encrypted ID of the account
+            encrypted_account_number: The encrypted ID of the account, or its plain text account number
             start_date: Specifies that no transactions entered before this time should be returned. Date must be within 60 days from today's date
             end_date: Specifies that no transactions entered after this time should be returned.
             symbol: filter all transactions based on the symbol
             transaction_type: Specifies that only transactions of this status should be returned
+            retry: retry the request if it fails
         """
 
         url = f"{TRADER_API_ENDPOINT}/accounts/{encrypted_account_number}/transactions"
@@ -1013,46 +1713,53 @@ class BaseClient(ABC):
             "Get Transactions Params:\n" + pformat(params)
         )
 
-        response = self.__get(url, params=params, headers=self.headers)
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{url}` | Status: {response.status_code}"
+        response = self.__get(
+            url, "get_transactions", params=params, headers=self.headers, retry=retry
         )
 
-        logging.getLogger(__name__).debug("Response JSON:\n" + pformat(response.json()))
-
-        if response.status_code == STATUS_CODE_OK:
-            return TransactionResponse(response.json()), None
-        else:
-            return None, AccountsAndTradingError(**response.json())
+        return self.__parse(response, TransactionResponse, AccountsAndTradingError)
 
+    @traced
+    @accepts_plain_account_number
     def get_single_transaction(
         self,
         encrypted_account_number: str,
         transaction_id: int,
+        retry: bool = False,
     ) -> tuple[Optional[Transaction], Optional[AccountsAndTradingError]]:
         """
         Get specific transaction information for a specific account
 
         Parameters:
-            encrypted_account_number: The encrypted ID of the account
+            encrypted_account_number: The encrypted ID of the account, or its plain text account number
             transaction_id: the id of the transaction being retrieved
+            retry: retry the request if it fails
         """
 
         url = f"{TRADER_API_ENDPOINT}/accounts/{encrypted_account_number}/transactions/{transaction_id}"
 
-        response = self.__get(url, headers=self.headers)
-
-        logging.getLogger(__name__).info(
-            f"Schwab API | GET `{url}` | Status: {response.status_code}"
+        response = self.__get(
+            url, "get_single_transaction", headers=self.headers, retry=retry
         )
 
-        logging.getLogger(__name__).debug("Response JSON:\n" + pformat(response.json()))
+        return self.__parse(response, Transaction, AccountsAndTradingError)
 
-        if response.status_code == STATUS_CODE_OK:
-            return Transaction(**response.json()), None
-        else:
-            return None, AccountsAndTradingError(**response.json())
+    @traced
+    def user_preference(
+        self, retry: bool = False
+    ) -> tuple[Optional[UserPreference], Optional[AccountsAndTradingError]]:
+        """
+        Get user preference information for the logged in user, including the streamer connection details
+
+        Parameters:
+            retry: retry the request if it fails
+        """
+
+        response = self.__get(
+            USER_PREFERENCE_URL, "user_preference", headers=self.headers, retry=retry
+        )
+
+        return self.__parse(response, UserPreference, AccountsAndTradingError)
 
     @abstractmethod
     def configurable_refresh(self):
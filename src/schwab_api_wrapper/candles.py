@@ -0,0 +1,232 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .streaming import StreamClient
+from .utils import Frequency
+
+from schwab_api_wrapper.schemas.market_data import Candle, CandleList
+from schwab_api_wrapper.schemas.streaming import Service
+
+
+MINUTE_MS = 60_000
+
+# columns of a bar row
+START, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+CandleCallback = Callable[[str, Frequency, Candle], None]
+
+
+def to_candle(bar: np.ndarray) -> Candle:
+    return Candle(
+        datetime=datetime.fromtimestamp(
+            bar[START] / 1000, tz=ZoneInfo("America/New_York")
+        ),
+        open=bar[OPEN],
+        high=bar[HIGH],
+        low=bar[LOW],
+        close=bar[CLOSE],
+        volume=int(bar[VOLUME]),
+    )
+
+
+class CandleRing:
+    """
+    Fixed-size ring buffer of completed bars, one row of (start ms, open, high, low, close, volume) per bar
+    """
+
+    def __init__(self, capacity: int):
+        self.bars = np.zeros((capacity, 6))
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, len(self.bars))
+
+    def append(self, bar: np.ndarray) -> None:
+        self.bars[self.count % len(self.bars)] = bar
+        self.count += 1
+
+    def array(self) -> np.ndarray:
+        """
+        Copy of the stored bars, oldest first
+        """
+        if self.count <= len(self.bars):
+            return self.bars[: self.count].copy()
+
+        head = self.count % len(self.bars)
+        return np.concatenate((self.bars[head:], self.bars[:head]))
+
+
+class CandleBuilder:
+    """
+    Rolling multi-frequency minute bars built from streamed CHART_EQUITY data
+
+    Each streamed one-minute bar is folded into an in-progress bar per frequency; a bar is completed as soon as the
+    last minute of its window arrives (or when a minute of a later window arrives, if the last minute had no trades)
+    and is then stored in a ring buffer of `capacity` bars and passed to the listeners. Memory is bounded by
+    symbols * frequencies * capacity. Buffers can be seeded from a `price_history` `CandleList`.
+
+    Bars starting before the end of the last bar received for a symbol are ignored, so a backfill that overlaps the
+    stream does not double count.
+    """
+
+    def __init__(
+        self,
+        frequencies: Iterable[Frequency] = (
+            Frequency.ONE,
+            Frequency.FIVE,
+            Frequency.FIFTEEN,
+            Frequency.THIRTY,
+        ),
+        capacity: int = 1000,
+    ):
+        """
+        Parameters:
+            frequencies: bar sizes in minutes
+            capacity: number of completed bars kept per symbol and frequency
+        """
+        self.frequencies = sorted(frequencies, key=lambda frequency: frequency.value)
+        self.capacity = capacity
+
+        self.rings: dict[tuple[str, Frequency], CandleRing] = {}
+        self.current: dict[tuple[str, Frequency], np.ndarray] = {}
+        # end ms of the last bar received per symbol
+        self.covered: dict[str, int] = {}
+        self.listeners: list[CandleCallback] = []
+
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback: CandleCallback) -> None:
+        """
+        Register `callback(symbol, frequency, candle)`, called for every completed bar
+        """
+        self.listeners.append(callback)
+
+    def attach(self, stream: StreamClient) -> None:
+        """
+        Feed the builder from the raw CHART_EQUITY data of `stream`
+        """
+        stream.add_raw_handler(self.apply, Service.CHART_EQUITY)
+
+    def apply(self, data: dict) -> None:
+        """
+        Apply one raw CHART_EQUITY data entry, `{"content": [{"key": symbol, "1": open, ..., "7": chart time}]}`
+        """
+        for item in data["content"]:
+            try:
+                self.add_bar(
+                    item["key"],
+                    int(item["7"]),
+                    float(item["1"]),
+                    float(item["2"]),
+                    float(item["3"]),
+                    float(item["4"]),
+                    float(item["5"]),
+                )
+            except KeyError:
+                logging.getLogger(__name__).debug(
+                    f"Candle builder | Incomplete CHART_EQUITY bar for {item.get('key')}"
+                )
+
+    def seed(self, candles: CandleList, frequency: Frequency = Frequency.ONE) -> None:
+        """
+        Seed the buffers from a `price_history` response of `frequency` minute candles.
+        Only frequencies that are multiples of `frequency` are seeded.
+        """
+        for candle in candles.candles or []:
+            self.add_bar(
+                candles.symbol,
+                int(candle.epoch.timestamp() * 1000),
+                candle.open,
+                candle.high,
+                candle.low,
+                candle.close,
+                candle.volume,
+                frequency.value * MINUTE_MS,
+            )
+
+    def add_bar(
+        self,
+        symbol: str,
+        start: int,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        width: int = MINUTE_MS,
+    ) -> None:
+        """
+        Fold one bar starting at `start` (milliseconds since Epoch) and lasting `width` milliseconds into the
+        in-progress bar of every frequency that is a multiple of `width`
+        """
+        completed = []
+
+        with self._lock:
+            if start < self.covered.get(symbol, 0):
+                return
+            self.covered[symbol] = start + width
+
+            for frequency in self.frequencies:
+                window = frequency.value * MINUTE_MS
+                if window % width:
+                    continue
+
+                key = (symbol, frequency)
+                bucket = start - start % window
+                bar = self.current.get(key)
+
+                if bar is not None and bar[START] != bucket:
+                    completed.append((frequency, self._complete(key, bar)))
+                    bar = None
+
+                if bar is None:
+                    bar = np.array((bucket, open, high, low, close, volume))
+                    self.current[key] = bar
+                else:
+                    bar[HIGH] = max(bar[HIGH], high)
+                    bar[LOW] = min(bar[LOW], low)
+                    bar[CLOSE] = close
+                    bar[VOLUME] += volume
+
+                if start + width >= bucket + window:  # last minute of the window
+                    completed.append((frequency, self._complete(key, bar)))
+
+        for frequency, bar in completed:
+            candle = to_candle(bar)
+            for callback in self.listeners:
+                callback(symbol, frequency, candle)
+
+    def _complete(self, key: tuple[str, Frequency], bar: np.ndarray) -> np.ndarray:
+        ring = self.rings.get(key)
+        if ring is None:
+            ring = self.rings[key] = CandleRing(self.capacity)
+        ring.append(bar)
+        del self.current[key]
+        return bar
+
+    def array(self, symbol: str, frequency: Frequency) -> np.ndarray:
+        """
+        Completed bars of `symbol` as rows of (start ms, open, high, low, close, volume), oldest first
+        """
+        with self._lock:
+            ring = self.rings.get((symbol, frequency))
+            return ring.array() if ring is not None else np.zeros((0, 6))
+
+    def candles(self, symbol: str, frequency: Frequency) -> list[Candle]:
+        """
+        Completed bars of `symbol`, oldest first
+        """
+        return [to_candle(bar) for bar in self.array(symbol, frequency)]
+
+    def current_candle(self, symbol: str, frequency: Frequency) -> Optional[Candle]:
+        """
+        In-progress bar of `symbol`, None if no minute of the current window was received yet
+        """
+        with self._lock:
+            bar = self.current.get((symbol, frequency))
+            return to_candle(bar) if bar is not None else None
@@ -0,0 +1,200 @@
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+
+# response headers kept in the cassette, the others may carry session details
+RECORDED_HEADERS = ("Content-Type", "Location")
+
+TOKEN_PATTERNS = [
+    (re.compile(rf'("{key}"\s*:\s*)"[^"]*"'), rf'\1"[{key.upper()}]"')
+    for key in ("access_token", "refresh_token", "id_token")
+]
+
+
+def scrub(text: str) -> str:
+    """
+    Replace the OAuth tokens of a JSON body with placeholders
+    """
+    for pattern, replacement in TOKEN_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def canonical_url(url: str, params: Optional[dict] = None) -> str:
+    """
+    `url` with `params` merged into its query string, query parameters sorted
+    """
+    url = requests.Request("GET", url, params=params).prepare().url
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(query=urlencode(sorted(parse_qsl(parts.query)))))
+
+
+class CassetteMode(Enum):
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+class CassetteError(Exception):
+    def __init__(self, title):
+        super().__init__(title)
+        self.title = title
+
+
+@dataclass
+class Interaction:
+    method: str
+    url: str  # canonical url, see `canonical_url`
+    status_code: Optional[int]
+    headers: dict = field(default_factory=dict)
+    body: Optional[str] = None  # scrubbed response body
+    elapsed: float = 0.0  # seconds
+
+    @property
+    def path(self) -> str:
+        return urlsplit(self.url).path
+
+    def to_response(self) -> Response:
+        response = Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.url = self.url
+        response.encoding = "utf-8"
+        response._content = self.body.encode() if self.body is not None else b""
+        return response
+
+
+class Cassette:
+    """
+    Recorded request/response pairs of a client session
+
+    Set a cassette as `client.cassette` to record every request the client sends (RECORD) or to serve the responses
+    from the cassette without network (REPLAY). Only the method, url, status, body and a few headers are kept, and
+    OAuth tokens in bodies are replaced with placeholders, so cassettes can be shared. The file is JSON, gzip
+    compressed when its name ends with `.gz`.
+
+    On replay a request is matched by method and url (query included); requests whose query differs from the
+    recording, e.g. time windows computed from `now()`, fall back to the recorded responses of the same path.
+    Responses of a key are served in recording order, the last one is repeated once they are used up.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        mode: CassetteMode = CassetteMode.REPLAY,
+        latency: float = 0.0,
+        latency_scale: Optional[float] = None,
+    ):
+        """
+        Parameters:
+            filepath: cassette file, loaded on replay
+            mode: record or replay
+            latency: seconds added to every replayed response
+            latency_scale: replay the recorded response times multiplied by this factor, no recorded delay if None
+        """
+        self.filepath = filepath
+        self.mode = mode
+        self.latency = latency
+        self.latency_scale = latency_scale
+
+        self.interactions: list[Interaction] = []
+        self._by_url: dict[tuple[str, str], list[Interaction]] = {}
+        self._by_path: dict[tuple[str, str], list[Interaction]] = {}
+        self._played: dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+        if mode == CassetteMode.REPLAY:
+            self.load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.mode == CassetteMode.RECORD:
+            self.dump()
+
+    def _index(self, interaction: Interaction) -> None:
+        method = interaction.method
+        self._by_url.setdefault((method, interaction.url), []).append(interaction)
+        self._by_path.setdefault((method, interaction.path), []).append(interaction)
+
+    def load(self) -> None:
+        opener = gzip.open if self.filepath.endswith(".gz") else open
+        with opener(self.filepath, "rt") as fin:
+            interactions = json.load(fin)["interactions"]
+
+        with self._lock:
+            self.interactions = [Interaction(**item) for item in interactions]
+            self._by_url.clear()
+            self._by_path.clear()
+            self._played.clear()
+            for interaction in self.interactions:
+                self._index(interaction)
+
+    def dump(self) -> None:
+        with self._lock:
+            data = {"interactions": [asdict(item) for item in self.interactions]}
+
+        opener = gzip.open if self.filepath.endswith(".gz") else open
+        tmp_filepath = f"{self.filepath}.tmp"
+        with opener(tmp_filepath, "wt") as fout:
+            json.dump(data, fout, separators=(",", ":"))
+        os.replace(tmp_filepath, self.filepath)
+
+    def record(
+        self, method: str, url: str, params: Optional[dict], response: Response
+    ) -> None:
+        body = response.content
+        interaction = Interaction(
+            method,
+            canonical_url(url, params),
+            response.status_code,
+            {
+                name: response.headers[name]
+                for name in RECORDED_HEADERS
+                if name in response.headers
+            },
+            scrub(body.decode("utf-8", errors="replace")) if body else None,
+            response.elapsed.total_seconds() if response.elapsed else 0.0,
+        )
+
+        with self._lock:
+            self.interactions.append(interaction)
+            self._index(interaction)
+
+    def play(self, method: str, url: str, params: Optional[dict] = None) -> Response:
+        url = canonical_url(url, params)
+
+        with self._lock:
+            key = (method, url)
+            candidates = self._by_url.get(key)
+            if candidates is None:
+                key = (method, urlsplit(url).path)
+                candidates = self._by_path.get(key)
+            if candidates is None:
+                raise CassetteError(f"No recorded response for {method} `{url}`")
+
+            index = self._played.get(key, 0)
+            self._played[key] = index + 1
+            interaction = candidates[min(index, len(candidates) - 1)]
+
+        delay = self.latency
+        if self.latency_scale is not None:
+            delay += interaction.elapsed * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+
+        response = interaction.to_response()
+        response.url = url
+        return response
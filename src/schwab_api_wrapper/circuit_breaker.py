@@ -0,0 +1,238 @@
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Callable, Optional
+
+import requests
+from requests import Response
+
+
+# endpoint (client method name) -> group sharing a circuit, endpoints not listed have their own circuit
+ENDPOINT_GROUPS = {
+    "quotes": "market_data",
+    "instruments": "market_data",
+    "market_hours": "market_data",
+    "single_market_hours": "market_data",
+    "price_history": "market_data",
+    "account_numbers": "accounts",
+    "accounts": "accounts",
+    "single_account": "accounts",
+    "user_preference": "accounts",
+    "get_all_orders": "orders",
+    "get_account_orders": "orders",
+    "get_single_order": "orders",
+    "place_order": "orders",
+    "cancel_order": "orders",
+    "replace_order": "orders",
+    "preview_order": "orders",
+    "get_transactions": "transactions",
+    "get_single_transaction": "transactions",
+    "token": "oauth",
+    "app_authorization": "oauth",
+}
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"  # requests are sent
+    OPEN = "open"  # requests fail fast
+    HALF_OPEN = "half_open"  # probe requests are sent to test the recovery
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, title, group: str, retry_at: Optional[float]):
+        super().__init__(title)
+        self.title = title
+        self.group = group
+        # time.monotonic() at which probe requests are let through
+        self.retry_at = retry_at
+
+
+StateCallback = Callable[[str, CircuitState, CircuitState], None]
+
+
+def failed(response: Optional[Response], exception: Optional[Exception]) -> bool:
+    """
+    Whether an attempt tells that the API is unavailable: a network error, a timeout or a 5xx status
+    """
+    if exception is not None:
+        return isinstance(
+            exception,
+            (requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+        )
+    return response is not None and response.status_code >= 500
+
+
+class CircuitBreaker:
+    """
+    Circuit of a group of endpoints
+
+    The circuit opens after `failure_threshold` consecutive failed requests and then refuses requests for
+    `recovery_time` seconds. It then half-opens: up to `probes` requests are let through at a time, the circuit closes
+    after `success_threshold` of them succeed and opens again as soon as one fails.
+    """
+
+    def __init__(
+        self,
+        group: str,
+        failure_threshold: int = 5,
+        recovery_time: float = 30.0,
+        probes: int = 1,
+        success_threshold: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Parameters:
+            group: name of the endpoint group
+            failure_threshold: consecutive failures opening the circuit
+            recovery_time: seconds the circuit stays open before probing
+            probes: requests sent at the same time while half-open
+            success_threshold: successful probes closing the circuit
+            clock: seconds, monotonic
+        """
+        self.group = group
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.probes = probes
+        self.success_threshold = success_threshold
+        self.clock = clock
+
+        self.state = CircuitState.CLOSED
+        self.failures = 0  # consecutive failures while closed
+        self.successes = 0  # successful probes while half-open
+        self.in_flight = 0  # probes sent while half-open
+        self.opened_at: Optional[float] = None
+        self.listeners: list[StateCallback] = []
+
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback: StateCallback) -> None:
+        """
+        Register `callback(group, previous state, new state)`, called on every state change
+        """
+        self.listeners.append(callback)
+
+    @property
+    def retry_at(self) -> Optional[float]:
+        return None if self.opened_at is None else self.opened_at + self.recovery_time
+
+    def allow(self) -> bool:
+        """
+        Whether a request may be sent. A request allowed must be followed by `success`, `failure` or `release`.
+        """
+        with self._lock:
+            if (
+                self.state == CircuitState.OPEN
+                and self.clock() >= self.opened_at + self.recovery_time
+            ):
+                self._transition(CircuitState.HALF_OPEN)
+
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.HALF_OPEN and self.in_flight < self.probes:
+                self.in_flight += 1
+                return True
+            return False
+
+    def success(self) -> None:
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self.in_flight = max(0, self.in_flight - 1)
+                self.successes += 1
+                if self.successes >= self.success_threshold:
+                    self._transition(CircuitState.CLOSED)
+            else:
+                self.failures = 0
+
+    def failure(self) -> None:
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self.in_flight = max(0, self.in_flight - 1)
+                self._transition(CircuitState.OPEN)
+            elif self.state == CircuitState.CLOSED:
+                self.failures += 1
+                if self.failures >= self.failure_threshold:
+                    self._transition(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """
+        Give back an allowed request whose outcome tells nothing about the API, e.g. it raised a local error
+        """
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self.in_flight = max(0, self.in_flight - 1)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._transition(CircuitState.CLOSED)
+
+    def _transition(self, state: CircuitState) -> None:
+        previous = self.state
+        self.state = state
+        self.failures = 0
+        self.successes = 0
+        self.in_flight = 0
+        self.opened_at = self.clock() if state == CircuitState.OPEN else None
+
+        if previous == state:
+            return
+
+        log = (
+            logging.getLogger(__name__).warning
+            if state == CircuitState.OPEN
+            else logging.getLogger(__name__).info
+        )
+        log(f"Circuit | {self.group} | {previous.value} -> {state.value}")
+
+        for callback in self.listeners:
+            try:
+                callback(self.group, previous, state)
+            except Exception:
+                logging.getLogger(__name__).exception(
+                    f"Circuit | {self.group} listener failed"
+                )
+
+
+class CircuitBreakers:
+    """
+    Circuit breakers of a client, one per endpoint group (see `ENDPOINT_GROUPS`), created on first use
+    """
+
+    def __init__(self, groups: Optional[dict[str, str]] = None, **breaker_kwargs):
+        """
+        Parameters:
+            groups: endpoint -> group, `ENDPOINT_GROUPS` by default
+            breaker_kwargs: arguments of the `CircuitBreaker`s
+        """
+        self.groups = dict(ENDPOINT_GROUPS if groups is None else groups)
+        self.breaker_kwargs = breaker_kwargs
+
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.listeners: list[StateCallback] = []
+
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback: StateCallback) -> None:
+        """
+        Register `callback(group, previous state, new state)` on every circuit, existing or not
+        """
+        with self._lock:
+            self.listeners.append(callback)
+            for breaker in self.breakers.values():
+                breaker.add_listener(callback)
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        group = self.groups.get(endpoint, endpoint)
+        with self._lock:
+            breaker = self.breakers.get(group)
+            if breaker is None:
+                breaker = self.breakers[group] = CircuitBreaker(
+                    group, **self.breaker_kwargs
+                )
+                for callback in self.listeners:
+                    breaker.add_listener(callback)
+            return breaker
+
+    def states(self) -> dict[str, CircuitState]:
+        with self._lock:
+            return {group: breaker.state for group, breaker in self.breakers.items()}
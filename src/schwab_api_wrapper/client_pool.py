@@ -0,0 +1,284 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional
+
+from requests.adapters import HTTPAdapter
+
+from .base_client import BaseClient
+from .file_client import FileClient
+
+
+ClientFactory = Callable[[], BaseClient]
+
+
+class ClientCreationError(Exception):
+    def __init__(self, title, tenant: str):
+        super().__init__(title)
+        self.title = title
+        self.tenant = tenant
+
+
+@dataclass
+class PooledClient:
+    client: BaseClient
+    last_used: float  # clock of the pool
+    in_use: int = 0  # calls running through the pool
+    evicted: bool = False  # out of the pool, closed once no call uses it
+
+
+class ClientPool:
+    """
+    Clients of many app credentials (tenants), created on first use
+
+    A tenant is registered with a factory building its client, e.g. `lambda: FileClient(path, immediate_refresh=False)`,
+    and nothing is constructed until the tenant's first call, so the pool starts without any OAuth request. Access
+    tokens are refreshed by each client when a call finds them expired, or ahead of time for many tenants at once with
+    `refresh`, which refreshes concurrently.
+
+    Clients using the `requests` transport share one connection pool (`HTTPAdapter`): connections are reused across
+    tenants while the cookies and tokens stay in each client's own session. HTTP/2 clients keep their own session.
+
+    Clients unused for `idle_timeout` seconds are evicted, and created again on their tenant's next call. A client
+    is not evicted while a `call` or a `lease` uses it, and a client replaced by `register` is closed once they
+    return. A client held from `client` is not tracked: its session may be closed under it once it is evicted.
+
+    A factory exiting the interpreter, as clients do when their refresh token has expired, raises
+    `ClientCreationError` for its tenant instead.
+    """
+
+    def __init__(
+        self,
+        factories: Optional[dict[str, ClientFactory]] = None,
+        idle_timeout: Optional[float] = 900.0,
+        share_transport: bool = True,
+        pool_maxsize: int = 32,
+        max_workers: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Parameters:
+            factories: tenant key -> function building the tenant's client
+            idle_timeout: seconds without a call after which a client is evicted, never if None
+            share_transport: mount one shared connection pool on the clients' sessions
+            pool_maxsize: connections kept per host by the shared connection pool
+            max_workers: threads refreshing tokens concurrently
+            clock: seconds, monotonic
+        """
+        self.factories: dict[str, ClientFactory] = dict(factories or {})
+        self.idle_timeout = idle_timeout
+        self.max_workers = max_workers
+        self.clock = clock
+        self.adapter = (
+            HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+            if share_transport
+            else None
+        )
+
+        self.clients: dict[str, PooledClient] = {}
+        self._tenant_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = clock()
+
+    @classmethod
+    def from_files(cls, parameters_files: dict[str, str], **kwargs) -> "ClientPool":
+        """
+        Pool of `FileClient`s
+
+        Parameters:
+            parameters_files: tenant key -> parameters file of the tenant's credentials
+            kwargs: arguments of the pool
+        """
+        return cls(
+            {
+                tenant: (
+                    lambda filepath=filepath: FileClient(
+                        filepath, immediate_refresh=False
+                    )
+                )
+                for tenant, filepath in parameters_files.items()
+            },
+            **kwargs,
+        )
+
+    def __contains__(self, tenant: str) -> bool:
+        return tenant in self.factories
+
+    def __getitem__(self, tenant: str) -> BaseClient:
+        return self.client(tenant)
+
+    @property
+    def tenants(self) -> list[str]:
+        with self._lock:
+            return list(self.factories)
+
+    def register(self, tenant: str, factory: ClientFactory) -> None:
+        """
+        Add a tenant, or replace its factory; a client already created for the tenant is evicted, and closed once no
+        call uses it
+        """
+        with self._lock:
+            self.factories[tenant] = factory
+            pooled = self.clients.pop(tenant, None)
+        if pooled is not None:
+            self._evict(pooled)
+
+    def client(self, tenant: str) -> BaseClient:
+        """
+        Client of `tenant`, created if it is not in the pool. Raises `KeyError` for unknown tenants, and
+        `ClientCreationError` if the factory exits.
+        """
+        return self._pooled(tenant).client
+
+    @contextmanager
+    def lease(self, tenant: str) -> Iterator[BaseClient]:
+        """
+        Client of `tenant`, neither evicted nor closed until the block exits
+        """
+        while True:
+            pooled = self._pooled(tenant)
+            with self._lock:
+                # evicted in between otherwise, then created again
+                if self.clients.get(tenant) is pooled:
+                    pooled.in_use += 1
+                    break
+
+        try:
+            yield pooled.client
+        finally:
+            with self._lock:
+                pooled.in_use -= 1
+                pooled.last_used = self.clock()
+                close = pooled.evicted and pooled.in_use == 0
+            if close:
+                self._close(pooled.client)
+
+    def _pooled(self, tenant: str) -> PooledClient:
+        self._sweep()
+
+        with self._lock:
+            pooled = self.clients.get(tenant)
+            if pooled is not None:
+                pooled.last_used = self.clock()
+                return pooled
+            factory = self.factories[tenant]
+            tenant_lock = self._tenant_locks.setdefault(tenant, threading.Lock())
+
+        # clients of different tenants are created concurrently, a tenant's client once
+        with tenant_lock:
+            with self._lock:
+                pooled = self.clients.get(tenant)
+            if pooled is None:
+                try:
+                    client = factory()
+                except SystemExit as e:
+                    raise ClientCreationError(
+                        f"The client of {tenant} exited with status {e.code}, its refresh token may have expired",
+                        tenant,
+                    ) from e
+                if self.adapter is not None and not client.http2:
+                    client.mount(self.adapter)
+                pooled = PooledClient(client, self.clock())
+                with self._lock:
+                    self.clients[tenant] = pooled
+                logging.getLogger(__name__).info(f"Client pool | {tenant} | Created")
+
+        pooled.last_used = self.clock()
+        return pooled
+
+    def call(self, tenant: str, method: str, *args, **kwargs):
+        """
+        Call the client method named `method` of `tenant`, e.g. `pool.call("desk-a", "quotes", ["AAPL"])`
+        """
+        with self.lease(tenant) as client:
+            return getattr(client, method)(*args, **kwargs)
+
+    def refresh(
+        self, tenants: Optional[Iterable[str]] = None, force: bool = False
+    ) -> dict[str, Optional[Exception]]:
+        """
+        Refresh the access tokens of `tenants` (all by default) concurrently, creating their clients if needed
+
+        Parameters:
+            tenants: tenant keys
+            force: refresh tokens that have not expired too
+
+        Returns:
+            tenant -> exception raised by its refresh, None if it succeeded or was not needed
+        """
+        tenants = list(self.tenants if tenants is None else tenants)
+
+        def refresh(tenant: str) -> Optional[Exception]:
+            try:
+                with self.lease(tenant) as client:
+                    if force or client.need_refresh:
+                        client.refresh()
+            except Exception as e:
+                logging.getLogger(__name__).warning(
+                    f"Client pool | {tenant} | Refresh failed: {e!r}"
+                )
+                return e
+            return None
+
+        with ThreadPoolExecutor(
+            min(self.max_workers, max(1, len(tenants))),
+            thread_name_prefix="schwab-client-pool",
+        ) as executor:
+            return dict(zip(tenants, executor.map(refresh, tenants)))
+
+    def evict_idle(self) -> list[str]:
+        """
+        Remove the clients unused for `idle_timeout` seconds and not in use by a call or a lease, return their tenants
+        """
+        if self.idle_timeout is None:
+            return []
+
+        now = self.clock()
+        with self._lock:
+            self._last_sweep = now
+            idle = [
+                tenant
+                for tenant, pooled in self.clients.items()
+                if pooled.in_use == 0 and now - pooled.last_used >= self.idle_timeout
+            ]
+            evicted = [self.clients.pop(tenant) for tenant in idle]
+
+        for tenant, pooled in zip(idle, evicted):
+            self._evict(pooled)
+            logging.getLogger(__name__).info(f"Client pool | {tenant} | Evicted")
+        return idle
+
+    def close(self) -> None:
+        """
+        Evict every client and close the shared connection pool
+        """
+        with self._lock:
+            evicted = list(self.clients.values())
+            self.clients.clear()
+        for pooled in evicted:
+            self._evict(pooled)
+        if self.adapter is not None:
+            self.adapter.close()
+
+    def _sweep(self) -> None:
+        if (
+            self.idle_timeout is not None
+            and self.clock() - self._last_sweep >= self.idle_timeout
+        ):
+            self.evict_idle()
+
+    def _evict(self, pooled: PooledClient) -> None:
+        # the client is out of the pool already, the last call using it closes it
+        with self._lock:
+            pooled.evicted = True
+            close = pooled.in_use == 0
+        if close:
+            self._close(pooled.client)
+
+    def _close(self, client: BaseClient) -> None:
+        # closing a session closes its adapters, the shared one must stay open
+        if client.adapter is None or client.adapter is not self.adapter:
+            client.session.close()
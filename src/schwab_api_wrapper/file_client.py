@@ -10,8 +10,9 @@ class FileClient(BaseClient):
         parameters_file: str,
         renew_refresh_token: bool = False,
         immediate_refresh: bool = True,
+        http2: bool = False,
     ):
-        super().__init__()
+        super().__init__(http2)
 
         self.parameters_file = parameters_file
 
@@ -0,0 +1,120 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from .retry import RetryBudget
+
+
+# idempotent market data endpoints, named after the client methods
+HEDGED_ENDPOINTS = (
+    "quotes",
+    "price_history",
+    "market_hours",
+    "single_market_hours",
+    "instruments",
+)
+
+
+class HedgePolicy:
+    """
+    When to send a duplicate (hedge) of a slow market data request
+
+    If the response of a request to a hedged endpoint has not arrived after the `percentile` of the endpoint's recent
+    latencies, the same request is sent again and the first response received is used. Latencies are measured from
+    when the request was sent, whichever of the request and its hedge answered. Requests to hedged endpoints and their
+    hedges are sent by a thread pool of `max_workers` threads; the hedge delay starts once the request leaves the
+    pool's queue, so a busy pool slows requests down without triggering hedges. A losing request still queued in the
+    pool is cancelled, otherwise the losing response is dropped and its connection released as soon as it arrives.
+    Hedges draw from a per-endpoint `RetryBudget`, so they are at most `max_ratio` of the requests.
+
+    Hedges are counted in the client metrics (`hedges`, `hedge_wins`).
+    """
+
+    def __init__(
+        self,
+        endpoints: Iterable[str] = HEDGED_ENDPOINTS,
+        percentile: float = 0.95,
+        window: int = 200,
+        min_samples: int = 20,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.01,
+        max_ratio: float = 0.1,
+        burst: float = 5.0,
+        max_workers: int = 8,
+    ):
+        """
+        Parameters:
+            endpoints: client methods whose requests are hedged, only idempotent GETs belong here
+            percentile: fraction, latency percentile after which the hedge is sent
+            window: number of recent latencies the percentile is computed on, per endpoint
+            min_samples: latencies needed before the percentile is used, `initial_delay` is used until then
+            initial_delay: seconds, hedge delay while the endpoint has too few samples
+            min_delay: seconds, shortest hedge delay
+            max_ratio: hedges allowed per request of an endpoint
+            burst: hedges an endpoint can send in a row before its budget runs out
+            max_workers: threads sending the hedged requests and their hedges, at most as many are in flight
+        """
+        self.endpoints = frozenset(endpoints)
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.burst = burst
+        self.max_workers = max_workers
+
+        self.latencies: dict[str, deque[float]] = {}
+        self.budgets: dict[str, RetryBudget] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="schwab-api-hedge"
+                )
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def hedged(self, method: str, endpoint: str) -> bool:
+        return method == "GET" and endpoint in self.endpoints
+
+    def observe(self, endpoint: str, latency: float) -> None:
+        """
+        Add the latency in seconds of a response of `endpoint`
+        """
+        with self._lock:
+            latencies = self.latencies.get(endpoint)
+            if latencies is None:
+                latencies = self.latencies[endpoint] = deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def delay(self, endpoint: str) -> float:
+        """
+        Seconds to wait for a response of `endpoint` before sending the hedge
+        """
+        with self._lock:
+            latencies = sorted(self.latencies.get(endpoint, ()))
+
+        if len(latencies) < self.min_samples:
+            return self.initial_delay
+        index = min(len(latencies) - 1, int(self.percentile * len(latencies)))
+        return max(self.min_delay, latencies[index])
+
+    def budget(self, endpoint: str) -> RetryBudget:
+        with self._lock:
+            budget = self.budgets.get(endpoint)
+            if budget is None:
+                budget = self.budgets[endpoint] = RetryBudget(
+                    self.max_ratio, self.burst
+                )
+            return budget
@@ -0,0 +1,336 @@
+import logging
+import re
+import threading
+from bisect import bisect_left
+from heapq import nsmallest
+from itertools import islice
+from typing import Iterable, Optional
+
+from .instrument_store import InstrumentStore
+from .utils import Projection
+
+from schwab_api_wrapper.schemas.market_data import (
+    InstrumentResponse,
+    MarketDataError,
+)
+from schwab_api_wrapper.schemas.market_data.instruments_schemas import AssetType
+
+
+TOKEN_PATTERN = re.compile(r"[A-Z0-9]+")
+
+# candidate sets larger than this are matched by walking the symbols in order until the limit is reached
+SCAN_THRESHOLD = 512
+
+SearchResult = tuple[Optional[list[InstrumentResponse]], Optional[MarketDataError]]
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    return TOKEN_PATTERN.findall((text or "").upper())
+
+
+class SymbolTrie:
+    """
+    Prefix trie of upper-case symbols
+    """
+
+    def __init__(self):
+        self.root: dict = {}
+
+    def add(self, symbol: str):
+        node = self.root
+        for character in symbol:
+            node = node.setdefault(character, {})
+        node[""] = True  # end of a symbol
+
+    def with_prefix(self, prefix: str, limit: Optional[int] = None) -> list[str]:
+        """
+        Symbols starting with `prefix` in lexicographic order
+        """
+        node = self.root
+        for character in prefix:
+            node = node.get(character)
+            if node is None:
+                return []
+
+        symbols = []
+        stack = [(prefix, node)]
+        while stack and (limit is None or len(symbols) < limit):
+            symbol, node = stack.pop()
+            if "" in node:
+                symbols.append(symbol)
+            stack.extend(
+                (symbol + character, child)
+                for character, child in sorted(node.items(), reverse=True)
+                if character
+            )
+
+        return symbols
+
+
+class InstrumentIndex:
+    """
+    Offline search index over the instruments of an `InstrumentStore`
+
+    Symbols are kept in a prefix trie and description tokens in an inverted index (with a sorted token list for
+    prefix matching of the last token), so autocomplete queries never leave the process. A query with no local
+    match falls back to the matching `instruments()` projection, and the instruments it returns are added to the
+    store and the index.
+    """
+
+    def __init__(self, store: InstrumentStore):
+        """
+        Parameters:
+            store: instrument store the index is built from, its client is used for fallback searches
+        """
+        self.store = store
+
+        self.instruments: dict[str, InstrumentResponse] = {}
+        self.symbols: list[str] = []
+        self.trie = SymbolTrie()
+        self.postings: dict[str, set[str]] = {}
+        self.tokens: list[str] = []
+
+        self._lock = threading.Lock()
+
+        self.rebuild()
+
+    def __len__(self):
+        return len(self.instruments)
+
+    def rebuild(self):
+        """
+        Rebuild the index from every instrument in the store
+        """
+        instruments = [self.store.get(symbol) for symbol in list(self.store.entries)]
+
+        with self._lock:
+            self.instruments = {}
+            self.trie = SymbolTrie()
+            self.postings = {}
+            self._add(instruments)
+
+    def add(self, instruments: Iterable[InstrumentResponse]):
+        with self._lock:
+            self._add(instruments)
+
+    def _add(self, instruments: Iterable[InstrumentResponse]):
+        for instrument in instruments:
+            if instrument is None or instrument.assetType == AssetType.UNKNOWN:
+                continue
+
+            symbol = instrument.symbol.upper()
+            previous = self.instruments.get(symbol)
+            if previous is not None:
+                for token in tokenize(previous.description):
+                    self.postings.get(token, set()).discard(symbol)
+
+            self.instruments[symbol] = instrument
+            self.trie.add(symbol)
+            for token in tokenize(instrument.description):
+                self.postings.setdefault(token, set()).add(symbol)
+
+        self.symbols = sorted(self.instruments)
+        self.tokens = sorted(
+            token for token, symbols in self.postings.items() if symbols
+        )
+
+    def _resolve(self, symbols: Iterable[str], limit: Optional[int]) -> list:
+        instruments = [self.instruments[symbol] for symbol in symbols]
+        return instruments if limit is None else instruments[:limit]
+
+    def _fallback(
+        self, query: str, projection: Projection, limit: Optional[int], retry: bool
+    ) -> SearchResult:
+        logging.getLogger(__name__).debug(
+            f"Instrument Index: no local match for `{query}`, searching with {projection.value}"
+        )
+
+        response, error = self.store.client.instruments([query], projection, retry)
+        if error is not None:
+            return None, error
+
+        instruments = [
+            instrument
+            for instrument in response.instruments
+            if instrument.assetType != AssetType.UNKNOWN
+        ]
+
+        self.store.add(instruments)
+        self.store.dump()
+        self.add(instruments)
+
+        return (instruments if limit is None else instruments[:limit]), None
+
+    def _search(
+        self,
+        symbols: list[str],
+        query: str,
+        projection: Projection,
+        limit: Optional[int],
+        fallback: bool,
+        retry: bool,
+    ) -> SearchResult:
+        if symbols or not fallback:
+            return self._resolve(symbols, limit), None
+
+        return self._fallback(query, projection, limit, retry)
+
+    def _description_symbols(
+        self, tokens: list[str], limit: Optional[int]
+    ) -> list[str]:
+        *complete, partial = tokens
+
+        start = bisect_left(self.tokens, partial)
+        end = bisect_left(self.tokens, partial + "\U0010ffff")
+        partial_sets = [self.postings[token] for token in self.tokens[start:end]]
+        complete_sets = sorted(
+            (self.postings.get(token, set()) for token in complete), key=len
+        )
+
+        if not partial_sets or (complete_sets and not complete_sets[0]):
+            return []
+
+        candidates = (
+            len(complete_sets[0])
+            if complete_sets
+            else sum(len(symbols) for symbols in partial_sets)
+        )
+
+        if limit is not None and candidates > SCAN_THRESHOLD:
+            # broad query, the first `limit` symbols in order are found long before the end of the list
+            return list(
+                islice(
+                    (
+                        symbol
+                        for symbol in self.symbols
+                        if all(symbol in symbols for symbols in complete_sets)
+                        and any(symbol in symbols for symbols in partial_sets)
+                    ),
+                    limit,
+                )
+            )
+
+        matches = set().union(*partial_sets)
+        for symbols in complete_sets:
+            matches &= symbols
+
+        return sorted(matches) if limit is None else nsmallest(limit, matches)
+
+    def symbol_prefix(
+        self,
+        prefix: str,
+        limit: Optional[int] = 20,
+        fallback: bool = True,
+        retry: bool = False,
+    ) -> SearchResult:
+        """
+        Instruments whose symbol starts with `prefix`, in symbol order
+
+        Parameters:
+            prefix: symbol prefix, case insensitive
+            limit: maximum number of instruments returned, all if None
+            fallback: search with symbol-regex if nothing matches locally
+            retry: retry the fallback request if it fails
+        """
+        prefix = prefix.upper()
+        with self._lock:
+            symbols = self.trie.with_prefix(prefix, limit)
+
+        return self._search(
+            symbols,
+            f"{re.escape(prefix)}.*",
+            Projection.SYMBOL_REGEX,
+            limit,
+            fallback,
+            retry,
+        )
+
+    def symbol_regex(
+        self,
+        pattern: str,
+        limit: Optional[int] = 20,
+        fallback: bool = True,
+        retry: bool = False,
+    ) -> SearchResult:
+        """
+        Instruments whose whole symbol matches the regular expression `pattern`, in symbol order
+
+        Parameters:
+            pattern: regular expression, matched against upper-case symbols
+            limit: maximum number of instruments returned, all if None
+            fallback: search with symbol-regex if nothing matches locally
+            retry: retry the fallback request if it fails
+        """
+        compiled = re.compile(pattern)
+        with self._lock:
+            symbols = list(
+                islice(
+                    (symbol for symbol in self.symbols if compiled.fullmatch(symbol)),
+                    limit,
+                )
+            )
+
+        return self._search(
+            symbols, pattern, Projection.SYMBOL_REGEX, limit, fallback, retry
+        )
+
+    def description(
+        self,
+        query: str,
+        limit: Optional[int] = 20,
+        fallback: bool = True,
+        retry: bool = False,
+    ) -> SearchResult:
+        """
+        Instruments whose description contains every token of `query`, in symbol order.
+        The last token also matches description tokens it is a prefix of, so partially typed words match.
+
+        Parameters:
+            query: search text, case insensitive
+            limit: maximum number of instruments returned, all if None
+            fallback: search with desc-search if nothing matches locally
+            retry: retry the fallback request if it fails
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return [], None
+
+        with self._lock:
+            symbols = self._description_symbols(tokens, limit)
+
+        return self._search(
+            symbols, query, Projection.DESC_SEARCH, limit, fallback, retry
+        )
+
+    def description_regex(
+        self,
+        pattern: str,
+        limit: Optional[int] = 20,
+        fallback: bool = True,
+        retry: bool = False,
+    ) -> SearchResult:
+        """
+        Instruments whose description matches the regular expression `pattern` anywhere, in symbol order
+
+        Parameters:
+            pattern: regular expression, matched case insensitively
+            limit: maximum number of instruments returned, all if None
+            fallback: search with desc-regex if nothing matches locally
+            retry: retry the fallback request if it fails
+        """
+        compiled = re.compile(pattern, re.IGNORECASE)
+        with self._lock:
+            symbols = list(
+                islice(
+                    (
+                        symbol
+                        for symbol in self.symbols
+                        if compiled.search(self.instruments[symbol].description or "")
+                    ),
+                    limit,
+                )
+            )
+
+        return self._search(
+            symbols, pattern, Projection.DESC_REGEX, limit, fallback, retry
+        )
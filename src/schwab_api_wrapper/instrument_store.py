@@ -0,0 +1,259 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Union
+from zoneinfo import ZoneInfo
+
+from .base_client import BaseClient
+from .utils import Projection
+
+from schwab_api_wrapper.schemas.market_data import (
+    InstrumentResponse,
+    InstrumentsRoot,
+    MarketDataError,
+)
+from schwab_api_wrapper.schemas.market_data.instruments_schemas import AssetType
+
+
+KEY_FETCHED = "fetched"  # instrument data
+KEY_FUNDAMENTAL = "fundamental"
+KEY_FUNDAMENTAL_FETCHED = "fundamental_fetched"
+KEY_INSTRUMENT = "instrument"
+
+LOOKUP_PROJECTIONS = (Projection.SYMBOL_SEARCH, Projection.FUNDAMENTAL)
+
+
+class InstrumentStore:
+    """
+    Local instrument store keyed by symbol and CUSIP, optionally persisted to a JSON file
+
+    Entries are populated from `instruments()` responses. `lookup` serves fresh entries from memory and fetches
+    only the missing or stale symbols with `instruments_map`, `batch_size` symbols per concurrent request. Fundamentals go stale after
+    `fundamentals_ttl`, the rest of the instrument (CUSIP, description, exchange) after `instrument_ttl`, each
+    timestamped when it was last fetched.
+    """
+
+    def __init__(
+        self,
+        client: BaseClient,
+        filepath: Optional[str] = None,
+        fundamentals_ttl: timedelta = timedelta(days=1),
+        instrument_ttl: timedelta = timedelta(days=30),
+        batch_size: int = 100,
+        max_workers: int = 8,
+    ):
+        """
+        Parameters:
+            client: client used to fetch instruments
+            filepath: JSON file the store is loaded from and saved to, in memory only if None
+            fundamentals_ttl: how long fundamentals are served before they are refetched
+            instrument_ttl: how long symbol-search data is served before it is refetched
+            batch_size: maximum number of symbols per `instruments()` call
+            max_workers: maximum number of concurrent `instruments()` calls
+        """
+        self.client = client
+        self.filepath = filepath
+        self.fundamentals_ttl = fundamentals_ttl
+        self.instrument_ttl = instrument_ttl
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+
+        self.entries: dict[str, dict] = {}
+        self.cusips: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        if self.filepath is not None and os.path.exists(self.filepath):
+            self.load()
+
+    def load(self):
+        with open(self.filepath, "r") as fin:
+            entries = json.load(fin)
+
+        with self._lock:
+            self.entries = entries
+            self.cusips = {
+                entry[KEY_INSTRUMENT]["cusip"]: symbol
+                for symbol, entry in entries.items()
+                if entry[KEY_INSTRUMENT].get("cusip")
+            }
+
+    def dump(self):
+        if self.filepath is None:
+            return
+
+        with self._lock:
+            entries = json.dumps(self.entries)
+
+        temporary_filepath = f"{self.filepath}.tmp"
+        with open(temporary_filepath, "w") as fin:
+            fin.write(entries)
+        os.replace(temporary_filepath, self.filepath)
+
+        logging.getLogger(__name__).debug(
+            f"Instrument store written to {self.filepath}"
+        )
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self.entries
+
+    def add(
+        self,
+        instruments: Union[InstrumentsRoot, Iterable[InstrumentResponse]],
+        fundamental: bool = False,
+    ):
+        """
+        Store instruments from an `instruments()` response
+
+        Parameters:
+            instruments: an InstrumentsRoot or any iterable of InstrumentResponse objects
+            fundamental: the response was requested with the fundamental projection
+        """
+        if isinstance(instruments, InstrumentsRoot):
+            instruments = instruments.instruments
+
+        fetched = datetime.now(ZoneInfo("America/New_York")).isoformat()
+
+        with self._lock:
+            for instrument in instruments:
+                if instrument.assetType == AssetType.UNKNOWN:  # placeholder
+                    continue
+
+                symbol = instrument.symbol.upper()
+                previous = self.entries.get(symbol)
+
+                if (
+                    not fundamental
+                    and previous is not None
+                    and previous[KEY_FUNDAMENTAL]
+                ):
+                    # keep the cached fundamentals and their age, only refresh the instrument data
+                    instrument_json = dict(previous[KEY_INSTRUMENT])
+                    instrument_json.update(
+                        instrument.model_dump(mode="json", exclude={"fundamental"})
+                    )
+                    previous[KEY_INSTRUMENT] = instrument_json
+                    previous.setdefault(KEY_FUNDAMENTAL_FETCHED, previous[KEY_FETCHED])
+                    previous[KEY_FETCHED] = fetched
+                else:
+                    self.entries[symbol] = {
+                        KEY_FETCHED: fetched,
+                        KEY_FUNDAMENTAL: fundamental,
+                        KEY_FUNDAMENTAL_FETCHED: fetched if fundamental else None,
+                        KEY_INSTRUMENT: instrument.model_dump(mode="json"),
+                    }
+
+                if instrument.cusip:
+                    self.cusips[instrument.cusip] = symbol
+
+    def get(self, symbol: str) -> Optional[InstrumentResponse]:
+        """
+        Cached instrument of `symbol` regardless of its age, None if it was never fetched
+        """
+        entry = self.entries.get(symbol.upper())
+        if entry is None:
+            return None
+
+        return InstrumentResponse(**entry[KEY_INSTRUMENT])
+
+    def by_cusip(self, cusip: str) -> Optional[InstrumentResponse]:
+        """
+        Cached instrument with the CUSIP `cusip` regardless of its age, None if it was never fetched
+        """
+        symbol = self.cusips.get(cusip)
+        if symbol is None:
+            return None
+
+        return self.get(symbol)
+
+    def _fresh(
+        self, symbol: str, fundamental: bool, now: datetime
+    ) -> Optional[InstrumentResponse]:
+        entry = self.entries.get(symbol)
+        if entry is None or (fundamental and not entry[KEY_FUNDAMENTAL]):
+            return None
+
+        if fundamental:
+            # entries saved before the fundamentals had their own timestamp
+            fetched = entry.get(KEY_FUNDAMENTAL_FETCHED) or entry[KEY_FETCHED]
+            ttl = self.fundamentals_ttl
+        else:
+            fetched = entry[KEY_FETCHED]
+            ttl = self.instrument_ttl
+        if datetime.fromisoformat(fetched) < now - ttl:
+            return None
+
+        return InstrumentResponse(**entry[KEY_INSTRUMENT])
+
+    def lookup(
+        self,
+        symbols: list[str],
+        projection: Projection = Projection.FUNDAMENTAL,
+        retry: bool = False,
+    ) -> tuple[Optional[dict[str, InstrumentResponse]], Optional[MarketDataError]]:
+        """
+        Get the instruments of `symbols`, fetching only the missing and stale ones
+
+        Parameters:
+            symbols: list of symbols of a security
+            projection: symbol-search or fundamental
+            retry: retry the requests if they fail
+
+        Returns the instruments keyed by upper-case symbol. Symbols unknown to Schwab are left out.
+        """
+        if projection not in LOOKUP_PROJECTIONS:
+            raise ValueError(
+                f"Projection must be one of {', '.join(p.value for p in LOOKUP_PROJECTIONS)}"
+            )
+
+        fundamental = projection == Projection.FUNDAMENTAL
+        now = datetime.now(ZoneInfo("America/New_York"))
+
+        found: dict[str, InstrumentResponse] = {}
+        missing = []
+
+        for symbol in dict.fromkeys(symbol.upper() for symbol in symbols):
+            instrument = self._fresh(symbol, fundamental, now)
+            if instrument is not None:
+                found[symbol] = instrument
+            else:
+                missing.append(symbol)
+
+        logging.getLogger(__name__).debug(
+            f"Instrument Store: {len(found)} symbols cached, {len(missing)} to fetch"
+        )
+
+        if not missing:
+            return found, None
+
+        fetched, error = self.client.instruments_map(
+            missing, projection, self.batch_size, self.max_workers, retry
+        )
+        if error is not None:
+            return None, error
+
+        self.add(fetched.values(), fundamental)
+        found.update(fetched)
+
+        self.dump()
+
+        return found, None
+
+    def prune(self):
+        """
+        Drop entries whose instrument data is older than `instrument_ttl`
+        """
+        oldest_valid = datetime.now(ZoneInfo("America/New_York")) - self.instrument_ttl
+
+        with self._lock:
+            for symbol in [
+                symbol
+                for symbol, entry in self.entries.items()
+                if datetime.fromisoformat(entry[KEY_FETCHED]) < oldest_valid
+            ]:
+                cusip = self.entries.pop(symbol)[KEY_INSTRUMENT].get("cusip")
+                self.cusips.pop(cusip, None)
@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime, date, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from .utils import MarketID
+
+from schwab_api_wrapper.schemas.market_data import MarketHoursResponse
+
+
+KEY_FETCHED = "fetched"
+KEY_HOURS = "hours"
+
+
+class MarketHoursCache:
+    """
+    Date-indexed cache of market hours, optionally persisted to a JSON file
+
+    Entries are stored per (date, market) so requests for different sets of markets share entries.
+    Entries older than `max_age` are treated as missing, since future market hours can change (e.g. early closes).
+    """
+
+    def __init__(
+        self, filepath: Optional[str] = None, max_age: timedelta = timedelta(days=7)
+    ):
+        """
+        Parameters:
+            filepath: JSON file the cache is loaded from and saved to, in memory only if None
+            max_age: how long an entry is served before it is refetched
+        """
+        self.filepath = filepath
+        self.max_age = max_age
+
+        self.entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+        if self.filepath is not None and os.path.exists(self.filepath):
+            self.load()
+
+    def load(self):
+        with open(self.filepath, "r") as fin:
+            entries = json.load(fin)
+
+        with self._lock:
+            self.entries = entries
+
+    def dump(self):
+        if self.filepath is None:
+            return
+
+        with self._lock:
+            entries = json.dumps(self.entries)
+
+        temporary_filepath = f"{self.filepath}.tmp"
+        with open(temporary_filepath, "w") as fin:
+            fin.write(entries)
+        os.replace(temporary_filepath, self.filepath)
+
+        logging.getLogger(__name__).debug(
+            f"Market hours cache written to {self.filepath}"
+        )
+
+    def get(
+        self, query_date: date, markets: list[MarketID]
+    ) -> Optional[MarketHoursResponse]:
+        """
+        Cached hours of all `markets` on `query_date`, None if any market is missing or stale
+        """
+        with self._lock:
+            entry = self.entries.get(query_date.isoformat(), {})
+            cached = [entry.get(market_id.value) for market_id in markets]
+
+        oldest_valid = datetime.now(ZoneInfo("America/New_York")) - self.max_age
+
+        if any(
+            market is None or datetime.fromisoformat(market[KEY_FETCHED]) < oldest_valid
+            for market in cached
+        ):
+            return None
+
+        return MarketHoursResponse(
+            {
+                market_id.value: market[KEY_HOURS]
+                for market_id, market in zip(markets, cached)
+                if market[KEY_HOURS]
+            }
+        )
+
+    def put(
+        self, query_date: date, markets: list[MarketID], hours: MarketHoursResponse
+    ):
+        """
+        Store the hours of `markets` on `query_date`. Markets absent from the response are stored as empty
+        so they are not refetched.
+        """
+        hours_json = hours.model_dump(mode="json")
+        fetched = datetime.now(ZoneInfo("America/New_York")).isoformat()
+
+        with self._lock:
+            entry = self.entries.setdefault(query_date.isoformat(), {})
+            for market_id in markets:
+                entry[market_id.value] = {
+                    KEY_FETCHED: fetched,
+                    KEY_HOURS: hours_json.get(market_id.value, {}),
+                }
+
+    def prune(self, before: date):
+        """
+        Drop entries for dates before `before`
+        """
+        with self._lock:
+            for key in [key for key in self.entries if key < before.isoformat()]:
+                del self.entries[key]
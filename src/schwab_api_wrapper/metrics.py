@@ -0,0 +1,266 @@
+import logging
+import threading
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+
+# seconds, upper bounds of the histogram buckets
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+@dataclass
+class RequestRecord:
+    endpoint: str  # client method, e.g. quotes or get_single_order
+    method: str  # HTTP method
+    url: str
+    status_code: Optional[int] = None
+    retries: int = 0
+    bytes_received: int = 0
+    # seconds spent sending the request and receiving the response
+    network_time: float = 0.0
+    decode_time: Optional[float] = None  # seconds spent decoding the JSON body
+    validation_time: Optional[float] = None  # seconds spent validating the model
+    hedged: bool = False  # a duplicate request was sent, see `HedgePolicy`
+    hedge_won: bool = False  # the response of the duplicate request was used
+    # class of the exception raised instead of returning a response, e.g. ConnectTimeout or CircuitOpenError
+    error: Optional[str] = None
+
+
+RequestCallback = Callable[[RequestRecord], None]
+
+
+class Histogram:
+    """
+    Bucketed counts of observed values, the cumulative Prometheus `le` buckets are derived on export
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """
+        (upper bound, number of observations <= upper bound) per bucket, ending with +Inf
+        """
+        total = 0
+        cumulative = []
+        for bound, count in zip(
+            [repr(bound) for bound in self.buckets] + ["+Inf"], self.counts
+        ):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """
+        Upper bound of the bucket holding the `fraction` quantile, None if nothing was observed
+        """
+        if self.count == 0:
+            return None
+        for index, (_, total) in enumerate(self.cumulative()):
+            if total >= fraction * self.count:
+                return (
+                    self.buckets[index] if index < len(self.buckets) else float("inf")
+                )
+
+
+@dataclass
+class EndpointMetrics:
+    requests: int = 0
+    status_codes: Counter = field(default_factory=Counter)  # "error" if no response
+    errors: Counter = field(default_factory=Counter)  # exception class -> count
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    bytes_received: int = 0
+    network_time: Histogram = field(default_factory=Histogram)
+    decode_time: Histogram = field(default_factory=Histogram)
+    validation_time: Histogram = field(default_factory=Histogram)
+
+
+class ClientMetrics:
+    """
+    Per-endpoint request metrics of a client
+
+    Every request made by a `BaseClient` produces one `RequestRecord` that is aggregated here (request and status code
+    counts, errors, retries, hedges, bytes received, and network, JSON decode and model validation time histograms)
+    and passed to the listeners. Requests failing without a response are counted under the "error" status. `to_prometheus` renders the aggregates in the Prometheus text exposition format.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Parameters:
+            buckets: upper bounds in seconds of the time histogram buckets
+        """
+        self.buckets = tuple(buckets)
+        self.endpoints: dict[tuple[str, str], EndpointMetrics] = {}
+        self.listeners: list[RequestCallback] = []
+
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback: RequestCallback) -> None:
+        """
+        Register `callback(record)`, called after every request
+        """
+        self.listeners.append(callback)
+
+    def record(self, record: RequestRecord) -> None:
+        with self._lock:
+            metrics = self.endpoints.get((record.endpoint, record.method))
+            if metrics is None:
+                metrics = self.endpoints[(record.endpoint, record.method)] = (
+                    EndpointMetrics(
+                        network_time=Histogram(self.buckets),
+                        decode_time=Histogram(self.buckets),
+                        validation_time=Histogram(self.buckets),
+                    )
+                )
+
+            metrics.requests += 1
+            if record.error is None:
+                metrics.status_codes[record.status_code] += 1
+            else:
+                metrics.status_codes["error"] += 1
+                metrics.errors[record.error] += 1
+            metrics.retries += record.retries
+            metrics.hedges += record.hedged
+            metrics.hedge_wins += record.hedge_won
+            metrics.bytes_received += record.bytes_received
+            metrics.network_time.observe(record.network_time)
+            if record.decode_time is not None:
+                metrics.decode_time.observe(record.decode_time)
+            if record.validation_time is not None:
+                metrics.validation_time.observe(record.validation_time)
+
+        for callback in self.listeners:
+            try:
+                callback(record)
+            except Exception:
+                logging.getLogger(__name__).exception(
+                    f"Metrics | {record.endpoint} listener failed"
+                )
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Aggregates as plain values, keyed by "<method> <endpoint>"
+        """
+        with self._lock:
+            return {
+                f"{method} {endpoint}": {
+                    "requests": metrics.requests,
+                    "status_codes": dict(metrics.status_codes),
+                    "errors": dict(metrics.errors),
+                    "retries": metrics.retries,
+                    "hedges": metrics.hedges,
+                    "hedge_wins": metrics.hedge_wins,
+                    "bytes_received": metrics.bytes_received,
+                    **{
+                        name: {
+                            "count": histogram.count,
+                            "sum": histogram.sum,
+                            "p50": histogram.quantile(0.5),
+                            "p95": histogram.quantile(0.95),
+                        }
+                        for name, histogram in (
+                            ("network_time", metrics.network_time),
+                            ("decode_time", metrics.decode_time),
+                            ("validation_time", metrics.validation_time),
+                        )
+                    },
+                }
+                for (endpoint, method), metrics in self.endpoints.items()
+            }
+
+    def to_prometheus(self, prefix: str = "schwab_api") -> str:
+        """
+        Aggregates in the Prometheus text exposition format
+        """
+        counters = (
+            ("requests_total", "Requests sent, by status code"),
+            ("errors_total", "Requests failed without a response, by exception"),
+            ("retries_total", "Retries of failed requests"),
+            ("hedges_total", "Duplicate requests sent for slow responses"),
+            ("hedge_wins_total", "Duplicate requests whose response was used"),
+            ("response_bytes_total", "Bytes of response bodies received"),
+        )
+        histograms = (
+            ("network_seconds", "network_time", "Time spent on the network"),
+            ("decode_seconds", "decode_time", "Time spent decoding JSON bodies"),
+            ("validation_seconds", "validation_time", "Time spent validating models"),
+        )
+
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+            lines = []
+
+            for name, description in counters:
+                lines.append(f"# HELP {prefix}_{name} {description}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for (endpoint, method), metrics in endpoints:
+                    labels = f'endpoint="{endpoint}",method="{method}"'
+                    if name == "requests_total":
+                        for status_code, count in sorted(
+                            metrics.status_codes.items(), key=lambda item: str(item[0])
+                        ):
+                            lines.append(
+                                f'{prefix}_{name}{{{labels},status="{status_code}"}} {count}'
+                            )
+                    elif name == "errors_total":
+                        for error, count in sorted(metrics.errors.items()):
+                            lines.append(
+                                f'{prefix}_{name}{{{labels},error="{error}"}} {count}'
+                            )
+                    elif name == "retries_total":
+                        lines.append(f"{prefix}_{name}{{{labels}}} {metrics.retries}")
+                    elif name == "hedges_total":
+                        lines.append(f"{prefix}_{name}{{{labels}}} {metrics.hedges}")
+                    elif name == "hedge_wins_total":
+                        lines.append(
+                            f"{prefix}_{name}{{{labels}}} {metrics.hedge_wins}"
+                        )
+                    else:
+                        lines.append(
+                            f"{prefix}_{name}{{{labels}}} {metrics.bytes_received}"
+                        )
+
+            for name, attribute, description in histograms:
+                lines.append(f"# HELP {prefix}_{name} {description}")
+                lines.append(f"# TYPE {prefix}_{name} histogram")
+                for (endpoint, method), metrics in endpoints:
+                    labels = f'endpoint="{endpoint}",method="{method}"'
+                    histogram: Histogram = getattr(metrics, attribute)
+                    for bound, total in histogram.cumulative():
+                        lines.append(
+                            f'{prefix}_{name}_bucket{{{labels},le="{bound}"}} {total}'
+                        )
+                    lines.append(f"{prefix}_{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{prefix}_{name}_count{{{labels}}} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,135 @@
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Iterable, Optional, Union
+
+from schwab_api_wrapper.schemas.trader_api.orders_schemas import (
+    Order,
+    OrderResponse,
+    Status,
+)
+
+
+TERMINAL_STATUSES = frozenset(
+    {
+        Status.FILLED,
+        Status.CANCELED,
+        Status.REJECTED,
+        Status.EXPIRED,
+        Status.REPLACED,
+    }
+)
+
+
+class OrderDeltaType(Enum):
+    NEW = "NEW"  # first time this orderId has been seen
+    CHANGED = "CHANGED"  # one or more fields changed, order still open
+    TERMINAL = "TERMINAL"  # order moved into a terminal status
+
+
+@dataclass(frozen=True)
+class OrderDelta:
+    type: OrderDeltaType
+    order: Order
+    previous: Optional[Order] = None
+    changed_fields: frozenset[str] = field(default_factory=frozenset)
+
+
+class OrderStore:
+    """
+    Local order state keyed by `orderId` that turns successive order snapshots into deltas
+
+    Feed every `get_all_orders`/`get_account_orders` result to `ingest`; it returns only the orders that are
+    new or whose fields changed since the last snapshot, so consumers do O(changes) work per poll.
+    Orders that are missing from a snapshot are left untouched since snapshots are usually windowed by entry time.
+    """
+
+    def __init__(self):
+        self.orders: dict[int, Order] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, order_id: int) -> Order:
+        return self.orders[order_id]
+
+    def __contains__(self, order_id: int) -> bool:
+        return order_id in self.orders
+
+    def __iter__(self):
+        return iter(list(self.orders.values()))
+
+    def __len__(self):
+        return len(self.orders)
+
+    def get(self, order_id: int) -> Optional[Order]:
+        return self.orders.get(order_id)
+
+    def open_orders(self) -> list[Order]:
+        return [
+            order
+            for order in self.orders.values()
+            if order.status not in TERMINAL_STATUSES
+        ]
+
+    def ingest(
+        self, snapshot: Union[OrderResponse, Iterable[Order], Order]
+    ) -> list[OrderDelta]:
+        """
+        Merge a snapshot into the store and return the deltas it produced
+
+        Parameters:
+            snapshot: an OrderResponse, any iterable of Order objects or a single Order
+        """
+        if isinstance(snapshot, Order):
+            snapshot = [snapshot]
+
+        deltas = []
+        with self._lock:
+            for order in snapshot:
+                previous = self.orders.get(order.orderId)
+                self.orders[order.orderId] = order
+
+                if previous is None:
+                    deltas.append(OrderDelta(OrderDeltaType.NEW, order))
+                    continue
+
+                if previous == order:  # cheap C-level comparison of the field dicts
+                    continue
+
+                changed_fields = frozenset(
+                    name
+                    for name in Order.model_fields
+                    if getattr(previous, name) != getattr(order, name)
+                )
+
+                if (
+                    order.status in TERMINAL_STATUSES
+                    and previous.status not in TERMINAL_STATUSES
+                ):
+                    delta_type = OrderDeltaType.TERMINAL
+                else:
+                    delta_type = OrderDeltaType.CHANGED
+
+                deltas.append(OrderDelta(delta_type, order, previous, changed_fields))
+
+        return deltas
+
+    def prune(self, entered_before: datetime) -> int:
+        """
+        Drop terminal orders entered before `entered_before`. Returns the number of orders removed.
+        """
+        with self._lock:
+            stale = [
+                order_id
+                for order_id, order in self.orders.items()
+                if order.status in TERMINAL_STATUSES
+                and order.enteredTime < entered_before
+            ]
+            for order_id in stale:
+                del self.orders[order_id]
+
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.orders.clear()
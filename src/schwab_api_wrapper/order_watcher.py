@@ -0,0 +1,261 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, date
+from typing import Callable, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+from .base_client import BaseClient
+from .order_store import TERMINAL_STATUSES
+from .utils import MarketID
+
+from schwab_api_wrapper.schemas.trader_api.orders_schemas import Order, Status
+
+
+OrderCallback = Callable[[Order, Status], None]
+
+
+class OrderWatcher:
+    """
+    Track many open orders for a single account with one shared poll per interval
+
+    Instead of calling `get_single_order` for every working order, the watcher calls `get_account_orders`
+    once per interval for the window covering all tracked orders and fires callbacks when an order's
+    `Status` changes. Orders reaching a terminal status (FILLED, CANCELED, REJECTED, EXPIRED, REPLACED)
+    stop being tracked.
+
+    The poll interval adapts to the market session and to the age of the youngest tracked order:
+    young orders are polled every `min_interval` seconds, older ones back off towards `max_interval`,
+    and while the market is closed the watcher polls every `closed_market_interval` seconds. Session hours are only
+    fetched while orders are tracked; if they cannot be fetched the market is assumed open and the fetch is retried
+    after `hours_retry_delay` seconds.
+    """
+
+    def __init__(
+        self,
+        client: BaseClient,
+        encrypted_account_number: str,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        closed_market_interval: float = 300.0,
+        age_scale: float = 60.0,
+        market_id: MarketID = MarketID.EQUITY,
+        hours_retry_delay: float = 60.0,
+    ):
+        """
+        Parameters:
+            client: client used to poll the account's orders
+            encrypted_account_number: The encrypted ID of the account
+            min_interval: seconds between polls for freshly entered orders
+            max_interval: upper bound on seconds between polls while the market is open
+            closed_market_interval: seconds between polls while the market is closed
+            age_scale: order age (seconds) at which the interval has doubled from `min_interval`
+            market_id: market whose session hours decide whether the market is open
+            hours_retry_delay: seconds before fetching the session hours again after a failed fetch
+        """
+        self.client = client
+        self.encrypted_account_number = encrypted_account_number
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.closed_market_interval = closed_market_interval
+        self.age_scale = age_scale
+        self.market_id = market_id
+        self.hours_retry_delay = hours_retry_delay
+
+        self.orders: dict[int, Order] = {}
+        self.order_callbacks: dict[int, list[OrderCallback]] = {}
+        self.callbacks: list[tuple[OrderCallback, Optional[frozenset[Status]]]] = []
+
+        self._sessions: Optional[tuple[date, list[tuple[datetime, datetime]]]] = None
+        self._hours_retry_at: Optional[float] = (
+            None  # time.monotonic of the next fetch after a failure
+        )
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, order: Order, callback: Optional[OrderCallback] = None) -> None:
+        """
+        Start tracking an order. `callback(order, previous_status)` is called on each status change of this order
+        """
+        with self._lock:
+            self.orders[order.orderId] = order
+            if callback is not None:
+                self.order_callbacks.setdefault(order.orderId, []).append(callback)
+
+    def unwatch(self, order_id: int) -> None:
+        with self._lock:
+            self.orders.pop(order_id, None)
+            self.order_callbacks.pop(order_id, None)
+
+    def add_callback(
+        self, callback: OrderCallback, statuses: Optional[Iterable[Status]] = None
+    ) -> None:
+        """
+        Register a callback for status changes of any tracked order
+
+        Parameters:
+            callback: called as `callback(order, previous_status)`
+            statuses: only call back on transitions into one of these statuses, all transitions if None
+        """
+        self.callbacks.append(
+            (callback, frozenset(statuses) if statuses is not None else None)
+        )
+
+    @property
+    def watching(self) -> list[int]:
+        with self._lock:
+            return list(self.orders)
+
+    def poll(self) -> list[tuple[Order, Status]]:
+        """
+        Fetch the account's orders once and dispatch callbacks for every tracked order whose status changed
+
+        Returns the list of (order, previous_status) transitions observed by this poll.
+        """
+        with self._lock:
+            if not self.orders:
+                return []
+            from_entered_time = min(order.enteredTime for order in self.orders.values())
+
+        now = datetime.now(ZoneInfo("America/New_York"))
+
+        response, error = self.client.get_account_orders(
+            self.encrypted_account_number,
+            from_entered_time - timedelta(minutes=1),
+            now,
+        )
+
+        if error is not None:
+            logging.getLogger(__name__).warning(
+                f"Order watcher poll failed: {error.message}"
+            )
+            return []
+
+        transitions = []
+        with self._lock:
+            for order in response:
+                previous = self.orders.get(order.orderId)
+                if previous is None:
+                    continue
+
+                self.orders[order.orderId] = order
+
+                if order.status != previous.status:
+                    transitions.append((order, previous.status))
+
+        for order, previous_status in transitions:
+            self._dispatch(order, previous_status)
+
+        return transitions
+
+    def _dispatch(self, order: Order, previous_status: Status) -> None:
+        logging.getLogger(__name__).info(
+            f"Order {order.orderId} | {previous_status.value} -> {order.status.value}"
+        )
+
+        with self._lock:
+            order_callbacks = list(self.order_callbacks.get(order.orderId, []))
+            if order.status in TERMINAL_STATUSES:
+                self.orders.pop(order.orderId, None)
+                self.order_callbacks.pop(order.orderId, None)
+
+        for callback in order_callbacks:
+            callback(order, previous_status)
+
+        for callback, statuses in self.callbacks:
+            if statuses is None or order.status in statuses:
+                callback(order, previous_status)
+
+    def market_open(self, now: Optional[datetime] = None) -> bool:
+        """
+        Whether `now` falls inside any session (pre, regular or post market) of `market_id` today.
+        Session hours are fetched once per day. The market is assumed open while they cannot be fetched.
+        """
+        if now is None:
+            now = datetime.now(ZoneInfo("America/New_York"))
+
+        today = now.astimezone(ZoneInfo("America/New_York")).date()
+
+        if self._sessions is None or self._sessions[0] != today:
+            if (
+                self._hours_retry_at is not None
+                and time.monotonic() < self._hours_retry_at
+            ):
+                return True
+
+            try:
+                hours, error = self.client.single_market_hours(self.market_id, today)
+            except Exception as e:  # e.g. network error, open circuit or deadline
+                hours, error = None, e
+            if error is not None:
+                logging.getLogger(__name__).warning(
+                    f"Order watcher market hours failed, retrying in {self.hours_retry_delay}s: {error!r}"
+                )
+                self._hours_retry_at = time.monotonic() + self.hours_retry_delay
+                return True  # assume open so we keep polling at the normal rate
+            self._hours_retry_at = None
+
+            sessions = []
+            for products in hours.root.values():
+                for product_hours in products.values():
+                    for intervals in (product_hours.sessionHours or {}).values():
+                        sessions.extend(
+                            (interval.start, interval.end) for interval in intervals
+                        )
+            self._sessions = (today, sessions)
+
+        return any(start <= now < end for start, end in self._sessions[1])
+
+    def next_interval(self, now: Optional[datetime] = None) -> float:
+        """
+        Seconds to wait before the next poll
+        """
+        if now is None:
+            now = datetime.now(ZoneInfo("America/New_York"))
+
+        with self._lock:
+            if not self.orders:
+                return self.max_interval
+            youngest = max(order.enteredTime for order in self.orders.values())
+
+        if not self.market_open(now):
+            return self.closed_market_interval
+
+        age = max((now - youngest).total_seconds(), 0.0)
+        interval = self.min_interval * (1 + age / self.age_scale)
+
+        return min(interval, self.max_interval)
+
+    def run(self) -> None:
+        """
+        Poll until `stop()` is called
+        """
+        while not self._stop_event.is_set():
+            interval = self.max_interval
+            try:
+                self.poll()
+                interval = self.next_interval()
+            except Exception:
+                logging.getLogger(__name__).exception("Order watcher poll raised")
+
+            self._stop_event.wait(interval)
+
+    def start(self) -> None:
+        """
+        Run the watcher in a background daemon thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self.run, name="schwab-order-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
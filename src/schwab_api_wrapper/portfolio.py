@@ -0,0 +1,177 @@
+import numpy as np
+from typing import Iterable, Union
+
+from schwab_api_wrapper.schemas.trader_api import (
+    Account,
+    AccountsResponse,
+    AssetType,
+)
+
+
+GROUP_KEYS = ("account", "symbol", "asset_type", "underlying")
+
+VALUE_COLUMNS = (
+    "quantity",
+    "long_quantity",
+    "short_quantity",
+    "average_price",
+    "market_value",
+    "cost_basis",
+    "day_profit_loss",
+    "open_profit_loss",
+    "maintenance_requirement",
+)
+
+
+class PositionsFrame:
+    """
+    Columnar view of the positions of one or more accounts
+
+    Each position is one row; every column is a NumPy array. Group codes for the account, symbol, asset type and
+    underlying keys are computed once at construction, so every aggregate afterwards is a single `np.bincount`
+    over a float array instead of a Python loop over pydantic `Position` objects.
+
+    Columns:
+        account, symbol, asset_type, underlying: label arrays (underlying is the symbol for non-options)
+        quantity: net quantity (long - short), in shares or contracts
+        long_quantity, short_quantity, average_price, market_value, day_profit_loss, maintenance_requirement
+        cost_basis: average price * net quantity * option multiplier
+        open_profit_loss: long + short open profit/loss (0 if not reported)
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray]):
+        self.columns = columns
+
+        self._groups: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for key in GROUP_KEYS:
+            labels, codes = np.unique(columns[key], return_inverse=True)
+            self._groups[key] = (labels, codes.reshape(-1))
+
+    @classmethod
+    def from_accounts(
+        cls, accounts: Union[AccountsResponse, Iterable[Account]]
+    ) -> "PositionsFrame":
+        """
+        Build the frame from an `accounts(account_field=AccountsField.POSITIONS)` response
+        """
+        account_numbers = []
+        symbols = []
+        asset_types = []
+        underlyings = []
+        multipliers = []
+        values = []
+
+        for account in accounts:
+            securities_account = account.securitiesAccount
+            for position in securities_account.positions or []:
+                instrument = position.instrument
+
+                account_numbers.append(securities_account.accountNumber)
+                symbols.append(instrument.symbol)
+                asset_types.append(AssetType(instrument.assetType).value)
+                if instrument.assetType == AssetType.OPTION:
+                    underlyings.append(instrument.underlyingSymbol)
+                    multipliers.append(instrument.optionMultiplier)
+                else:
+                    underlyings.append(instrument.symbol)
+                    multipliers.append(1)
+
+                values.append(
+                    (
+                        position.longQuantity,
+                        position.shortQuantity,
+                        position.averagePrice,
+                        position.marketValue,
+                        position.currentDayProfitLoss,
+                        (position.longOpenProfitLoss or 0.0)
+                        + (position.shortOpenProfitLoss or 0.0),
+                        position.maintenanceRequirement,
+                    )
+                )
+
+        value_array = np.array(values, dtype=np.float64).reshape(-1, 7)
+        long_quantity, short_quantity = value_array[:, 0], value_array[:, 1]
+        quantity = long_quantity - short_quantity
+        average_price = value_array[:, 2]
+
+        columns = {
+            "account": np.array(account_numbers, dtype=str),
+            "symbol": np.array(symbols, dtype=str),
+            "asset_type": np.array(asset_types, dtype=str),
+            "underlying": np.array(underlyings, dtype=str),
+            "quantity": quantity,
+            "long_quantity": long_quantity,
+            "short_quantity": short_quantity,
+            "average_price": average_price,
+            "market_value": value_array[:, 3],
+            "cost_basis": average_price
+            * quantity
+            * np.array(multipliers, dtype=np.float64),
+            "day_profit_loss": value_array[:, 4],
+            "open_profit_loss": value_array[:, 5],
+            "maintenance_requirement": value_array[:, 6],
+        }
+
+        return cls(columns)
+
+    def __len__(self):
+        return len(self.columns["symbol"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def aggregate(
+        self, by: str, columns: Iterable[str] = VALUE_COLUMNS
+    ) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """
+        Sum value columns per group
+
+        Parameters:
+            by: one of account, symbol, asset_type, underlying
+            columns: value columns to sum
+
+        Returns the group labels and, for each column, an array of sums aligned with the labels.
+        """
+        labels, codes = self._groups[by]
+
+        return labels, {
+            column: np.bincount(
+                codes, weights=self.columns[column], minlength=len(labels)
+            )
+            for column in columns
+        }
+
+    def _sum_by(self, by: str, column: str) -> dict[str, float]:
+        labels, sums = self.aggregate(by, (column,))
+        return dict(zip(labels.tolist(), sums[column].tolist()))
+
+    def by_asset_type(self, column: str = "market_value") -> dict[str, float]:
+        return self._sum_by("asset_type", column)
+
+    def by_account(self, column: str = "market_value") -> dict[str, float]:
+        return self._sum_by("account", column)
+
+    def by_underlying(self, column: str = "market_value") -> dict[str, float]:
+        return self._sum_by("underlying", column)
+
+    def by_symbol(self, column: str = "market_value") -> dict[str, float]:
+        return self._sum_by("symbol", column)
+
+    def totals(self, columns: Iterable[str] = VALUE_COLUMNS) -> dict[str, float]:
+        return {column: float(self.columns[column].sum()) for column in columns}
+
+    def weights(self, by: str = "symbol") -> dict[str, float]:
+        """
+        Share of gross market value per group
+        """
+        labels, codes = self._groups[by]
+        gross = np.abs(self.columns["market_value"]).sum()
+        if gross == 0:
+            return dict.fromkeys(labels.tolist(), 0.0)
+
+        absolute = np.bincount(
+            codes,
+            weights=np.abs(self.columns["market_value"]),
+            minlength=len(labels),
+        )
+        return dict(zip(labels.tolist(), (absolute / gross).tolist()))
@@ -0,0 +1,262 @@
+import threading
+from typing import Iterable, Optional, get_args
+
+import numpy as np
+
+from .streaming import StreamClient
+
+from schwab_api_wrapper.schemas.market_data import QuoteResponse
+from schwab_api_wrapper.schemas.streaming import LevelOneEquity, Service
+
+
+def _level_one_columns() -> tuple[list[tuple[str, str, type]], list[tuple[str, str]]]:
+    numeric = []
+    text = []
+    for name, field in LevelOneEquity.model_fields.items():
+        if name == "key":
+            continue
+        field_type = get_args(field.annotation)[0]  # Optional[X]
+        if field_type in (float, int, bool):
+            numeric.append((field.alias or name, name, field_type))
+        else:
+            text.append((field.alias or name, name))
+    return numeric, text
+
+
+NUMERIC_FIELDS, TEXT_FIELDS = _level_one_columns()
+
+# QuoteEquity field (by alias) -> LevelOneEquity field, MIC ids are optional and handled separately
+QUOTE_FIELDS = {
+    "52WeekHigh": "high52Week",
+    "52WeekLow": "low52Week",
+    **{
+        name: name
+        for name in (
+            "askPrice",
+            "askSize",
+            "askTime",
+            "bidPrice",
+            "bidSize",
+            "bidTime",
+            "closePrice",
+            "highPrice",
+            "lastPrice",
+            "lastSize",
+            "lowPrice",
+            "mark",
+            "markChange",
+            "markPercentChange",
+            "netChange",
+            "netPercentChange",
+            "openPrice",
+            "quoteTime",
+            "securityStatus",
+            "totalVolume",
+            "tradeTime",
+        )
+    },
+}
+
+# ReferenceEquity field -> LevelOneEquity field, the first four are required
+REFERENCE_FIELDS = {
+    "cusip": "cusip",
+    "description": "description",
+    "exchange": "exchangeID",
+    "exchangeName": "exchangeName",
+    "htbQuantity": "htbQuantity",
+    "htbRate": "htbRate",
+    "isHardToBorrow": "isHardToBorrow",
+    "isShortable": "isShortable",
+}
+
+REGULAR_FIELDS = (
+    "regularMarketLastPrice",
+    "regularMarketLastSize",
+    "regularMarketNetChange",
+    "regularMarketPercentChange",
+    "regularMarketTradeTime",
+)
+
+
+class QuoteBook:
+    """
+    Array-backed level-one equity quote book fed by raw LEVELONE_EQUITIES streamer data
+
+    Each symbol owns a preallocated row of a float64 array (numeric and boolean fields, NaN until first received) and
+    of an object array (text fields). Streamed deltas are written into the rows in place without building a
+    `LevelOneEquity` per tick; the arrays only grow (doubling) when a new symbol does not fit. `snapshot` builds a
+    `QuoteResponse` from the current state for consumers that want the REST quote models.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Parameters:
+            capacity: number of symbols preallocated, the book grows past it when needed
+        """
+        self.values = np.full((capacity, len(NUMERIC_FIELDS)), np.nan)
+        self.text = np.full((capacity, len(TEXT_FIELDS)), None, dtype=object)
+        self.updated = np.zeros(capacity, dtype=np.int64)  # milliseconds since Epoch
+
+        self.rows: dict[str, int] = {}
+        self.symbols: list[str] = []
+
+        # streamed field id -> (is numeric, column)
+        self.columns: dict[str, tuple[bool, int]] = {
+            **{key: (True, index) for index, (key, _, _) in enumerate(NUMERIC_FIELDS)},
+            **{key: (False, index) for index, (key, _) in enumerate(TEXT_FIELDS)},
+        }
+        # field name -> (is numeric, column)
+        self.names: dict[str, tuple[bool, int]] = {
+            **{
+                name: (True, index) for index, (_, name, _) in enumerate(NUMERIC_FIELDS)
+            },
+            **{name: (False, index) for index, (_, name) in enumerate(TEXT_FIELDS)},
+        }
+
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.rows
+
+    def attach(self, stream: StreamClient) -> None:
+        """
+        Feed the book from the raw LEVELONE_EQUITIES data of `stream`
+        """
+        stream.add_raw_handler(self.apply, Service.LEVELONE_EQUITIES)
+
+    def _row(self, symbol: str) -> int:
+        row = self.rows.get(symbol)
+        if row is not None:
+            return row
+
+        row = len(self.symbols)
+        if row == len(self.values):
+            capacity = 2 * len(self.values)
+            values = np.full((capacity, self.values.shape[1]), np.nan)
+            values[:row] = self.values
+            text = np.full((capacity, self.text.shape[1]), None, dtype=object)
+            text[:row] = self.text
+            updated = np.zeros(capacity, dtype=np.int64)
+            updated[:row] = self.updated
+            self.values, self.text, self.updated = values, text, updated
+
+        self.rows[symbol] = row
+        self.symbols.append(symbol)
+        return row
+
+    def apply(self, data: dict) -> None:
+        """
+        Apply one raw LEVELONE_EQUITIES data entry, `{"timestamp": ..., "content": [{"key": symbol, "1": ...}]}`
+        """
+        columns = self.columns
+        timestamp = data.get("timestamp", 0)
+
+        with self._lock:
+            values = self.values
+            text = self.text
+            for item in data["content"]:
+                row = self._row(item["key"])
+                if values is not self.values:  # the book grew
+                    values, text = self.values, self.text
+
+                for field, value in item.items():
+                    column = columns.get(field)
+                    if column is None:
+                        continue
+                    if column[0]:
+                        values[row, column[1]] = value
+                    else:
+                        text[row, column[1]] = value
+
+                self.updated[row] = timestamp
+
+    def get(self, symbol: str, field: str):
+        """
+        Current value of `field` (a `LevelOneEquity` field name) for `symbol`, None if never received
+        """
+        numeric, column = self.names[field]
+        row = self.rows.get(symbol)
+        if row is None:
+            return None
+
+        if not numeric:
+            return self.text[row, column]
+
+        value = self.values[row, column]
+        return None if np.isnan(value) else float(value)
+
+    def column(self, field: str) -> np.ndarray:
+        """
+        Copy of the column of `field` (a `LevelOneEquity` field name), aligned with `symbols`
+        """
+        numeric, column = self.names[field]
+        with self._lock:
+            array = self.values if numeric else self.text
+            return array[: len(self.symbols), column].copy()
+
+    def _quote(self, symbol: str, row: int, values: np.ndarray, text: np.ndarray):
+        fields = {}
+        for column, (_, name, field_type) in enumerate(NUMERIC_FIELDS):
+            value = values[row, column]
+            if not np.isnan(value):
+                fields[name] = field_type(value)
+        for column, (_, name) in enumerate(TEXT_FIELDS):
+            if text[row, column] is not None:
+                fields[name] = text[row, column]
+
+        if fields.get("assetMainType", "EQUITY") != "EQUITY":
+            return None
+
+        quote = {
+            quote_name: fields.get(name, "" if name == "securityStatus" else 0)
+            for quote_name, name in QUOTE_FIELDS.items()
+        }
+        for name in ("askMICId", "bidMICId", "lastMICId"):
+            quote[name] = fields.get(name)
+
+        reference = {
+            reference_name: fields[name]
+            for reference_name, name in REFERENCE_FIELDS.items()
+            if name in fields
+        }
+        regular = {name: fields[name] for name in REGULAR_FIELDS if name in fields}
+
+        return {
+            "assetMainType": "EQUITY",
+            "assetSubType": fields.get("assetSubType"),
+            "symbol": symbol,
+            "realtime": not fields["delayed"] if "delayed" in fields else None,
+            "quote": quote,
+            "reference": (
+                reference
+                if all(name in reference for name in list(REFERENCE_FIELDS)[:4])
+                else None
+            ),
+            "regular": regular if len(regular) == len(REGULAR_FIELDS) else None,
+        }
+
+    def snapshot(self, symbols: Optional[Iterable[str]] = None) -> QuoteResponse:
+        """
+        Current state as a `QuoteResponse` of equity quotes, every symbol in the book by default.
+        Fields not received yet are 0 in the quote; reference and regular market data are only included once
+        all their required fields were received. Symbols that are not equities are left out.
+        """
+        with self._lock:
+            if symbols is None:
+                symbols = list(self.symbols)
+            rows = [
+                (symbol, self.rows[symbol]) for symbol in symbols if symbol in self.rows
+            ]
+            values = self.values[[row for _, row in rows]]
+            text = self.text[[row for _, row in rows]]
+
+        quotes = {}
+        for index, (symbol, _) in enumerate(rows):
+            quote = self._quote(symbol, index, values, text)
+            if quote is not None:
+                quotes[symbol] = quote
+
+        return QuoteResponse(quotes)
@@ -13,8 +13,9 @@ class RedisClient(BaseClient):
         redis_config_filepath: str,
         renew_refresh_token: bool = False,
         immediate_refresh: bool = True,
+        http2: bool = False,
     ):
-        super().__init__()
+        super().__init__(http2)
 
         self.redis_config_filepath = redis_config_filepath
         with open(self.redis_config_filepath, "r") as fin:
@@ -63,6 +64,18 @@ class RedisClient(BaseClient):
         encrypted_token = self.encrypt_token()
         return self.redis.set("token", encrypted_token)
 
+    def load_account_hashes(self) -> Optional[dict[str, str]]:
+        encrypted_account_hashes = self.redis.get("account_hashes")
+        if encrypted_account_hashes is None:
+            return None
+        return self.decrypt_token(encrypted_account_hashes)
+
+    def dump_account_hashes(self, account_hashes: dict[str, str]) -> bool:
+        encrypted_account_hashes = self.cipher_suite.encrypt(
+            json.dumps(account_hashes).encode()
+        )
+        return self.redis.set("account_hashes", encrypted_account_hashes)
+
     def encrypt_token(self) -> bytes:
         return self.cipher_suite.encrypt(json.dumps(self.parameters).encode())
 
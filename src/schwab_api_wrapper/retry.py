@@ -0,0 +1,203 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, Optional
+
+import requests
+from requests import Response
+
+
+# methods that can be repeated without changing the outcome, orders placed or replaced twice are two orders
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "DELETE"})
+
+# statuses telling that the request was not processed, a non idempotent request may be repeated on them
+NOT_PROCESSED_STATUSES = frozenset({429})
+
+
+def retry_after(response: Optional[Response]) -> Optional[float]:
+    """
+    Seconds to wait asked by the `Retry-After` header of `response`, in seconds or as an HTTP date, None if absent
+    """
+    if response is None:
+        return None
+
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+def not_sent(exception: Exception) -> bool:
+    """
+    Whether the request failed before it was sent, i.e. while connecting
+    """
+    if isinstance(exception, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(exception, requests.exceptions.ConnectionError):
+        reason = exception.args[0] if exception.args else None
+        reason = getattr(reason, "reason", reason)
+        return type(reason).__name__ in (
+            "NewConnectionError",
+            "NameResolutionError",
+            "ConnectError",  # httpx, see `HTTPXSession`
+        )
+    return False
+
+
+class RetryBudget:
+    """
+    Token bucket limiting the retries of an endpoint to a fraction of its requests, so a failing endpoint is not
+    hammered by every caller retrying at once. Every request deposits `ratio` tokens, every retry withdraws one.
+    """
+
+    def __init__(self, ratio: float = 0.2, burst: float = 10.0):
+        """
+        Parameters:
+            ratio: retries allowed per request on average
+            burst: tokens the bucket holds, and starts with
+        """
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst
+
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before repeating a failed request
+
+    A request is retried on a status of `status_forcelist` or a network error, waiting a random time between 0 and
+    `backoff_factor * 2 ** (retry - 1)` seconds capped at `max_backoff` (exponential backoff with full jitter, so
+    clients failing together do not retry together), or the time asked by a `Retry-After` header when it is longer.
+
+    Only idempotent requests (GET, DELETE) are repeated after the server may have processed them. Order placements
+    and replacements are only repeated when they were not sent (connection failure) or rejected unprocessed (429),
+    unless the caller marks the request idempotent.
+
+    Every endpoint has a `RetryBudget`, and its number of retries can be set in `endpoint_retries`.
+    """
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 1.0,
+        max_backoff: float = 30.0,
+        status_forcelist: Iterable[int] = (429, 500, 501, 502, 503, 504),
+        respect_retry_after: bool = True,
+        max_retry_after: float = 60.0,
+        endpoint_retries: Optional[dict[str, int]] = None,
+        budget_ratio: float = 0.2,
+        budget_burst: float = 10.0,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Parameters:
+            total: retries of a request after its first attempt
+            backoff_factor: seconds, base of the exponential backoff
+            max_backoff: seconds, longest backoff
+            status_forcelist: statuses retried
+            respect_retry_after: wait at least the time asked by `Retry-After` headers
+            max_retry_after: seconds, longest wait asked by a `Retry-After` header that is honored, the request is
+                not retried when the server asks for longer
+            endpoint_retries: endpoint (client method name) -> retries, overriding `total`
+            budget_ratio: retries allowed per request of an endpoint, see `RetryBudget`
+            budget_burst: retries an endpoint can make in a row before its budget runs out
+            sleep: called with the backoff in seconds
+            rng: random source of the jitter
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.status_forcelist = frozenset(status_forcelist)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.endpoint_retries = dict(endpoint_retries or {})
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self.sleep = sleep
+        self.rng = rng if rng is not None else random.Random()
+
+        self.budgets: dict[str, RetryBudget] = {}
+        self._lock = threading.Lock()
+
+    def retries(self, endpoint: str) -> int:
+        return self.endpoint_retries.get(endpoint, self.total)
+
+    def budget(self, endpoint: str) -> RetryBudget:
+        with self._lock:
+            budget = self.budgets.get(endpoint)
+            if budget is None:
+                budget = self.budgets[endpoint] = RetryBudget(
+                    self.budget_ratio, self.budget_burst
+                )
+            return budget
+
+    def retryable(
+        self,
+        method: str,
+        response: Optional[Response] = None,
+        exception: Optional[Exception] = None,
+        idempotent: Optional[bool] = None,
+    ) -> bool:
+        """
+        Whether the outcome of an attempt, a response or the exception raised sending the request, may be retried
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        if exception is not None:
+            if not isinstance(
+                exception,
+                (requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+            ):
+                return False
+            return idempotent or not_sent(exception)
+
+        if response is None or response.status_code not in self.status_forcelist:
+            return False
+        return idempotent or response.status_code in NOT_PROCESSED_STATUSES
+
+    def backoff(
+        self, retry: int, response: Optional[Response] = None
+    ) -> Optional[float]:
+        """
+        Seconds to wait before the `retry`-th retry (from 1), None if the server asks to wait too long
+        """
+        ceiling = min(self.max_backoff, self.backoff_factor * 2 ** (retry - 1))
+        delay = self.rng.uniform(0, ceiling)
+
+        if self.respect_retry_after:
+            asked = retry_after(response)
+            if asked is not None:
+                if asked > self.max_retry_after:
+                    return None
+                delay = max(delay, asked)
+
+        return delay
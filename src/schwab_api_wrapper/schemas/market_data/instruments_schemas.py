@@ -129,6 +129,7 @@ def default_instrument_response(symbol) -> InstrumentResponse:
         "bondPrice": None,
         "fundamental": {
             "symbol": "",
+            "high52": 0,
             "low52": 0,
             "dividendAmount": 0,
             "dividendYield": 0,
@@ -0,0 +1 @@
+from .streaming_schemas import *
@@ -0,0 +1,193 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Optional, List
+from enum import Enum
+
+
+class Service(Enum):
+    ADMIN = "ADMIN"
+    LEVELONE_EQUITIES = "LEVELONE_EQUITIES"
+    LEVELONE_OPTIONS = "LEVELONE_OPTIONS"
+    LEVELONE_FUTURES = "LEVELONE_FUTURES"
+    LEVELONE_FUTURES_OPTIONS = "LEVELONE_FUTURES_OPTIONS"
+    LEVELONE_FOREX = "LEVELONE_FOREX"
+    NYSE_BOOK = "NYSE_BOOK"
+    NASDAQ_BOOK = "NASDAQ_BOOK"
+    OPTIONS_BOOK = "OPTIONS_BOOK"
+    CHART_EQUITY = "CHART_EQUITY"
+    CHART_FUTURES = "CHART_FUTURES"
+    SCREENER_EQUITY = "SCREENER_EQUITY"
+    SCREENER_OPTION = "SCREENER_OPTION"
+    ACCT_ACTIVITY = "ACCT_ACTIVITY"
+
+
+class Command(Enum):
+    LOGIN = "LOGIN"
+    LOGOUT = "LOGOUT"
+    SUBS = "SUBS"
+    ADD = "ADD"
+    UNSUBS = "UNSUBS"
+    VIEW = "VIEW"
+
+
+class StreamerCode(Enum):
+    SUCCESS = 0
+    LOGIN_DENIED = 3
+    UNKNOWN_FAILURE = 9
+    SERVICE_NOT_AVAILABLE = 11
+    CLOSE_CONNECTION = 12
+    REACHED_SYMBOL_LIMIT = 19
+    STREAM_CONN_NOT_FOUND = 20
+    BAD_COMMAND_FORMAT = 21
+    FAILED_COMMAND_SUBS = 22
+    FAILED_COMMAND_UNSUBS = 23
+    FAILED_COMMAND_ADD = 24
+    FAILED_COMMAND_VIEW = 25
+    SUCCEEDED_COMMAND_SUBS = 26
+    SUCCEEDED_COMMAND_UNSUBS = 27
+    SUCCEEDED_COMMAND_ADD = 28
+    SUCCEEDED_COMMAND_VIEW = 29
+    STOP_STREAMING = 30
+
+
+class StreamModel(BaseModel):
+    """
+    Base of the streamed content models, fields are sent under their numeric ids and only when they changed
+    """
+
+    model_config = ConfigDict(populate_by_name=True, extra="allow")
+
+
+class LevelOneEquity(StreamModel):
+    key: str  # symbol
+    delayed: Optional[bool] = None
+    assetMainType: Optional[str] = None
+    assetSubType: Optional[str] = None
+    cusip: Optional[str] = None
+    bidPrice: Optional[float] = Field(None, alias="1")
+    askPrice: Optional[float] = Field(None, alias="2")
+    lastPrice: Optional[float] = Field(None, alias="3")
+    bidSize: Optional[int] = Field(None, alias="4")
+    askSize: Optional[int] = Field(None, alias="5")
+    askID: Optional[str] = Field(None, alias="6")
+    bidID: Optional[str] = Field(None, alias="7")
+    totalVolume: Optional[int] = Field(None, alias="8")
+    lastSize: Optional[int] = Field(None, alias="9")
+    highPrice: Optional[float] = Field(None, alias="10")
+    lowPrice: Optional[float] = Field(None, alias="11")
+    closePrice: Optional[float] = Field(None, alias="12")
+    exchangeID: Optional[str] = Field(None, alias="13")
+    marginable: Optional[bool] = Field(None, alias="14")
+    description: Optional[str] = Field(None, alias="15")
+    lastID: Optional[str] = Field(None, alias="16")
+    openPrice: Optional[float] = Field(None, alias="17")
+    netChange: Optional[float] = Field(None, alias="18")
+    high52Week: Optional[float] = Field(None, alias="19")
+    low52Week: Optional[float] = Field(None, alias="20")
+    peRatio: Optional[float] = Field(None, alias="21")
+    annualDividendAmount: Optional[float] = Field(None, alias="22")
+    dividendYield: Optional[float] = Field(None, alias="23")
+    nav: Optional[float] = Field(None, alias="24")
+    exchangeName: Optional[str] = Field(None, alias="25")
+    dividendDate: Optional[str] = Field(None, alias="26")
+    regularMarketQuote: Optional[bool] = Field(None, alias="27")
+    regularMarketTrade: Optional[bool] = Field(None, alias="28")
+    regularMarketLastPrice: Optional[float] = Field(None, alias="29")
+    regularMarketLastSize: Optional[int] = Field(None, alias="30")
+    regularMarketNetChange: Optional[float] = Field(None, alias="31")
+    securityStatus: Optional[str] = Field(None, alias="32")
+    mark: Optional[float] = Field(None, alias="33")
+    quoteTime: Optional[int] = Field(None, alias="34")  # milliseconds since Epoch
+    tradeTime: Optional[int] = Field(None, alias="35")  # milliseconds since Epoch
+    regularMarketTradeTime: Optional[int] = Field(None, alias="36")
+    bidTime: Optional[int] = Field(None, alias="37")
+    askTime: Optional[int] = Field(None, alias="38")
+    askMICId: Optional[str] = Field(None, alias="39")
+    bidMICId: Optional[str] = Field(None, alias="40")
+    lastMICId: Optional[str] = Field(None, alias="41")
+    netPercentChange: Optional[float] = Field(None, alias="42")
+    regularMarketPercentChange: Optional[float] = Field(None, alias="43")
+    markChange: Optional[float] = Field(None, alias="44")
+    markPercentChange: Optional[float] = Field(None, alias="45")
+    htbQuantity: Optional[int] = Field(None, alias="46")
+    htbRate: Optional[float] = Field(None, alias="47")
+    isHardToBorrow: Optional[bool] = Field(None, alias="48")
+    isShortable: Optional[bool] = Field(None, alias="49")
+    postMarketNetChange: Optional[float] = Field(None, alias="50")
+    postMarketPercentChange: Optional[float] = Field(None, alias="51")
+
+
+class ChartEquity(StreamModel):
+    key: str  # symbol
+    sequence: Optional[int] = Field(None, alias="seq")
+    openPrice: Optional[float] = Field(None, alias="1")
+    highPrice: Optional[float] = Field(None, alias="2")
+    lowPrice: Optional[float] = Field(None, alias="3")
+    closePrice: Optional[float] = Field(None, alias="4")
+    volume: Optional[float] = Field(None, alias="5")
+    chartSequence: Optional[int] = Field(None, alias="6")
+    chartTime: Optional[int] = Field(None, alias="7")  # milliseconds since Epoch
+    chartDay: Optional[int] = Field(None, alias="8")
+
+
+class AccountActivity(StreamModel):
+    key: str  # subscription key
+    sequence: Optional[int] = Field(None, alias="seq")
+    account: Optional[str] = Field(None, alias="1")
+    messageType: Optional[str] = Field(None, alias="2")
+    messageData: Optional[str] = Field(None, alias="3")  # JSON encoded message body
+
+
+# content model of each service, content of other services is left as dictionaries
+SERVICE_MODELS: dict[Service, type[StreamModel]] = {
+    Service.LEVELONE_EQUITIES: LevelOneEquity,
+    Service.CHART_EQUITY: ChartEquity,
+    Service.ACCT_ACTIVITY: AccountActivity,
+}
+
+
+def service_fields(service: Service) -> list[str]:
+    """
+    Every numeric field id of a service with a content model
+    """
+    model = SERVICE_MODELS[service]
+    return ["0"] + [
+        field.alias
+        for field in model.model_fields.values()
+        if field.alias is not None and field.alias.isdigit()
+    ]
+
+
+class ResponseContent(BaseModel):
+    code: int
+    msg: Optional[str] = None
+
+
+class StreamResponse(BaseModel):
+    """
+    Reply to a request sent to the streamer
+    """
+
+    service: str
+    command: str
+    requestid: str
+    SchwabClientCorrelId: Optional[str] = None
+    timestamp: int
+    content: ResponseContent
+
+
+class StreamData(BaseModel):
+    """
+    Streamed data of one service, `content` holds one model per key
+    """
+
+    service: str
+    timestamp: int
+    command: str
+    content: List[Any] = []
+
+
+class StreamNotify(BaseModel):
+    heartbeat: Optional[str] = None
+    service: Optional[str] = None
+    timestamp: Optional[int] = None
+    content: Optional[ResponseContent] = None
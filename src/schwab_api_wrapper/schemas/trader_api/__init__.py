@@ -2,3 +2,4 @@ from .accounts_schemas import *
 from .errors_schema import *
 from .orders_schemas import *
 from .transactions_schemas import *
+from .user_preference_schemas import *
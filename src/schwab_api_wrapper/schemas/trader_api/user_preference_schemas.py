@@ -0,0 +1,35 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+
+class UserPreferenceAccount(BaseModel):
+    accountNumber: str
+    primaryAccount: bool = False
+    type: Optional[str] = None
+    nickName: Optional[str] = None
+    accountColor: Optional[str] = None
+    displayAcctId: Optional[str] = None
+    autoPositionEffect: bool = False
+
+
+class StreamerInfo(BaseModel):
+    """
+    Connection details of the streamer WebSocket
+    """
+
+    streamerSocketUrl: str  # WebSocket url of the streamer
+    schwabClientCustomerId: str  # sent with every streamer request
+    schwabClientCorrelId: str  # sent with every streamer request
+    schwabClientChannel: str  # sent with the LOGIN request
+    schwabClientFunctionId: str  # sent with the LOGIN request
+
+
+class Offer(BaseModel):
+    level2Permissions: bool = False
+    mktDataPermission: Optional[str] = None
+
+
+class UserPreference(BaseModel):
+    accounts: List[UserPreferenceAccount] = []
+    streamerInfo: List[StreamerInfo] = []
+    offers: List[Offer] = []
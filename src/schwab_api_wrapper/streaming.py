@@ -0,0 +1,406 @@
+import json
+import logging
+import threading
+from itertools import count
+from typing import Callable, Iterable, Optional
+
+from websockets.exceptions import ConnectionClosed, WebSocketException
+from websockets.sync.client import ClientConnection, connect
+
+from .base_client import BaseClient
+
+from schwab_api_wrapper.schemas.streaming import (
+    SERVICE_MODELS,
+    Command,
+    Service,
+    StreamData,
+    StreamNotify,
+    StreamResponse,
+    StreamerCode,
+    service_fields,
+)
+from schwab_api_wrapper.schemas.trader_api import StreamerInfo
+
+
+StreamCallback = Callable[[StreamData], None]
+RawStreamCallback = Callable[[dict], None]
+
+
+class StreamLoginError(Exception):
+    def __init__(self, title, response: Optional[StreamResponse] = None):
+        super().__init__(title)
+        self.title = title
+        self.response = response
+
+
+class StreamClient:
+    """
+    Client of the Schwab streamer WebSocket
+
+    The streamer url and client ids come from `user_preference()` and the LOGIN request uses the client's access
+    token (refreshed through `BaseClient.headers` when needed). Subscriptions are kept locally so they are replayed
+    after every reconnect; `run_forever` (or the background thread started by `start`) reconnects with exponential
+    backoff until `stop` is called. Streamed content is parsed into the service's model (`LevelOneEquity`,
+    `ChartEquity`, `AccountActivity`) before it is passed to the handlers.
+    """
+
+    def __init__(
+        self,
+        client: BaseClient,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+        login_timeout: float = 10.0,
+    ):
+        """
+        Parameters:
+            client: client used to get the streamer info and the access token
+            reconnect_delay: seconds to wait before the first reconnect attempt, doubled after every failed attempt
+            max_reconnect_delay: maximum number of seconds between reconnect attempts
+            login_timeout: seconds to wait for the connection to open and the LOGIN response
+        """
+        self.client = client
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.login_timeout = login_timeout
+
+        self.streamer_info: Optional[StreamerInfo] = None
+        self.subscriptions: dict[Service, tuple[dict[str, None], list[str]]] = {}
+        self.handlers: dict[Optional[Service], list[StreamCallback]] = {}
+        self.raw_handlers: dict[Optional[Service], list[RawStreamCallback]] = {}
+        self.connection_listeners: list[Callable[[], None]] = []
+
+        self.connected = threading.Event()
+        self.last_heartbeat: Optional[int] = None  # milliseconds since Epoch
+
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._request_ids = count()
+        self._websocket: Optional[ClientConnection] = None
+        self._thread: Optional[threading.Thread] = None
+        self._logged_in = False
+
+    def add_handler(
+        self, callback: StreamCallback, service: Optional[Service] = None
+    ) -> None:
+        """
+        Register `callback(data)` for the streamed data of `service`, or of every service if None
+        """
+        self.handlers.setdefault(service, []).append(callback)
+
+    def add_raw_handler(
+        self, callback: RawStreamCallback, service: Optional[Service] = None
+    ) -> None:
+        """
+        Register `callback(data)` for the streamed data of `service`, or of every service if None
+
+        Raw handlers get the decoded JSON dictionary of each data entry. Content is only parsed into models when a
+        typed handler is registered for the service, so high-rate consumers can skip the per-message models.
+        """
+        self.raw_handlers.setdefault(service, []).append(callback)
+
+    def add_connection_listener(self, callback: Callable[[], None]) -> None:
+        """
+        Register `callback()`, called after every successful login once the subscriptions are replayed
+        """
+        self.connection_listeners.append(callback)
+
+    def _request(self, service: Service, command: Command, parameters: dict) -> dict:
+        return {
+            "service": service.value,
+            "requestid": str(next(self._request_ids)),
+            "command": command.value,
+            "SchwabClientCustomerId": self.streamer_info.schwabClientCustomerId,
+            "SchwabClientCorrelId": self.streamer_info.schwabClientCorrelId,
+            "parameters": parameters,
+        }
+
+    def _send(self, requests: list[dict]) -> None:
+        if requests and self._websocket is not None:
+            logging.getLogger(__name__).debug(
+                f"Streamer | SEND {', '.join(request['service'] + ' ' + request['command'] for request in requests)}"
+            )
+            self._websocket.send(json.dumps({"requests": requests}))
+
+    def _subscription_request(self, service: Service, command: Command) -> dict:
+        keys, fields = self.subscriptions[service]
+        return self._request(
+            service, command, {"keys": ",".join(keys), "fields": ",".join(fields)}
+        )
+
+    def subscribe(
+        self,
+        service: Service,
+        keys: Iterable[str],
+        fields: Optional[Iterable[str | int]] = None,
+    ) -> None:
+        """
+        Add `keys` to the subscription of `service`
+
+        Parameters:
+            service: streamer service, e.g. LEVELONE_EQUITIES
+            keys: symbols (or the subscription key for ACCT_ACTIVITY)
+            fields: numeric field ids, every field of the service's model by default
+        """
+        with self._lock:
+            existing = self.subscriptions.get(service)
+
+            if fields is not None:
+                fields = [str(field) for field in fields]
+            elif existing is not None:
+                fields = existing[1]
+            elif service in SERVICE_MODELS:
+                fields = service_fields(service)
+            else:
+                fields = []
+
+            subscribed = dict(existing[0]) if existing is not None else {}
+            subscribed.update(dict.fromkeys(keys))
+            self.subscriptions[service] = (subscribed, fields)
+
+            if self.connected.is_set():
+                # SUBS replaces the whole subscription of a service, ADD only adds to it
+                command = Command.ADD if existing and existing[0] else Command.SUBS
+                self._send([self._subscription_request(service, command)])
+
+    def unsubscribe(self, service: Service, keys: Optional[Iterable[str]] = None):
+        """
+        Remove `keys` from the subscription of `service`, or the whole subscription if None
+        """
+        with self._lock:
+            existing = self.subscriptions.get(service)
+            if existing is None:
+                return
+
+            if keys is None:
+                keys = list(existing[0])
+
+            keys = [key for key in keys if key in existing[0]]
+            remaining = {key: None for key in existing[0] if key not in keys}
+            if remaining:
+                self.subscriptions[service] = (remaining, existing[1])
+            else:
+                del self.subscriptions[service]
+
+            if self.connected.is_set() and keys:
+                self._send(
+                    [self._request(service, Command.UNSUBS, {"keys": ",".join(keys)})]
+                )
+
+    def _login(self, websocket: ClientConnection) -> None:
+        authorization = self.client.headers["Authorization"].split(" ", 1)[1]
+
+        login = self._request(
+            Service.ADMIN,
+            Command.LOGIN,
+            {
+                "Authorization": authorization,
+                "SchwabClientChannel": self.streamer_info.schwabClientChannel,
+                "SchwabClientFunctionId": self.streamer_info.schwabClientFunctionId,
+            },
+        )
+        websocket.send(json.dumps({"requests": [login]}))
+
+        while True:
+            message = json.loads(websocket.recv(timeout=self.login_timeout))
+            for response in message.get("response", []):
+                response = StreamResponse(**response)
+                if response.command != Command.LOGIN.value:
+                    continue
+                if response.content.code != StreamerCode.SUCCESS.value:
+                    raise StreamLoginError(
+                        f"Streamer login failed: {response.content.msg}", response
+                    )
+                return
+            self._dispatch(message)
+
+    def _connect(self) -> None:
+        if self.streamer_info is None:
+            preference, error = self.client.user_preference()
+            if error is not None or not preference.streamerInfo:
+                raise StreamLoginError("Unable to get the streamer info")
+            self.streamer_info = preference.streamerInfo[0]
+
+        with connect(
+            self.streamer_info.streamerSocketUrl, open_timeout=self.login_timeout
+        ) as websocket:
+            try:
+                self._login(websocket)
+            except StreamLoginError:
+                self.streamer_info = None  # fetched again before the next attempt
+                raise
+
+            logging.getLogger(__name__).info(
+                f"Streamer | Logged in to `{self.streamer_info.streamerSocketUrl}`"
+            )
+            self._logged_in = True
+
+            with self._lock:
+                self._websocket = websocket
+                self._send(
+                    [
+                        self._subscription_request(service, Command.SUBS)
+                        for service in self.subscriptions
+                    ]
+                )
+                self.connected.set()
+
+            for callback in self.connection_listeners:
+                callback()
+
+            try:
+                for message in websocket:
+                    self._receive(message)
+            finally:
+                with self._lock:
+                    self.connected.clear()
+                    self._websocket = None
+
+    def _receive(self, frame: str) -> None:
+        try:
+            message = json.loads(frame)
+        except ValueError as e:
+            self._skip("frame", frame, e)
+            return
+        if not isinstance(message, dict):
+            self._skip("frame", frame, TypeError("not a JSON object"))
+            return
+
+        self._dispatch(message)
+
+    def _skip(self, kind: str, item, error: Exception) -> None:
+        logging.getLogger(__name__).warning(
+            f"Streamer | Malformed {kind} skipped: {error!r} | {str(item)[:200]}"
+        )
+
+    def _dispatch(self, message: dict) -> None:
+        """
+        Log the command responses, track the heartbeat and pass the data to the handlers; malformed items are logged
+        and skipped without dropping the connection
+        """
+        for response in message.get("response", []):
+            try:
+                response = StreamResponse(**response)
+            except (TypeError, ValueError) as e:
+                self._skip("response", response, e)
+                continue
+            log = logging.getLogger(__name__).debug
+            if response.content.code not in (
+                StreamerCode.SUCCESS.value,
+                StreamerCode.SUCCEEDED_COMMAND_SUBS.value,
+                StreamerCode.SUCCEEDED_COMMAND_UNSUBS.value,
+                StreamerCode.SUCCEEDED_COMMAND_ADD.value,
+                StreamerCode.SUCCEEDED_COMMAND_VIEW.value,
+            ):
+                log = logging.getLogger(__name__).warning
+            log(
+                f"Streamer | {response.service} {response.command} | Code: {response.content.code} {response.content.msg}"
+            )
+
+        for notify in message.get("notify", []):
+            try:
+                notify = StreamNotify(**notify)
+                if notify.heartbeat is not None:
+                    self.last_heartbeat = int(notify.heartbeat)
+            except (TypeError, ValueError) as e:
+                self._skip("notify", notify, e)
+
+        for data in message.get("data", []):
+            try:
+                service = Service(data["service"])
+            except ValueError:
+                continue
+            except (KeyError, TypeError) as e:
+                self._skip("data", data, e)
+                continue
+
+            for callback in self.raw_handlers.get(None, []) + self.raw_handlers.get(
+                service, []
+            ):
+                self._call(callback, data, service)
+
+            callbacks = self.handlers.get(None, []) + self.handlers.get(service, [])
+            if not callbacks:
+                continue
+
+            try:
+                data = StreamData(**data)
+                model = SERVICE_MODELS.get(service)
+                if model is not None:
+                    data.content = [model(**item) for item in data.content]
+            except (TypeError, ValueError) as e:
+                self._skip("data", data, e)
+                continue
+
+            for callback in callbacks:
+                self._call(callback, data, service)
+
+    def _call(self, callback: Callable, data, service: Service) -> None:
+        try:
+            callback(data)
+        except Exception:
+            logging.getLogger(__name__).exception(
+                f"Streamer | {service.value} handler failed"
+            )
+
+    def run_forever(self) -> None:
+        """
+        Connect, log in and dispatch streamed messages, reconnecting until `stop` is called
+        """
+        delay = self.reconnect_delay
+
+        while not self._stop.is_set():
+            try:
+                self._connect()
+            except (ConnectionClosed, WebSocketException, OSError, TimeoutError) as e:
+                logging.getLogger(__name__).warning(
+                    f"Streamer | Connection lost: {e!r}"
+                )
+            except StreamLoginError as e:
+                logging.getLogger(__name__).error(f"Streamer | {e.title}")
+            except Exception:
+                # e.g. a token refresh or user preference failure, retried like a lost connection
+                logging.getLogger(__name__).exception("Streamer | Connection failed")
+
+            if self._stop.is_set():
+                break
+
+            if self._logged_in:
+                delay = self.reconnect_delay
+                self._logged_in = False
+
+            logging.getLogger(__name__).info(
+                f"Streamer | Reconnecting in {delay} seconds"
+            )
+            self._stop.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def start(self) -> None:
+        """
+        Run `run_forever` on a daemon thread
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run_forever, name="schwab-streamer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Log out, close the connection and wait for the background thread to finish
+        """
+        self._stop.set()
+
+        with self._lock:
+            websocket = self._websocket
+            if websocket is not None:
+                try:
+                    self._send([self._request(Service.ADMIN, Command.LOGOUT, {})])
+                except ConnectionClosed:
+                    pass
+
+        if websocket is not None:
+            websocket.close()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,78 @@
+import contextlib
+import contextvars
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, title, url: str):
+        super().__init__(title)
+        self.title = title
+        self.url = url
+
+
+class Timeouts:
+    """
+    Connect and read timeouts of the requests, in seconds, per endpoint (client method name)
+
+    The read timeout bounds each wait for data from the socket, not the whole response.
+    """
+
+    def __init__(
+        self,
+        connect: float = 5.0,
+        read: float = 30.0,
+        endpoints: Optional[dict[str, tuple[float, float]]] = None,
+    ):
+        """
+        Parameters:
+            connect: seconds to establish the connection
+            read: seconds to wait for data once connected
+            endpoints: endpoint -> (connect, read), overriding the defaults
+        """
+        self.connect = connect
+        self.read = read
+        self.endpoints = dict(endpoints or {})
+
+    def timeout(
+        self, endpoint: str, remaining: Optional[float] = None
+    ) -> tuple[float, float]:
+        """
+        (connect, read) timeouts of a request to `endpoint`, capped at the `remaining` seconds of its deadline
+        """
+        connect, read = self.endpoints.get(endpoint, (self.connect, self.read))
+        if remaining is not None:
+            connect, read = min(connect, remaining), min(read, remaining)
+        return connect, read
+
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "schwab_api_deadline", default=None
+)
+
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left before the current deadline, None if no deadline is set
+    """
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+@contextlib.contextmanager
+def deadline(seconds: float):
+    """
+    Give the client calls made in the block, with their retries and token refreshes, `seconds` in total. Requests are
+    sent with timeouts capped at the time left, retries that would end past the deadline are not made, and a request
+    raises `DeadlineExceeded` once the deadline has passed. Nested deadlines cannot extend an outer one.
+
+        with deadline(2.0):
+            quotes, error = client.quotes(["AAPL"], retry=True)
+    """
+    at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(at if outer is None else min(at, outer))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
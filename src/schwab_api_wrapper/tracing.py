@@ -0,0 +1,173 @@
+import contextvars
+import functools
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+
+class Span:
+    """
+    Span of a phase of the request pipeline, used as a context manager. The base class does nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, description: str) -> None:
+        pass
+
+
+class Tracer:
+    """
+    Source of the client's spans. The base class is the no-op tracer: every span is the same shared `Span`
+    and nothing is recorded, so tracing costs a method call per phase when it is not used.
+    """
+
+    def start_span(self, name: str, attributes: Optional[dict] = None) -> Span:
+        return NOOP_SPAN
+
+
+NOOP_SPAN = Span()
+NOOP_TRACER = Tracer()
+
+
+@dataclass
+class RecordedSpan:
+    name: str
+    trace_id: int
+    span_id: int
+    parent_id: Optional[int]
+    start_time: float  # seconds, time.perf_counter
+    end_time: Optional[float] = None
+    attributes: dict = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end_time is None else self.end_time - self.start_time
+
+
+class _RecordingSpan(Span):
+    def __init__(self, tracer: "RecordingTracer", span: RecordedSpan):
+        self.tracer = tracer
+        self.span = span
+        self.token = None
+
+    def __enter__(self):
+        self.token = self.tracer.current.set(self.span)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.span.end_time = time.perf_counter()
+        if exc is not None:
+            self.set_error(repr(exc))
+        self.tracer.current.reset(self.token)
+        with self.tracer.lock:
+            self.tracer.spans.append(self.span)
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.span.attributes[key] = value
+
+    def set_error(self, description: str) -> None:
+        self.span.error = description
+
+
+class RecordingTracer(Tracer):
+    """
+    In-memory tracer keeping every finished span, parented through the current context
+    """
+
+    def __init__(self):
+        self.spans: list[RecordedSpan] = []  # finished spans, in the order they ended
+        self.current: contextvars.ContextVar[Optional[RecordedSpan]] = (
+            contextvars.ContextVar(f"span-{id(self)}", default=None)
+        )
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def start_span(self, name: str, attributes: Optional[dict] = None) -> Span:
+        parent = self.current.get()
+        span_id = next(self._ids)
+        return _RecordingSpan(
+            self,
+            RecordedSpan(
+                name,
+                parent.trace_id if parent is not None else span_id,
+                span_id,
+                parent.span_id if parent is not None else None,
+                time.perf_counter(),
+                attributes=dict(attributes or {}),
+            ),
+        )
+
+    def find(self, name: str) -> list[RecordedSpan]:
+        with self.lock:
+            return [span for span in self.spans if span.name == name]
+
+    def children(self, span: RecordedSpan) -> list[RecordedSpan]:
+        with self.lock:
+            return [child for child in self.spans if child.parent_id == span.span_id]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.spans.clear()
+
+
+class _OpenTelemetrySpan(Span):
+    def __init__(self, tracer, name: str, attributes: Optional[dict]):
+        self.manager = tracer.start_as_current_span(name, attributes=attributes)
+        self.span = None
+
+    def __enter__(self):
+        self.span = self.manager.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return self.manager.__exit__(exc_type, exc, traceback)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.span.set_attribute(key, value)
+
+    def set_error(self, description: str) -> None:
+        from opentelemetry.trace import Status, StatusCode
+
+        self.span.set_status(Status(StatusCode.ERROR, description))
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Tracer emitting the spans through an OpenTelemetry tracer, e.g. `opentelemetry.trace.get_tracer(__name__)`.
+    The `opentelemetry-api` package is only needed when this tracer is used.
+    """
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def start_span(self, name: str, attributes: Optional[dict] = None) -> Span:
+        return _OpenTelemetrySpan(self.tracer, name, attributes)
+
+
+def traced(method):
+    """
+    Run a client API method in a `schwab_api.<method name>` span, marked as failed when the method returns an error
+    """
+    name = f"schwab_api.{method.__name__}"
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.tracer.start_span(name) as span:
+            result, error = method(self, *args, **kwargs)
+            if error is not None:
+                span.set_error(str(getattr(error, "message", None) or error))
+            return result, error
+
+    return wrapper
@@ -0,0 +1,213 @@
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, date, timedelta
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo
+
+from .base_client import BaseClient
+from .market_hours_cache import MarketHoursCache
+from .utils import MarketID
+
+from schwab_api_wrapper.schemas.market_data import MarketHoursResponse, MarketDataError
+
+
+PRE_MARKET = "preMarket"
+REGULAR_MARKET = "regularMarket"
+POST_MARKET = "postMarket"
+
+
+class MarketSessions:
+    """
+    Sorted, non-overlapping session intervals and open dates of a single market
+    """
+
+    def __init__(self):
+        self.starts: list[datetime] = []
+        self.ends: list[datetime] = []
+        self.open_dates: list[date] = []
+
+    @classmethod
+    def build(
+        cls, intervals: Iterable[tuple[datetime, datetime]], open_dates: Iterable[date]
+    ) -> "MarketSessions":
+        sessions = cls()
+
+        for start, end in sorted(intervals):
+            if sessions.ends and start <= sessions.ends[-1]:  # overlapping products
+                sessions.ends[-1] = max(sessions.ends[-1], end)
+            else:
+                sessions.starts.append(start)
+                sessions.ends.append(end)
+
+        sessions.open_dates = sorted(set(open_dates))
+
+        return sessions
+
+    def session_at(self, moment: datetime) -> Optional[int]:
+        index = bisect_right(self.starts, moment) - 1
+        if index >= 0 and moment < self.ends[index]:
+            return index
+        return None
+
+
+class TradingCalendar:
+    """
+    Local trading calendar built from `market_hours`
+
+    All markets are loaded for the whole range the API allows (today to today + 1 year) in one concurrent
+    `market_hours_range` call (only dates missing from the cache are fetched), and session
+    intervals are kept in sorted lists, so is-open/next-open/next-close/trading-days-between are answered with a
+    binary search instead of a network round-trip. The calendar reloads itself lazily on the first query of a new day.
+    """
+
+    def __init__(
+        self,
+        client: BaseClient,
+        markets: Optional[list[MarketID]] = None,
+        sessions: Iterable[str] = (REGULAR_MARKET,),
+        days: int = 365,
+        retry_after: float = 60.0,
+        cache: Optional[MarketHoursCache] = None,
+    ):
+        """
+        Parameters:
+            client: client used to load market hours
+            markets: markets to load, all markets by default
+            sessions: session types counted as open (preMarket, regularMarket, postMarket)
+            days: number of days after today to load, at most 365
+            retry_after: seconds to wait before trying to reload after a failed load
+            cache: market hours cache shared across loads and, if it has a file, process restarts
+        """
+        self.client = client
+        self.markets = markets if markets is not None else list(MarketID)
+        self.sessions = tuple(sessions)
+        self.days = min(days, 365)
+        self.retry_after = retry_after
+        self.cache = cache if cache is not None else MarketHoursCache()
+
+        self.loaded_on: Optional[date] = None
+        self.market_sessions: dict[MarketID, MarketSessions] = {}
+
+        self._lock = threading.Lock()
+        self._next_attempt = 0.0
+
+    def fetch_hours(
+        self, start: date, end: date
+    ) -> tuple[Optional[dict[date, MarketHoursResponse]], Optional[MarketDataError]]:
+        """
+        Fetch market hours for every date in [start, end]
+        """
+        return self.client.market_hours_range(
+            self.markets, start, end, cache=self.cache
+        )
+
+    def load(self) -> Optional[MarketDataError]:
+        """
+        (Re)load the calendar for today through today + `days`
+        """
+        today = datetime.now(ZoneInfo("America/New_York")).date()
+
+        self.cache.prune(today)
+
+        hours, error = self.fetch_hours(today, today + timedelta(days=self.days))
+
+        if error is not None:
+            logging.getLogger(__name__).warning(
+                "Unable to load market hours for the trading calendar"
+            )
+            self._next_attempt = time.monotonic() + self.retry_after
+            return error
+
+        intervals = {market_id: [] for market_id in self.markets}
+        open_dates = {market_id: [] for market_id in self.markets}
+
+        for response in hours.values():
+            for market_id in self.markets:
+                for product_hours in response.root.get(market_id.value, {}).values():
+                    if not product_hours.isOpen:
+                        continue
+                    open_dates[market_id].append(product_hours.date)
+                    for session in self.sessions:
+                        intervals[market_id].extend(
+                            (interval.start, interval.end)
+                            for interval in (product_hours.sessionHours or {}).get(
+                                session, []
+                            )
+                        )
+
+        market_sessions = {
+            market_id: MarketSessions.build(intervals[market_id], open_dates[market_id])
+            for market_id in self.markets
+        }
+
+        self.market_sessions = market_sessions
+        self.loaded_on = today
+
+        return None
+
+    def _sessions(self, market_id: MarketID) -> MarketSessions:
+        today = datetime.now(ZoneInfo("America/New_York")).date()
+        if self.loaded_on != today and time.monotonic() >= self._next_attempt:
+            with self._lock:
+                if self.loaded_on != today and time.monotonic() >= self._next_attempt:
+                    self.load()
+
+        return self.market_sessions.get(market_id, MarketSessions())
+
+    def is_open(
+        self, market_id: MarketID = MarketID.EQUITY, at: Optional[datetime] = None
+    ) -> bool:
+        if at is None:
+            at = datetime.now(ZoneInfo("America/New_York"))
+
+        return self._sessions(market_id).session_at(at) is not None
+
+    def next_open(
+        self, market_id: MarketID = MarketID.EQUITY, after: Optional[datetime] = None
+    ) -> Optional[datetime]:
+        """
+        Start of the first session beginning after `after` (now by default), None if beyond the loaded range
+        """
+        if after is None:
+            after = datetime.now(ZoneInfo("America/New_York"))
+
+        sessions = self._sessions(market_id)
+        index = bisect_right(sessions.starts, after)
+
+        return sessions.starts[index] if index < len(sessions.starts) else None
+
+    def next_close(
+        self, market_id: MarketID = MarketID.EQUITY, after: Optional[datetime] = None
+    ) -> Optional[datetime]:
+        """
+        End of the current session, or of the next one if the market is closed at `after` (now by default)
+        """
+        if after is None:
+            after = datetime.now(ZoneInfo("America/New_York"))
+
+        sessions = self._sessions(market_id)
+        index = bisect_right(sessions.ends, after)
+
+        return sessions.ends[index] if index < len(sessions.ends) else None
+
+    def trading_days_between(
+        self, start: date, end: date, market_id: MarketID = MarketID.EQUITY
+    ) -> int:
+        """
+        Number of open days in [start, end)
+        """
+        open_dates = self._sessions(market_id).open_dates
+
+        return max(bisect_left(open_dates, end) - bisect_left(open_dates, start), 0)
+
+    def trading_days(
+        self, start: date, end: date, market_id: MarketID = MarketID.EQUITY
+    ) -> list[date]:
+        """
+        Open days in [start, end)
+        """
+        open_dates = self._sessions(market_id).open_dates
+
+        return open_dates[bisect_left(open_dates, start) : bisect_left(open_dates, end)]
@@ -0,0 +1,105 @@
+from typing import Optional
+
+import requests
+from requests import Response
+from requests.auth import HTTPBasicAuth
+from requests.structures import CaseInsensitiveDict
+
+
+class HTTPXSession:
+    """
+    Session sending the client's requests with httpx over HTTP/2, so concurrent requests share one connection per
+    host instead of one connection each. It has the part of the `requests.Session` interface used by `BaseClient`:
+    responses are converted to `requests.Response` and httpx errors to the matching `requests` exceptions.
+
+    Needs the `httpx[http2]` package (the `http2` extra of this package), only imported when the session is created.
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        http1: bool = True,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+    ):
+        """
+        Parameters:
+            http2: negotiate HTTP/2, through TLS ALPN for https urls
+            http1: allow HTTP/1.1, with `http1=False` plain http urls use HTTP/2 with prior knowledge (h2c)
+            max_connections: connections open at the same time
+            max_keepalive_connections: idle connections kept open
+        """
+        import httpx
+
+        self.client = httpx.Client(
+            http2=http2,
+            http1=http1,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        self.client.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        json=None,
+        data=None,
+        auth=None,
+        timeout=None,
+    ) -> Response:
+        import httpx
+
+        if isinstance(auth, HTTPBasicAuth):
+            auth = httpx.BasicAuth(auth.username, auth.password)
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+
+        try:
+            response = self.client.request(
+                method,
+                url,
+                params=params,
+                headers=headers,
+                json=json,
+                data=data,
+                auth=auth,
+                timeout=timeout,
+            )
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e) from e
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(e) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e) from e
+
+        return self.to_response(response)
+
+    @staticmethod
+    def to_response(response) -> Response:
+        """
+        Convert an httpx response to a `requests.Response`
+        """
+        result = Response()
+        result.status_code = response.status_code
+        result.headers = CaseInsensitiveDict(response.headers.items())
+        result.reason = response.reason_phrase
+        result.url = str(response.url)
+        result.encoding = response.encoding
+        result.elapsed = response.elapsed
+        result._content = response.content
+        result.http_version = response.http_version
+        return result
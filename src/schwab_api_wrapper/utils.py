@@ -46,6 +46,7 @@ INSTRUMENTS_URL = f"{MARKET_DATA_ENDPOINT}/instruments"
 ACCOUNT_NUMBERS_URL = f"{TRADER_API_ENDPOINT}/accounts/accountNumbers"
 ACCOUNTS_URL = f"{TRADER_API_ENDPOINT}/accounts"
 ORDERS_URL = f"{TRADER_API_ENDPOINT}/orders"
+USER_PREFERENCE_URL = f"{TRADER_API_ENDPOINT}/userPreference"
 
 
 # Parse redirect URL for desired parameters
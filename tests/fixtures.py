@@ -0,0 +1,104 @@
+"""
+Fixtures shared by the test modules
+"""
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from schwab_api_wrapper.schemas.trader_api import (
+    CashInitialBalance,
+    CashBalance,
+    CashProjectedBalance,
+)
+from schwab_api_wrapper.utils import *
+
+PARAMETERS_FILE_NAME = "fakefile.json"
+
+fake_json = {
+    KEY_CLIENT_ID: "your_client_id",
+    KEY_CLIENT_SECRET: "your_client_secret",
+    KEY_URI_REDIRECT: "your_redirect_uri",
+    KEY_TOKEN_REFRESH: "your_refresh_token",
+    KEY_TOKEN_ACCESS: "your_access_token",
+    KEY_TOKEN_ID: "your_id_token",
+    KEY_ACCESS_TOKEN_VALID_UNTIL: (
+        datetime.now(ZoneInfo("America/New_York")) + timedelta(minutes=30)
+    ).isoformat(),
+    KEY_REFRESH_TOKEN_VALID_UNTIL: (
+        datetime.now(ZoneInfo("America/New_York")) + timedelta(days=7)
+    ).isoformat(),
+}
+
+
+def order_json(order_id: int, status: str, entered_time: datetime) -> dict:
+    return {
+        "session": "NORMAL",
+        "duration": "DAY",
+        "orderType": "LIMIT",
+        "complexOrderStrategyType": "NONE",
+        "quantity": 1,
+        "filledQuantity": 1 if status == "FILLED" else 0,
+        "remainingQuantity": 0 if status == "FILLED" else 1,
+        "requestedDestination": "AUTO",
+        "destinationLinkName": "AutoRoute",
+        "price": 10.0,
+        "orderLegCollection": [
+            {
+                "orderLegType": "EQUITY",
+                "legId": 1,
+                "instrument": {"symbol": "F", "assetType": "EQUITY"},
+                "instruction": "BUY",
+                "quantity": 1,
+            }
+        ],
+        "orderStrategyType": "SINGLE",
+        "orderId": order_id,
+        "status": status,
+        "enteredTime": entered_time.isoformat(),
+        "accountNumber": 12345678,
+    }
+
+
+def position_json(symbol: str, quantity: float, market_value: float) -> dict:
+    return {
+        "shortQuantity": 0,
+        "averagePrice": 10.0,
+        "currentDayProfitLoss": market_value - 10.0 * quantity,
+        "currentDayProfitLossPercentage": 0,
+        "longQuantity": quantity,
+        "settledLongQuantity": quantity,
+        "settledShortQuantity": 0,
+        "instrument": {"assetType": "EQUITY", "symbol": symbol},
+        "marketValue": market_value,
+        "maintenanceRequirement": 0,
+        "currentDayCost": 0,
+    }
+
+
+def account_json(account_number: str, positions: list[dict]) -> dict:
+    return {
+        "securitiesAccount": {
+            "type": "CASH",
+            "accountNumber": account_number,
+            "roundTrips": 0,
+            "positions": positions,
+            "initialBalances": {name: 0 for name in CashInitialBalance.model_fields},
+            "currentBalances": {name: 0 for name in CashBalance.model_fields},
+            "projectedBalances": {
+                name: 0 for name in CashProjectedBalance.model_fields
+            },
+        }
+    }
+
+
+def data_json(service: str, content: list[dict]) -> dict:
+    return {
+        "data": [
+            {
+                "service": service,
+                "timestamp": 1700000000000,
+                "command": "SUBS",
+                "content": content,
+            }
+        ]
+    }
@@ -0,0 +1,218 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import json
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.streaming import StreamClient
+from schwab_api_wrapper.order_store import OrderDeltaType
+from schwab_api_wrapper.account_activity import (
+    AccountActivityStream,
+    find_order_id,
+    new_activities,
+)
+from schwab_api_wrapper.schemas.streaming import Service
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME, order_json, data_json
+
+ORDERS_URL_ABCDE = f"{TRADER_API_ENDPOINT}/accounts/abcde/orders"
+
+
+def activity_json(message_type: str, order_id: int) -> dict:
+    return {
+        "key": "Account Activity",
+        "seq": 1,
+        "1": "12345",
+        "2": message_type,
+        "3": json.dumps(
+            {"SchwabOrderID": str(order_id), "AccountNumber": "12345", "BaseEvent": {}}
+        ),
+    }
+
+
+def filled_order_json(order_id: int, entered_time: datetime) -> dict:
+    order = order_json(order_id, "FILLED", entered_time)
+    order["orderActivityCollection"] = [
+        {
+            "activityType": "EXECUTION",
+            "executionType": "FILL",
+            "quantity": 1,
+            "orderRemainingQuantity": 0,
+            "executionLegs": [
+                {
+                    "legId": 1,
+                    "price": 10.0,
+                    "quantity": 1,
+                    "mismarkedQuantity": 0,
+                    "instrumentId": 1,
+                    "time": entered_time.isoformat(),
+                }
+            ],
+        }
+    ]
+    return order
+
+
+class TestAccountActivityStream(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.stream = StreamClient(self.api)
+        self.activity = AccountActivityStream(self.api, self.stream, accounts=["12345"])
+        self.activity.start()
+
+        self.events = []
+        self.deltas = []
+        self.activity.add_event_listener(self.events.append)
+        self.activity.add_listener(self.deltas.extend)
+
+        self.now = datetime.now(ZoneInfo("America/New_York"))
+
+    def drain(self):
+        self.activity._executor.submit(lambda: None).result(timeout=5)
+
+    def test_subscription(self):
+        keys, fields = self.stream.subscriptions[Service.ACCT_ACTIVITY]
+        self.assertEqual(list(keys), ["Account Activity"])
+        self.assertEqual(fields, ["0", "1", "2", "3"])
+
+    def test_find_order_id(self):
+        self.assertEqual(find_order_id({"SchwabOrderID": "42"}), 42)
+        self.assertEqual(find_order_id({"BaseEvent": {"Order": {"orderId": 7}}}), 7)
+        self.assertEqual(find_order_id([{"x": 1}, {"OrderId": "8"}]), 8)
+        self.assertIsNone(find_order_id({"SchwabOrderID": "n/a"}))
+
+    @responses.activate
+    def test_fill_event_fetches_order(self):
+        responses.add(
+            responses.GET,
+            ACCOUNT_NUMBERS_URL,
+            json=[{"accountNumber": "12345", "hashValue": "abcde"}],
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            f"{ORDERS_URL_ABCDE}/1001",
+            json=order_json(1001, "WORKING", self.now),
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            f"{ORDERS_URL_ABCDE}/1001",
+            json=filled_order_json(1001, self.now),
+            status=200,
+        )
+
+        self.stream._dispatch(
+            data_json("ACCT_ACTIVITY", [activity_json("OrderAccepted", 1001)])
+        )
+        self.stream._dispatch(
+            data_json(
+                "ACCT_ACTIVITY",
+                [
+                    {"key": "Account Activity", "seq": 0, "2": "SUBSCRIBED", "3": ""},
+                    activity_json("OrderFillCompleted", 1001),
+                ],
+            )
+        )
+        self.drain()
+
+        self.assertEqual(
+            [event.message_type for event in self.events],
+            ["OrderAccepted", "OrderFillCompleted"],
+        )
+        self.assertEqual(self.events[0].order_id, 1001)
+        self.assertEqual(self.events[0].account_number, "12345")
+
+        self.assertEqual(
+            [delta.type for delta in self.deltas],
+            [OrderDeltaType.NEW, OrderDeltaType.TERMINAL],
+        )
+        executions = new_activities(self.deltas[1])
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(executions[0].executionLegs[0].price, 10.0)
+
+    @responses.activate
+    def test_reconcile_after_reconnect(self):
+        responses.add(
+            responses.GET,
+            ACCOUNT_NUMBERS_URL,
+            json=[{"accountNumber": "12345", "hashValue": "abcde"}],
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            ORDERS_URL_ABCDE,
+            json=[order_json(1, "WORKING", self.now - timedelta(days=2))],
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            ORDERS_URL_ABCDE,
+            json=[
+                filled_order_json(1, self.now - timedelta(days=2)),
+                order_json(2, "WORKING", self.now),
+            ],
+            status=200,
+        )
+
+        self.activity._on_login()
+        self.drain()
+        self.assertEqual(len(self.deltas), 1)
+
+        self.activity._on_login()  # reconnect
+        self.drain()
+
+        self.assertEqual(
+            [(delta.order.orderId, delta.type) for delta in self.deltas[1:]],
+            [(1, OrderDeltaType.TERMINAL), (2, OrderDeltaType.NEW)],
+        )
+        # the window covers the order still open before the reconnect
+        from_entered_time = datetime.fromisoformat(
+            responses.calls[-1].request.params["fromEnteredTime"]
+        )
+        self.assertLess(from_entered_time, self.now - timedelta(days=2))
+
+    def test_start_and_stop_are_idempotent(self):
+        self.activity.start()
+        self.assertEqual(len(self.stream.handlers[Service.ACCT_ACTIVITY]), 1)
+        self.assertEqual(len(self.stream.connection_listeners), 1)
+
+        self.activity.stop()
+        self.activity.stop()
+        self.assertNotIn(Service.ACCT_ACTIVITY, self.stream.subscriptions)
+
+        with responses.RequestsMock() as mock:
+            self.activity._on_login()  # nothing submitted once stopped
+            self.stream._dispatch(
+                data_json("ACCT_ACTIVITY", [activity_json("OrderAccepted", 1001)])
+            )
+            self.assertEqual(len(mock.calls), 0)
+        self.assertEqual(self.events, [])
+
+        self.activity.start()
+        self.assertEqual(len(self.stream.handlers[Service.ACCT_ACTIVITY]), 1)
+        self.assertIn(Service.ACCT_ACTIVITY, self.stream.subscriptions)
+        self.activity.stop()
+
+    def test_task_failures_are_logged(self):
+        with (
+            patch.object(
+                self.api, "get_single_order", side_effect=RuntimeError("boom")
+            ),
+            self.assertLogs("schwab_api_wrapper.account_activity", "ERROR") as logs,
+        ):
+            self.stream._dispatch(
+                data_json("ACCT_ACTIVITY", [activity_json("OrderAccepted", 1001)])
+            )
+            self.drain()
+
+        self.assertIn("_fetch failed", logs.output[0])
+        self.assertIn("boom", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
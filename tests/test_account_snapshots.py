@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import json
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.account_snapshots import (
+    AccountSnapshotCache,
+    PositionDeltaType,
+)
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME, account_json, position_json
+
+
+class TestAccountSnapshotCache(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.encrypted_account_number = "encrypted_account_number"
+        self.account_url = f"{ACCOUNTS_URL}/{self.encrypted_account_number}"
+        self.cache = AccountSnapshotCache(self.api, max_age=60)
+
+    @responses.activate
+    def test_get_is_served_from_cache(self):
+        responses.add(
+            responses.GET,
+            self.account_url,
+            json=account_json("12345", [position_json("F", 10, 120.0)]),
+            status=200,
+        )
+
+        first, error = self.cache.get(self.encrypted_account_number)
+        second, _ = self.cache.get(self.encrypted_account_number)
+
+        self.assertIsNone(error)
+        self.assertIs(first, second)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_refresh_emits_position_deltas(self):
+        responses.add(
+            responses.GET,
+            self.account_url,
+            json=account_json(
+                "12345",
+                [position_json("F", 10, 120.0), position_json("AAPL", 1, 200.0)],
+            ),
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            self.account_url,
+            json=account_json(
+                "12345",
+                [position_json("F", 15, 180.0), position_json("AAPL", 1, 200.0)]
+                + [position_json("T", 5, 90.0)],
+            ),
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            self.account_url,
+            json=account_json("12345", [position_json("T", 5, 90.0)]),
+            status=200,
+        )
+
+        received = []
+        self.cache.add_listener(received.append)
+
+        self.cache.get(self.encrypted_account_number)
+        self.assertEqual(len(received[0]), 2)
+        self.assertTrue(
+            all(delta.type == PositionDeltaType.OPENED for delta in received[0])
+        )
+
+        self.cache.get(self.encrypted_account_number, max_age=0)
+        by_symbol = {delta.symbol: delta for delta in received[1]}
+        self.assertEqual(set(by_symbol), {"F", "T"})
+        self.assertEqual(by_symbol["F"].type, PositionDeltaType.CHANGED)
+        self.assertEqual(by_symbol["F"].quantity_change, 5)
+        self.assertEqual(by_symbol["F"].market_value_change, 60.0)
+        self.assertEqual(by_symbol["T"].type, PositionDeltaType.OPENED)
+
+        self.cache.invalidate()
+        self.cache.get(self.encrypted_account_number)
+        by_symbol = {delta.symbol: delta for delta in received[2]}
+        self.assertEqual(set(by_symbol), {"F", "AAPL"})
+        self.assertEqual(by_symbol["AAPL"].type, PositionDeltaType.CLOSED)
+        self.assertEqual(by_symbol["AAPL"].market_value_change, -200.0)
+
+    @responses.activate
+    def test_get_all_maps_accounts_to_hashes(self):
+        responses.add(
+            responses.GET,
+            ACCOUNT_NUMBERS_URL,
+            json=[{"accountNumber": "12345", "hashValue": "abcde"}],
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            ACCOUNTS_URL,
+            json=[account_json("12345", [position_json("F", 10, 120.0)])],
+            status=200,
+        )
+
+        accounts, error = self.cache.get_all()
+        self.assertIsNone(error)
+        self.assertEqual(list(accounts), ["abcde"])
+
+        account, _ = self.cache.get("abcde")
+        self.assertIs(account, accounts["abcde"])
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_get_error(self):
+        responses.add(
+            responses.GET,
+            self.account_url,
+            json={"message": "Unauthorized"},
+            status=401,
+        )
+
+        account, error = self.cache.get(self.encrypted_account_number)
+        self.assertIsNone(account)
+        self.assertEqual(error.message, "Unauthorized")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+
+from schwab_api_wrapper.candles import CandleBuilder
+from schwab_api_wrapper.utils import Frequency
+from schwab_api_wrapper.schemas.market_data import CandleList
+
+from tests.fixtures import data_json
+
+START = 1699999200000  # 2023-11-14 17:00 EST, a multiple of 30 minutes
+
+
+def bar(minute: int, close: float, volume: int = 10) -> dict:
+    return {
+        "key": "AAPL",
+        "seq": minute,
+        "1": close - 0.5,
+        "2": close + 1,
+        "3": close - 1,
+        "4": close,
+        "5": volume,
+        "6": minute,
+        "7": START + minute * 60_000,
+        "8": 19675,
+    }
+
+
+class TestCandleBuilder(unittest.TestCase):
+    def setUp(self) -> None:
+        self.builder = CandleBuilder(capacity=4)
+        self.completed = []
+        self.builder.add_listener(
+            lambda symbol, frequency, candle: self.completed.append(
+                (symbol, frequency, candle)
+            )
+        )
+
+    def feed(self, minutes: range):
+        for minute in minutes:
+            self.builder.apply(
+                data_json("CHART_EQUITY", [bar(minute, 100 + minute)])["data"][0]
+            )
+
+    def test_bars_are_aggregated(self):
+        self.feed(range(5))
+
+        frequencies = [frequency for _, frequency, _ in self.completed]
+        self.assertEqual(frequencies.count(Frequency.ONE), 5)
+        self.assertEqual(frequencies.count(Frequency.FIVE), 1)
+
+        five = self.builder.candles("AAPL", Frequency.FIVE)[0]
+        self.assertEqual(int(five.epoch.timestamp() * 1000), START)
+        self.assertEqual(five.open, 99.5)
+        self.assertEqual(five.high, 105)
+        self.assertEqual(five.low, 99)
+        self.assertEqual(five.close, 104)
+        self.assertEqual(five.volume, 50)
+
+        fifteen = self.builder.current_candle("AAPL", Frequency.FIFTEEN)
+        self.assertEqual(fifteen.close, 104)
+        self.assertEqual(self.builder.candles("AAPL", Frequency.FIFTEEN), [])
+
+    def test_gap_completes_previous_window(self):
+        self.feed(range(3))
+        self.feed(range(7, 8))
+
+        five = self.builder.candles("AAPL", Frequency.FIVE)
+        self.assertEqual(len(five), 1)
+        self.assertEqual(five[0].close, 102)
+        self.assertEqual(self.builder.current_candle("AAPL", Frequency.FIVE).close, 107)
+
+    def test_ring_buffer_is_bounded(self):
+        self.feed(range(10))
+
+        array = self.builder.array("AAPL", Frequency.ONE)
+        self.assertEqual(array.shape, (4, 6))
+        self.assertEqual(list(array[:, 4]), [106, 107, 108, 109])
+
+    def test_seed_and_duplicates(self):
+        candles = CandleList(
+            candles=[
+                {
+                    "datetime": START + minute * 60_000,
+                    "open": 1,
+                    "high": 2,
+                    "low": 0.5,
+                    "close": 1.5,
+                    "volume": 100,
+                }
+                for minute in range(0, 15, 5)
+            ],
+            empty=False,
+            symbol="AAPL",
+        )
+        self.builder.seed(candles, Frequency.FIVE)
+
+        self.assertEqual(len(self.builder.candles("AAPL", Frequency.FIVE)), 3)
+        self.assertEqual(self.builder.candles("AAPL", Frequency.ONE), [])
+        self.assertEqual(self.builder.candles("AAPL", Frequency.FIFTEEN)[0].volume, 300)
+
+        # streamed minutes already covered by the backfill are ignored
+        self.feed(range(14, 16))
+        self.assertEqual(len(self.builder.candles("AAPL", Frequency.ONE)), 1)
+        self.assertEqual(self.builder.current_candle("AAPL", Frequency.FIVE).close, 115)
+
+
+if __name__ == "__main__":
+    unittest.main()
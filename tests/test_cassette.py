@@ -0,0 +1,126 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.cassette import (
+    Cassette,
+    CassetteError,
+    CassetteMode,
+    canonical_url,
+    scrub,
+)
+from schwab_api_wrapper.schemas.market_data import QuoteResponse
+from schwab_api_wrapper.schemas.trader_api import OrderResponse
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME
+
+token_json = {
+    "expires_in": 1800,
+    "token_type": "Bearer",
+    "scope": "api",
+    "refresh_token": "secret_refresh_token",
+    "access_token": "secret_access_token",
+    "id_token": "secret_id_token",
+}
+
+
+class TestCassette(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.directory = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.directory.name, "session.json.gz")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def record(self) -> None:
+        with responses.RequestsMock() as mock:
+            mock.add(responses.POST, TOKEN_URL, json=token_json, status=200)
+            mock.add(
+                responses.GET,
+                QUOTES_URL,
+                json={"F": {"invalidSymbols": ["F"]}},
+                status=200,
+            )
+            mock.add(responses.GET, ORDERS_URL, json=[], status=200)
+            mock.add(responses.GET, ORDERS_URL, json={"errors": []}, status=400)
+
+            with Cassette(self.filepath, CassetteMode.RECORD) as cassette:
+                self.api.cassette = cassette
+                self.api.refresh_access_token()
+                self.api.quotes(["F"])
+                self.api.get_all_orders(datetime(2024, 1, 2), datetime(2024, 1, 3))
+                self.api.get_all_orders(datetime(2024, 1, 3), datetime(2024, 1, 4))
+
+    def test_record_and_replay_without_network(self):
+        self.record()
+
+        with responses.RequestsMock(assert_all_requests_are_fired=False):
+            self.api.cassette = Cassette(self.filepath)
+
+            token, error = self.api.refresh_access_token()
+            self.assertIsNone(error)
+            self.assertEqual(token.access_token, "[ACCESS_TOKEN]")
+
+            result, error = self.api.quotes(["F"])
+            self.assertIsInstance(result, QuoteResponse)
+
+            # different time windows fall back to the responses of the same path, in order
+            result, error = self.api.get_all_orders(
+                datetime(2025, 1, 2), datetime(2025, 1, 3)
+            )
+            self.assertIsInstance(result, OrderResponse)
+            result, error = self.api.get_all_orders(
+                datetime(2025, 1, 2), datetime(2025, 1, 3)
+            )
+            self.assertIsNotNone(error)
+            result, error = self.api.get_all_orders(
+                datetime(2025, 1, 2), datetime(2025, 1, 3)
+            )
+            self.assertIsNotNone(error)
+
+            with self.assertRaises(CassetteError):
+                self.api.accounts()
+
+    def test_tokens_are_scrubbed(self):
+        self.record()
+
+        cassette = Cassette(self.filepath)
+        contents = json.dumps(
+            [interaction.body for interaction in cassette.interactions]
+        )
+
+        self.assertNotIn("secret", contents)
+        self.assertIn("[REFRESH_TOKEN]", contents)
+        self.assertEqual(len(cassette.interactions), 4)
+        self.assertEqual(
+            scrub('{"access_token": "abc", "x": 1}'),
+            '{"access_token": "[ACCESS_TOKEN]", "x": 1}',
+        )
+
+    def test_simulated_latency(self):
+        self.record()
+        self.api.cassette = Cassette(self.filepath, latency=0.05)
+
+        start = time.perf_counter()
+        self.api.quotes(["F"])
+
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+
+    def test_canonical_url(self):
+        self.assertEqual(
+            canonical_url(f"{QUOTES_URL}?b=2", {"a": "1"}),
+            f"{QUOTES_URL}?a=1&b=2",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
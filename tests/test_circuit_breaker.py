@@ -0,0 +1,176 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import requests
+import json
+from datetime import datetime
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+    CircuitState,
+)
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.transitions = []
+        self.breaker = CircuitBreaker(
+            "market_data", failure_threshold=2, recovery_time=10, clock=lambda: self.now
+        )
+        self.breaker.add_listener(
+            lambda group, previous, state: self.transitions.append(state)
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.failure()
+        self.breaker.success()
+        self.breaker.failure()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+        self.breaker.failure()
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.retry_at, 10)
+
+    def test_half_open_probe_closes(self):
+        self.breaker.failure()
+        self.breaker.failure()
+
+        self.now = 10
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+        self.assertFalse(self.breaker.allow())  # one probe at a time
+
+        self.breaker.success()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+        self.assertEqual(
+            self.transitions,
+            [CircuitState.OPEN, CircuitState.HALF_OPEN, CircuitState.CLOSED],
+        )
+
+    def test_failed_probe_reopens(self):
+        self.breaker.failure()
+        self.breaker.failure()
+
+        self.now = 10
+        self.assertTrue(self.breaker.allow())
+        self.breaker.failure()
+
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        self.assertEqual(self.breaker.retry_at, 20)
+
+    def test_released_probe_is_given_back(self):
+        self.breaker.failure()
+        self.breaker.failure()
+
+        self.now = 10
+        self.assertTrue(self.breaker.allow())
+        self.breaker.release()
+
+        self.assertTrue(self.breaker.allow())
+
+
+class TestClientCircuits(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.assertIsNone(self.api.circuit_breakers)
+        self.now = 0.0
+        self.api.circuit_breakers = CircuitBreakers(
+            failure_threshold=3, recovery_time=30, clock=lambda: self.now
+        )
+
+    @responses.activate
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def test_no_circuit_breaking_by_default(self, mock_file):
+        api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        responses.add(responses.GET, QUOTES_URL, json={"errors": []}, status=500)
+
+        for _ in range(10):
+            result, error = api.quotes(["F"])
+            self.assertIsNone(result)
+            self.assertIsNotNone(error)
+
+        self.assertEqual(len(responses.calls), 10)
+
+    @responses.activate
+    def test_open_circuit_fails_fast(self):
+        responses.add(responses.GET, QUOTES_URL, json={"errors": []}, status=503)
+
+        for _ in range(3):
+            self.api.quotes(["F"])
+
+        with self.assertRaises(CircuitOpenError) as context:
+            self.api.quotes(["F"])
+        self.assertEqual(context.exception.group, "market_data")
+        self.assertEqual(context.exception.retry_at, 30)
+
+        # endpoints of the same group share the circuit, the other groups are unaffected
+        with self.assertRaises(CircuitOpenError):
+            self.api.single_market_hours(MarketID.EQUITY)
+        responses.add(responses.GET, ORDERS_URL, json=[], status=200)
+        result, error = self.api.get_all_orders(
+            datetime(2024, 1, 2), datetime(2024, 1, 3)
+        )
+        self.assertIsNone(error)
+
+        self.assertEqual(len(responses.calls), 4)
+
+    @responses.activate
+    def test_network_errors_open_the_circuit(self):
+        responses.add(responses.GET, QUOTES_URL, body=requests.exceptions.ReadTimeout())
+
+        for _ in range(3):
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                self.api.quotes(["F"])
+
+        with self.assertRaises(CircuitOpenError):
+            self.api.quotes(["F"])
+
+    @responses.activate
+    def test_open_circuit_stops_retries(self):
+        responses.add(responses.GET, QUOTES_URL, json={"errors": []}, status=500)
+        self.api.retry_policy.sleep = lambda seconds: None
+
+        result, error = self.api.quotes(["F"], retry=True)
+
+        self.assertEqual(error.message, "Maximum number of retries reached")
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_recovery(self):
+        responses.add(responses.GET, QUOTES_URL, json={"errors": []}, status=500)
+        for _ in range(3):
+            self.api.quotes(["F"])
+
+        responses.replace(responses.GET, QUOTES_URL, json={}, status=200)
+        self.now = 30
+
+        result, error = self.api.quotes(["F"])
+
+        self.assertIsNone(error)
+        self.assertEqual(
+            self.api.circuit_breakers.states(), {"market_data": CircuitState.CLOSED}
+        )
+
+    @responses.activate
+    def test_client_errors_do_not_open_the_circuit(self):
+        responses.add(responses.GET, QUOTES_URL, json={"errors": []}, status=400)
+
+        for _ in range(5):
+            self.api.quotes(["F"])
+
+        self.assertEqual(
+            self.api.circuit_breakers.states(), {"market_data": CircuitState.CLOSED}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,243 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.client_pool import ClientCreationError, ClientPool
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME
+
+TENANTS = ["desk-a", "desk-b", "desk-c"]
+TOKEN = {
+    "expires_in": 1800,
+    "token_type": "Bearer",
+    "scope": "api",
+    "refresh_token": "new_refresh_token",
+    "access_token": "new_access_token",
+    "id_token": "new_id_token",
+}
+
+
+def file_client() -> FileClient:
+    with patch("builtins.open", mock_open(read_data=json.dumps(fake_json))):
+        client = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+    client.retry_policy.sleep = lambda seconds: None
+    return client
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestClientPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.created = []
+
+        def factory(tenant: str):
+            def build():
+                self.created.append(tenant)
+                return file_client()
+
+            return build
+
+        self.clock = FakeClock()
+        self.pool = ClientPool(
+            {tenant: factory(tenant) for tenant in TENANTS},
+            idle_timeout=60,
+            clock=self.clock,
+        )
+
+    def tearDown(self) -> None:
+        self.pool.close()
+
+    def test_clients_are_created_lazily(self):
+        self.assertEqual(self.created, [])
+
+        client = self.pool["desk-a"]
+
+        self.assertIs(self.pool.client("desk-a"), client)
+        self.assertIsNot(self.pool["desk-b"], client)
+        self.assertEqual(self.created, ["desk-a", "desk-b"])
+        with self.assertRaises(KeyError):
+            self.pool.client("unknown")
+
+    def test_concurrent_first_calls_create_one_client(self):
+        barrier = threading.Barrier(8)
+
+        def client(_):
+            barrier.wait()
+            return self.pool.client("desk-a")
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.created, ["desk-a"])
+
+    @responses.activate
+    def test_calls_are_routed_by_tenant(self):
+        responses.add(responses.GET, QUOTES_URL, json={}, status=200)
+        self.pool.client("desk-b").access_token = "desk_b_token"
+
+        self.pool.call("desk-a", "quotes", ["F"])
+        self.pool.call("desk-b", "quotes", ["F"])
+
+        self.assertEqual(
+            [call.request.headers["Authorization"] for call in responses.calls],
+            [f"Bearer {fake_json['access_token']}", "Bearer desk_b_token"],
+        )
+        self.assertEqual(
+            self.pool["desk-a"].metrics.snapshot()["GET quotes"]["requests"], 1
+        )
+
+    @responses.activate
+    def test_transport_is_shared_across_refreshes(self):
+        responses.add(responses.POST, TOKEN_URL, json=TOKEN, status=200)
+        a, b = self.pool["desk-a"], self.pool["desk-b"]
+
+        with patch.object(FileClient, "dump_parameters"):
+            a.refresh()
+
+        self.assertIsNot(a.session, b.session)
+        self.assertIs(a.session.get_adapter(QUOTES_URL), self.pool.adapter)
+        self.assertIs(b.session.get_adapter(QUOTES_URL), self.pool.adapter)
+
+    def test_transport_is_not_shared_when_disabled(self):
+        pool = ClientPool({"desk-a": file_client}, share_transport=False)
+
+        self.assertIsNone(pool.adapter)
+        self.assertIsNone(pool["desk-a"].adapter)
+
+    def test_tokens_are_refreshed_concurrently(self):
+        lock = threading.Lock()
+        refreshed = []
+        in_flight = 0
+        overlap = 0
+
+        def token_callback(request):
+            nonlocal in_flight, overlap
+            with lock:
+                in_flight += 1
+                overlap = max(overlap, in_flight)
+            time.sleep(0.1)
+            with lock:
+                in_flight -= 1
+                refreshed.append(request)
+            return 200, {}, json.dumps(TOKEN)
+
+        self.pool.client("desk-c")  # token still valid, refreshed only if forced
+        for tenant in ["desk-a", "desk-b"]:
+            self.pool[tenant].access_token_valid_until = datetime.now(
+                ZoneInfo("America/New_York")
+            ) - timedelta(seconds=1)
+
+        with (
+            responses.RequestsMock() as mock,
+            patch.object(FileClient, "dump_parameters"),
+        ):
+            mock.add_callback(responses.POST, TOKEN_URL, callback=token_callback)
+            errors = self.pool.refresh()
+            self.assertEqual(len(refreshed), 2)
+
+            errors = self.pool.refresh(force=True)
+            self.assertEqual(len(refreshed), 5)
+
+        self.assertEqual(errors, {tenant: None for tenant in TENANTS})
+        self.assertGreater(overlap, 1)
+
+    @responses.activate
+    def test_refresh_errors_are_returned(self):
+        responses.add(
+            responses.POST,
+            TOKEN_URL,
+            json={"error": "invalid_client", "error_description": "Unauthorized"},
+            status=401,
+        )
+
+        errors = self.pool.refresh(["desk-a"], force=True)
+
+        self.assertEqual(list(errors), ["desk-a"])
+        self.assertIsInstance(errors["desk-a"], Exception)
+
+    def test_idle_clients_are_evicted(self):
+        a = self.pool["desk-a"]
+        self.clock.now = 40
+        self.pool["desk-b"]
+
+        self.clock.now = 70
+        with patch.object(self.pool.adapter, "close") as close:
+            self.assertEqual(self.pool.evict_idle(), ["desk-a"])
+        self.assertEqual(list(self.pool.clients), ["desk-b"])
+        close.assert_not_called()  # still used by the other clients
+
+        self.clock.now = 200
+        self.assertIsNot(self.pool["desk-a"], a)  # swept on access, then created again
+        self.assertEqual(list(self.pool.clients), ["desk-a"])
+        self.assertEqual(self.created, ["desk-a", "desk-b", "desk-a"])
+
+    def test_clients_in_use_are_not_evicted(self):
+        with self.pool.lease("desk-a") as a:
+            self.clock.now = 100
+            self.assertEqual(self.pool.evict_idle(), [])
+            self.assertIs(self.pool["desk-a"], a)
+
+        self.clock.now = 200
+        self.assertEqual(self.pool.evict_idle(), ["desk-a"])
+
+    def test_replaced_client_is_closed_after_its_calls(self):
+        pool = ClientPool({"desk-a": file_client}, share_transport=False)
+
+        a = pool["desk-a"]
+        with patch.object(a.session, "close") as close:
+            with pool.lease("desk-a"):
+                pool.register("desk-a", file_client)
+                close.assert_not_called()
+                self.assertIsNot(pool["desk-a"], a)
+            close.assert_called_once()
+
+        b = pool["desk-a"]
+        with patch.object(b.session, "close") as close:
+            pool.register("desk-a", file_client)  # not in use, closed at once
+        close.assert_called_once()
+        pool.close()
+
+    def test_factory_exit_is_a_tenant_error(self):
+        def expired():
+            exit(1)
+
+        self.pool.register("desk-c", expired)
+
+        with self.assertRaises(ClientCreationError) as raised:
+            self.pool.client("desk-c")
+        self.assertEqual(raised.exception.tenant, "desk-c")
+
+        errors = self.pool.refresh(["desk-a", "desk-c"])
+        self.assertIsNone(errors["desk-a"])
+        self.assertIsInstance(errors["desk-c"], ClientCreationError)
+
+    def test_from_files(self):
+        pool = ClientPool.from_files({"desk-a": PARAMETERS_FILE_NAME})
+
+        with patch("builtins.open", mock_open(read_data=json.dumps(fake_json))):
+            client = pool["desk-a"]
+
+        self.assertIsInstance(client, FileClient)
+        self.assertEqual(pool.tenants, ["desk-a"])
+        self.assertIn("desk-a", pool)
+        pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+import unittest
+from unittest.mock import patch, mock_open, Mock
+import requests
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.hedging import HedgePolicy
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME
+
+
+def response(status_code: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b"{}"
+    response.url = "http://127.0.0.1/quotes"
+    response.close = Mock()
+    return response
+
+
+class TestHedgePolicy(unittest.TestCase):
+    def test_delay_is_the_latency_percentile(self):
+        policy = HedgePolicy(percentile=0.9, min_samples=10, initial_delay=2.0)
+
+        self.assertEqual(policy.delay("quotes"), 2.0)
+
+        for latency in range(1, 11):
+            policy.observe("quotes", latency / 100)
+
+        self.assertEqual(policy.delay("quotes"), 0.1)
+        self.assertEqual(policy.delay("price_history"), 2.0)
+
+    def test_delay_has_a_floor(self):
+        policy = HedgePolicy(min_samples=1, min_delay=0.05)
+        policy.observe("quotes", 0.001)
+
+        self.assertEqual(policy.delay("quotes"), 0.05)
+
+    def test_only_market_data_gets_are_hedged(self):
+        policy = HedgePolicy()
+
+        self.assertTrue(policy.hedged("GET", "quotes"))
+        self.assertFalse(policy.hedged("GET", "get_all_orders"))
+        self.assertFalse(policy.hedged("POST", "quotes"))
+
+
+class TestHedgedRequests(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.records = []
+        self.api.metrics.add_listener(self.records.append)
+
+        self.delays = [0.5]  # seconds, response delay of each request, 0 once used up
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        test = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with lock:
+                    test.requests += 1
+                    test.in_flight += 1
+                    test.max_in_flight = max(test.max_in_flight, test.in_flight)
+                    delay = test.delays.pop(0) if test.delays else 0
+                time.sleep(delay)
+                with lock:
+                    test.in_flight -= 1
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            request_queue_size = 64  # listen backlog, for the concurrent requests
+
+        lock = threading.Lock()
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/quotes"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self.api.hedge_policy is not None:
+            self.api.hedge_policy.shutdown()
+
+    def request(self, endpoint: str = "quotes"):
+        response = self.api._BaseClient__request("GET", self.url, endpoint)
+        self.api._BaseClient__complete(response)
+        return response
+
+    def test_slow_response_is_hedged(self):
+        self.api.hedge_policy = HedgePolicy(initial_delay=0.05)
+
+        start = time.perf_counter()
+        response = self.request()
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(self.requests, 2)
+        self.assertTrue(self.records[0].hedged)
+        self.assertTrue(self.records[0].hedge_won)
+
+        snapshot = self.api.metrics.snapshot()["GET quotes"]
+        self.assertEqual(snapshot["hedges"], 1)
+        self.assertEqual(snapshot["hedge_wins"], 1)
+
+    def test_latency_is_measured_from_the_request(self):
+        self.api.hedge_policy = HedgePolicy(initial_delay=0.1)
+
+        self.request()
+
+        self.assertTrue(self.records[0].hedge_won)
+        self.assertGreaterEqual(self.api.hedge_policy.latencies["quotes"][0], 0.1)
+
+    def test_queueing_does_not_trigger_hedges(self):
+        self.delays = [0.2] * 8
+        self.api.hedge_policy = HedgePolicy(initial_delay=0.3, max_workers=2)
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda _: self.request(), range(8)))
+
+        self.assertEqual(self.requests, 8)
+        self.assertEqual(self.max_in_flight, 2)  # bounded by the pool
+        self.assertFalse(any(record.hedged for record in self.records))
+
+    def test_losing_response_is_closed(self):
+        self.api.hedge_policy = HedgePolicy(initial_delay=0.05)
+        losing = response(200)
+
+        def send(method, url, **kwargs):
+            if send.calls == 0:
+                send.calls += 1
+                time.sleep(0.1)
+                return response(200)
+            time.sleep(0.3)
+            return losing
+
+        send.calls = 0
+        with patch.object(self.api.session, "request", side_effect=send):
+            self.request()
+            self.assertFalse(self.records[0].hedge_won)
+            time.sleep(0.4)  # the hedge answers after the request returned
+
+        losing.close.assert_called_once()
+
+    def test_hedge_answers_when_the_request_raises(self):
+        self.api.hedge_policy = HedgePolicy(initial_delay=0.05)
+
+        def send(method, url, **kwargs):
+            if send.calls == 0:
+                send.calls += 1
+                time.sleep(0.1)
+                raise RuntimeError("boom")
+            time.sleep(0.1)
+            return response(200)
+
+        send.calls = 0
+        with patch.object(self.api.session, "request", side_effect=send):
+            result = self.request()
+
+        self.assertEqual(result.status_code, 200)
+        self.assertTrue(self.records[0].hedge_won)
+
+    def test_fast_response_is_not_hedged(self):
+        self.delays = []
+        self.api.hedge_policy = HedgePolicy(initial_delay=0.5)
+
+        self.request()
+
+        self.assertEqual(self.requests, 1)
+        self.assertFalse(self.records[0].hedged)
+
+    def test_budget_bounds_hedges(self):
+        self.delays = [0.2, 0.2, 0.2]
+        self.api.hedge_policy = HedgePolicy(initial_delay=0.05, max_ratio=0, burst=1)
+
+        self.request()
+        self.request()
+
+        self.assertEqual([record.hedged for record in self.records], [True, False])
+
+    def test_other_endpoints_are_not_hedged(self):
+        self.delays = [0.2]
+        self.api.hedge_policy = HedgePolicy(initial_delay=0.05)
+
+        self.request("accounts")
+
+        self.assertEqual(self.requests, 1)
+        self.assertFalse(self.records[0].hedged)
+
+    def test_no_hedging_by_default(self):
+        self.delays = [0.2]
+
+        self.request()
+
+        self.assertEqual(self.requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
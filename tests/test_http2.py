@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch, mock_open
+import importlib.util
+import requests
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.retry import not_sent
+from schwab_api_wrapper.schemas.market_data import CandleList, QuoteResponse
+
+from benchmarks import payloads
+from benchmarks.server import H2StandInServer, redirect
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME
+
+HTTPX_INSTALLED = (
+    importlib.util.find_spec("httpx") is not None
+    and importlib.util.find_spec("h2") is not None
+)
+
+QUOTES_BODY = json.dumps(payloads.quotes_payload(5)).encode()
+PRICE_HISTORY_BODY = json.dumps(payloads.price_history_payload(1)).encode()
+
+ROUTES = {
+    urlparse(QUOTES_URL).path: QUOTES_BODY,
+    urlparse(PRICE_HISTORY_URL).path: PRICE_HISTORY_BODY,
+}
+
+
+@unittest.skipUnless(HTTPX_INSTALLED, "httpx[http2] is not installed")
+class TestHTTP2Transport(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False, http2=True)
+
+    def tearDown(self) -> None:
+        self.api.session.close()
+
+    def test_endpoints_over_http2(self):
+        with H2StandInServer(ROUTES) as server:
+            redirect(self.api, server.url)
+
+            quotes, error = self.api.quotes(payloads.symbols(5))
+            self.assertIsNone(error)
+            self.assertIsInstance(quotes, QuoteResponse)
+
+            candles, error = self.api.price_history(
+                "AAPL",
+                PeriodFrequencyParameters(
+                    PeriodType.DAY, Period.ONE, FrequencyType.MINUTE, Frequency.ONE
+                ),
+            )
+            self.assertIsNone(error)
+            self.assertIsInstance(candles, CandleList)
+
+            response = self.api._BaseClient__request(
+                "GET", f"{MARKET_DATA_ENDPOINT}/missing", "missing"
+            )
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.http_version, "HTTP/2")
+
+    def test_concurrent_requests_share_one_connection(self):
+        with H2StandInServer(ROUTES, delay=0.2) as server:
+            redirect(self.api, server.url)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(10) as executor:
+                results = list(
+                    executor.map(
+                        lambda _: self.api.quotes(payloads.symbols(5)), range(10)
+                    )
+                )
+            elapsed = time.perf_counter() - start
+
+        self.assertTrue(all(error is None for _, error in results))
+        self.assertEqual(server.connections, 1)
+        self.assertGreater(server.max_streams, 1)
+        self.assertLess(elapsed, 10 * 0.2)
+
+    def test_errors_are_requests_exceptions(self):
+        with H2StandInServer(ROUTES) as server:
+            url = server.url
+
+        redirect(self.api, url)
+        with self.assertRaises(requests.exceptions.ConnectionError) as context:
+            self.api.quotes(["F"])
+        self.assertTrue(not_sent(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import json
+import time
+from urllib.parse import urlparse, parse_qs
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.instrument_store import InstrumentStore
+from schwab_api_wrapper.instrument_index import InstrumentIndex
+from schwab_api_wrapper.schemas.market_data import InstrumentsRoot
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME
+
+INSTRUMENTS = {
+    "A": "Agilent Technologies Inc",
+    "AA": "Alcoa Corp",
+    "AAPL": "Apple Inc",
+    "AMZN": "Amazon.com Inc",
+    "F": "Ford Motor Co",
+    "T": "A T & T Inc",
+    "TSLA": "Tesla Inc",
+}
+
+
+def instruments_root(symbols: dict[str, str]) -> InstrumentsRoot:
+    return InstrumentsRoot(
+        instruments=[
+            {
+                "cusip": f"{symbol}CUSIP",
+                "symbol": symbol,
+                "description": description,
+                "exchange": "NYSE",
+                "assetType": "EQUITY",
+            }
+            for symbol, description in symbols.items()
+        ]
+    )
+
+
+class TestInstrumentIndex(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.store = InstrumentStore(self.api)
+        self.store.add(instruments_root(INSTRUMENTS))
+        self.index = InstrumentIndex(self.store)
+
+    def symbols(self, result) -> list[str]:
+        instruments, error = result
+        self.assertIsNone(error)
+        return [instrument.symbol for instrument in instruments]
+
+    @responses.activate
+    def test_symbol_prefix(self):
+        self.assertEqual(
+            self.symbols(self.index.symbol_prefix("a")), ["A", "AA", "AAPL", "AMZN"]
+        )
+        self.assertEqual(
+            self.symbols(self.index.symbol_prefix("A", limit=2)), ["A", "AA"]
+        )
+        self.assertEqual(self.symbols(self.index.symbol_prefix("TS")), ["TSLA"])
+        self.assertEqual(len(responses.calls), 0)
+
+    @responses.activate
+    def test_symbol_regex(self):
+        self.assertEqual(self.symbols(self.index.symbol_regex("A+")), ["A", "AA"])
+        self.assertEqual(
+            self.symbols(self.index.symbol_regex(".{4}")), ["AAPL", "AMZN", "TSLA"]
+        )
+        self.assertEqual(len(responses.calls), 0)
+
+    @responses.activate
+    def test_description(self):
+        self.assertEqual(
+            self.symbols(self.index.description("inc")),
+            ["A", "AAPL", "AMZN", "T", "TSLA"],
+        )
+        self.assertEqual(self.symbols(self.index.description("Ap")), ["AAPL"])
+        self.assertEqual(
+            self.symbols(self.index.description("tech a", fallback=False)), []
+        )
+        self.assertEqual(self.symbols(self.index.description("a t & t")), ["T"])
+        self.assertEqual(self.symbols(self.index.description_regex(r"\.com")), ["AMZN"])
+        self.assertEqual(len(responses.calls), 0)
+
+    @responses.activate
+    def test_fallback_on_miss(self):
+        responses.add(
+            responses.GET,
+            INSTRUMENTS_URL,
+            json=instruments_root({"MSFT": "Microsoft Corp"}).model_dump(mode="json"),
+            status=200,
+        )
+
+        self.assertEqual(self.symbols(self.index.description("micro")), ["MSFT"])
+        params = parse_qs(urlparse(responses.calls[0].request.url).query)
+        self.assertEqual(params["projection"], [Projection.DESC_SEARCH.value])
+
+        # the result is now local, and in the store
+        self.assertEqual(self.symbols(self.index.symbol_prefix("MS")), ["MSFT"])
+        self.assertIn("MSFT", self.store)
+        self.assertEqual(len(responses.calls), 1)
+
+        self.assertEqual(
+            self.symbols(self.index.symbol_prefix("Z", fallback=False)), []
+        )
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_fallback_error(self):
+        responses.add(
+            responses.GET,
+            INSTRUMENTS_URL,
+            json={"errors": [{"id": "1", "status": 400, "title": "Bad Request"}]},
+            status=400,
+        )
+
+        instruments, error = self.index.symbol_prefix("Z")
+
+        self.assertIsNone(instruments)
+        self.assertEqual(error.errors[0].title, "Bad Request")
+
+    def test_large_index_latency(self):
+        symbols = {
+            f"{a}{b}{c}": f"{a}{b} Holdings {c} Trust"
+            for a in "ABCDEFGHIJ"
+            for b in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+            for c in "ABCDEFGHIJKLMNOPQRST"
+        }
+        self.store.add(instruments_root(symbols))
+        self.index.rebuild()
+
+        start = time.perf_counter()
+        for _ in range(100):
+            self.index.symbol_prefix("CD", fallback=False)
+            self.index.description("holdings t", fallback=False)
+        elapsed = (time.perf_counter() - start) / 200
+
+        self.assertEqual(len(self.index), len(symbols) + len(INSTRUMENTS))
+        self.assertLess(elapsed, 0.005)  # generous bound for slow CI machines
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from urllib.parse import urlparse, parse_qs
+from zoneinfo import ZoneInfo
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.instrument_store import (
+    InstrumentStore,
+    KEY_FETCHED,
+    KEY_FUNDAMENTAL_FETCHED,
+)
+from schwab_api_wrapper.schemas.market_data import FundamentalInst
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME
+
+
+def instrument_json(symbol: str, fundamental: bool) -> dict:
+    instrument = {
+        "cusip": f"{symbol}CUSIP",
+        "symbol": symbol,
+        "description": f"{symbol} Inc",
+        "exchange": "NYSE",
+        "assetType": "EQUITY",
+    }
+    if fundamental:
+        instrument["fundamental"] = dict.fromkeys(FundamentalInst.model_fields, 0) | {
+            "symbol": symbol,
+            "peRatio": 12.5,
+            "fundStrategy": None,
+            "corpactionDate": None,
+        }
+    return instrument
+
+
+def instruments_callback(request):
+    params = parse_qs(urlparse(request.url).query)
+    fundamental = params["projection"][0] == Projection.FUNDAMENTAL.value
+    instruments = [
+        instrument_json(symbol, fundamental)
+        for symbol in params["symbol"][0].split(",")
+        if symbol != "NOPE"
+    ]
+    return 200, {}, json.dumps({"instruments": instruments})
+
+
+class TestInstrumentStore(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.directory = tempfile.TemporaryDirectory()
+        self.store_file = os.path.join(self.directory.name, "instruments.json")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def symbols_requested(self) -> list[list[str]]:
+        return sorted(
+            parse_qs(urlparse(call.request.url).query)["symbol"][0].split(",")
+            for call in responses.calls
+        )
+
+    @responses.activate
+    def test_only_missing_symbols_are_fetched_in_batches(self):
+        responses.add_callback(
+            responses.GET, INSTRUMENTS_URL, callback=instruments_callback
+        )
+        store = InstrumentStore(self.api, batch_size=2)
+
+        found, error = store.lookup(["F", "t", "AAPL"])
+
+        self.assertIsNone(error)
+        self.assertEqual(list(found), ["F", "T", "AAPL"])
+        self.assertEqual(found["T"].fundamental.peRatio, 12.5)
+        self.assertEqual(self.symbols_requested(), [["AAPL"], ["F", "T"]])
+
+        found, error = store.lookup(["AAPL", "MSFT", "NOPE"])
+
+        self.assertIsNone(error)
+        self.assertEqual(list(found), ["AAPL", "MSFT"])
+        self.assertEqual(
+            self.symbols_requested(), [["AAPL"], ["F", "T"], ["MSFT", "NOPE"]]
+        )
+
+        self.assertEqual(store.by_cusip("MSFTCUSIP").symbol, "MSFT")
+        self.assertNotIn("NOPE", store)
+
+    @responses.activate
+    def test_fundamentals_ttl(self):
+        responses.add_callback(
+            responses.GET, INSTRUMENTS_URL, callback=instruments_callback
+        )
+        store = InstrumentStore(self.api, fundamentals_ttl=timedelta(hours=1))
+
+        store.lookup(["F"], Projection.SYMBOL_SEARCH)
+        self.assertIsNone(store.get("F").fundamental)
+
+        store.lookup(["F"])  # symbol-search entries have no fundamentals
+        store.lookup(["F"])
+        self.assertEqual(len(responses.calls), 2)
+
+        two_hours_ago = (
+            datetime.now(ZoneInfo("America/New_York")) - timedelta(hours=2)
+        ).isoformat()
+        store.entries["F"][KEY_FETCHED] = two_hours_ago
+        store.entries["F"][KEY_FUNDAMENTAL_FETCHED] = two_hours_ago
+
+        store.lookup(["F"], Projection.SYMBOL_SEARCH)  # instrument data still fresh
+        self.assertEqual(len(responses.calls), 2)
+
+        store.lookup(["F"])
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_symbol_search_refresh_keeps_old_fundamentals(self):
+        responses.add_callback(
+            responses.GET, INSTRUMENTS_URL, callback=instruments_callback
+        )
+        store = InstrumentStore(self.api)
+        store.lookup(["F"])
+
+        long_ago = (
+            datetime.now(ZoneInfo("America/New_York")) - timedelta(days=31)
+        ).isoformat()
+        store.entries["F"][KEY_FETCHED] = long_ago
+        store.entries["F"][KEY_FUNDAMENTAL_FETCHED] = long_ago
+
+        for _ in range(3):
+            found, error = store.lookup(["F"], Projection.SYMBOL_SEARCH)
+            self.assertIsNone(error)
+        self.assertEqual(len(responses.calls), 2)  # refreshed once, then cached
+
+        # the merged fundamentals keep their age, the entry is no longer pruned
+        self.assertEqual(store.get("F").fundamental.peRatio, 12.5)
+        self.assertEqual(store.entries["F"][KEY_FUNDAMENTAL_FETCHED], long_ago)
+        store.prune()
+        self.assertIn("F", store)
+
+        store.lookup(["F"])
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_persisted_across_restarts(self):
+        responses.add_callback(
+            responses.GET, INSTRUMENTS_URL, callback=instruments_callback
+        )
+
+        InstrumentStore(self.api, self.store_file).lookup(["F", "T"])
+        restarted = InstrumentStore(self.api, self.store_file)
+        found, error = restarted.lookup(["F", "T"])
+
+        self.assertIsNone(error)
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(found["F"].fundamental.peRatio, 12.5)
+        self.assertEqual(restarted.by_cusip("TCUSIP").symbol, "T")
+
+    @responses.activate
+    def test_error(self):
+        responses.add(
+            responses.GET,
+            INSTRUMENTS_URL,
+            json={"errors": [{"id": "1", "status": 400, "title": "Bad Request"}]},
+            status=400,
+        )
+        store = InstrumentStore(self.api)
+
+        found, error = store.lookup(["F"])
+
+        self.assertIsNone(found)
+        self.assertEqual(error.errors[0].title, "Bad Request")
+        self.assertEqual(len(store), 0)
+
+    def test_unsupported_projection(self):
+        with self.assertRaises(ValueError):
+            InstrumentStore(self.api).lookup(["F"], Projection.DESC_REGEX)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import requests
+import json
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.metrics import ClientMetrics, Histogram, RequestRecord
+from schwab_api_wrapper.circuit_breaker import CircuitBreakers, CircuitOpenError
+from schwab_api_wrapper.timeouts import DeadlineExceeded, deadline
+from schwab_api_wrapper.schemas.market_data import QuoteResponse, MarketDataError
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME
+
+
+class TestHistogram(unittest.TestCase):
+    def test_cumulative_buckets(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.cumulative(), [("0.1", 2), ("1.0", 3), ("+Inf", 4)])
+        self.assertAlmostEqual(histogram.sum, 2.65)
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(1), float("inf"))
+        self.assertIsNone(Histogram().quantile(0.5))
+
+
+class TestClientMetrics(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.records = []
+        self.api.metrics.add_listener(self.records.append)
+
+    @responses.activate
+    def test_success_is_recorded(self):
+        responses.add(responses.GET, QUOTES_URL, json={}, status=200)
+
+        result, error = self.api.quotes(["F"])
+
+        self.assertIsInstance(result, QuoteResponse)
+        self.assertEqual(len(self.records), 1)
+        record = self.records[0]
+        self.assertEqual((record.endpoint, record.method), ("quotes", "GET"))
+        self.assertEqual(record.status_code, 200)
+        self.assertEqual(record.bytes_received, 2)
+        self.assertEqual(record.retries, 0)
+        self.assertIsNotNone(record.decode_time)
+        self.assertIsNotNone(record.validation_time)
+
+        snapshot = self.api.metrics.snapshot()["GET quotes"]
+        self.assertEqual(snapshot["requests"], 1)
+        self.assertEqual(snapshot["status_codes"], {200: 1})
+        self.assertEqual(snapshot["network_time"]["count"], 1)
+
+    @responses.activate
+    def test_error_is_recorded(self):
+        responses.add(responses.GET, QUOTES_URL, json={"errors": []}, status=400)
+
+        result, error = self.api.quotes(["F"])
+
+        self.assertIsInstance(error, MarketDataError)
+        self.assertEqual(self.records[0].status_code, 400)
+        self.assertIsNotNone(self.records[0].validation_time)
+
+    @responses.activate
+    def test_retries_are_recorded(self):
+        for status in (500, 500, 200):
+            responses.add(responses.GET, QUOTES_URL, json={}, status=status)
+        self.api.retry_policy.sleep = lambda seconds: None
+
+        result, error = self.api.quotes(["F"], retry=True)
+
+        self.assertIsNone(error)
+        self.assertEqual(self.records[0].status_code, 200)
+        self.assertEqual(self.records[0].retries, 2)
+
+    @responses.activate
+    def test_network_errors_are_recorded(self):
+        responses.add(
+            responses.GET, QUOTES_URL, body=requests.exceptions.ConnectTimeout()
+        )
+        self.api.retry_policy.sleep = lambda seconds: None
+
+        for _ in range(5):
+            with self.assertRaises(requests.exceptions.ConnectTimeout):
+                self.api.quotes(["F"])
+        with self.assertRaises(requests.exceptions.ConnectTimeout):
+            self.api.quotes(["F"], retry=True)
+
+        self.assertEqual(len(self.records), 6)
+        self.assertEqual(self.records[0].error, "ConnectTimeout")
+        self.assertIsNone(self.records[0].status_code)
+        self.assertEqual(self.records[-1].retries, 3)
+
+        snapshot = self.api.metrics.snapshot()["GET quotes"]
+        self.assertEqual(snapshot["requests"], 6)
+        self.assertEqual(snapshot["status_codes"], {"error": 6})
+        self.assertEqual(snapshot["errors"], {"ConnectTimeout": 6})
+        self.assertEqual(snapshot["retries"], 3)
+
+    @responses.activate
+    def test_fail_fast_errors_are_recorded(self):
+        responses.add(responses.GET, QUOTES_URL, json={"errors": []}, status=500)
+        self.api.circuit_breakers = CircuitBreakers(failure_threshold=1)
+
+        self.api.quotes(["F"])
+        with self.assertRaises(CircuitOpenError):
+            self.api.quotes(["F"])
+        with deadline(0):
+            with self.assertRaises(DeadlineExceeded):
+                self.api.accounts()
+
+        self.assertEqual(
+            [record.error for record in self.records],
+            [None, "CircuitOpenError", "DeadlineExceeded"],
+        )
+        snapshot = self.api.metrics.snapshot()
+        self.assertEqual(snapshot["GET quotes"]["status_codes"], {500: 1, "error": 1})
+        self.assertEqual(snapshot["GET accounts"]["errors"], {"DeadlineExceeded": 1})
+
+    @responses.activate
+    def test_listener_failure_is_contained(self):
+        responses.add(responses.GET, QUOTES_URL, json={}, status=200)
+        self.api.metrics.add_listener(lambda record: 1 / 0)
+
+        result, error = self.api.quotes(["F"])
+
+        self.assertIsNone(error)
+        self.assertEqual(len(self.records), 1)
+
+    def test_prometheus_text(self):
+        metrics = ClientMetrics(buckets=(0.5,))
+        metrics.record(
+            RequestRecord(
+                "quotes",
+                "GET",
+                QUOTES_URL,
+                status_code=200,
+                retries=2,
+                bytes_received=10,
+                network_time=0.25,
+                decode_time=0.01,
+                validation_time=0.02,
+            )
+        )
+        metrics.record(RequestRecord("quotes", "GET", QUOTES_URL, status_code=500))
+        metrics.record(RequestRecord("quotes", "GET", QUOTES_URL, error="ReadTimeout"))
+
+        lines = metrics.to_prometheus().splitlines()
+
+        self.assertIn("# TYPE schwab_api_requests_total counter", lines)
+        self.assertIn(
+            'schwab_api_requests_total{endpoint="quotes",method="GET",status="200"} 1',
+            lines,
+        )
+        self.assertIn(
+            'schwab_api_requests_total{endpoint="quotes",method="GET",status="error"} 1',
+            lines,
+        )
+        self.assertIn(
+            'schwab_api_errors_total{endpoint="quotes",method="GET",error="ReadTimeout"} 1',
+            lines,
+        )
+        self.assertIn(
+            'schwab_api_retries_total{endpoint="quotes",method="GET"} 2', lines
+        )
+        self.assertIn(
+            'schwab_api_network_seconds_bucket{endpoint="quotes",method="GET",le="0.5"} 3',
+            lines,
+        )
+        self.assertIn(
+            'schwab_api_decode_seconds_count{endpoint="quotes",method="GET"} 1', lines
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
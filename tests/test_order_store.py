@@ -0,0 +1,72 @@
+import unittest
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from schwab_api_wrapper.order_store import OrderStore, OrderDeltaType
+from schwab_api_wrapper.schemas.trader_api import Order, OrderResponse
+
+from tests.fixtures import order_json
+
+
+class TestOrderStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = OrderStore()
+        self.entered = datetime.now(ZoneInfo("America/New_York")) - timedelta(hours=1)
+
+    def snapshot(self, *statuses: tuple[int, str]) -> OrderResponse:
+        return OrderResponse(
+            [
+                order_json(order_id, status, self.entered)
+                for order_id, status in statuses
+            ]
+        )
+
+    def test_first_snapshot_is_all_new(self):
+        deltas = self.store.ingest(self.snapshot((1, "WORKING"), (2, "QUEUED")))
+
+        self.assertEqual([d.type for d in deltas], [OrderDeltaType.NEW] * 2)
+        self.assertEqual(len(self.store), 2)
+
+    def test_unchanged_snapshot_emits_nothing(self):
+        self.store.ingest(self.snapshot((1, "WORKING"), (2, "QUEUED")))
+        deltas = self.store.ingest(self.snapshot((1, "WORKING"), (2, "QUEUED")))
+
+        self.assertEqual(deltas, [])
+
+    def test_changed_and_terminal_deltas(self):
+        self.store.ingest(self.snapshot((1, "WORKING"), (2, "QUEUED"), (3, "WORKING")))
+        deltas = self.store.ingest(
+            self.snapshot((1, "FILLED"), (2, "WORKING"), (3, "WORKING"), (4, "QUEUED"))
+        )
+
+        by_id = {delta.order.orderId: delta for delta in deltas}
+        self.assertEqual(set(by_id), {1, 2, 4})
+        self.assertEqual(by_id[1].type, OrderDeltaType.TERMINAL)
+        self.assertEqual(
+            by_id[1].changed_fields,
+            {"status", "filledQuantity", "remainingQuantity"},
+        )
+        self.assertEqual(by_id[2].type, OrderDeltaType.CHANGED)
+        self.assertEqual(by_id[2].changed_fields, {"status"})
+        self.assertEqual(by_id[2].previous.status.value, "QUEUED")
+        self.assertEqual(by_id[4].type, OrderDeltaType.NEW)
+        self.assertEqual([o.orderId for o in self.store.open_orders()], [2, 3, 4])
+
+    def test_prune_terminal_orders(self):
+        self.store.ingest(self.snapshot((1, "FILLED"), (2, "WORKING")))
+
+        removed = self.store.prune(datetime.now(ZoneInfo("America/New_York")))
+
+        self.assertEqual(removed, 1)
+        self.assertNotIn(1, self.store)
+        self.assertIn(2, self.store)
+
+    def test_ingest_single_order(self):
+        deltas = self.store.ingest(Order(**order_json(7, "WORKING", self.entered)))
+
+        self.assertEqual(deltas[0].type, OrderDeltaType.NEW)
+        self.assertEqual(self.store[7].orderId, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import requests
+import json
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.order_watcher import OrderWatcher
+from schwab_api_wrapper.schemas.trader_api import Order, Status
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME, order_json
+
+
+def market_hours_json(now: datetime, is_open: bool) -> dict:
+    hours = {
+        "date": now.date().isoformat(),
+        "marketType": "EQUITY",
+        "product": "EQ",
+        "isOpen": is_open,
+    }
+    if is_open:
+        hours["sessionHours"] = {
+            "regularMarket": [
+                {
+                    "start": (now - timedelta(hours=1)).isoformat(),
+                    "end": (now + timedelta(hours=1)).isoformat(),
+                }
+            ]
+        }
+    return {"equity": {"EQ": hours}}
+
+
+class TestOrderWatcher(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.encrypted_account_number = "encrypted_account_number"
+        self.orders_url = (
+            f"{TRADER_API_ENDPOINT}/accounts/{self.encrypted_account_number}/orders"
+        )
+        self.now = datetime.now(ZoneInfo("America/New_York"))
+        self.watcher = OrderWatcher(self.api, self.encrypted_account_number)
+
+    @responses.activate
+    def test_poll_fires_callbacks_on_transition(self):
+        entered = self.now - timedelta(minutes=5)
+        first = Order(**order_json(1, "WORKING", entered))
+        second = Order(**order_json(2, "WORKING", entered))
+
+        responses.add(
+            responses.GET,
+            self.orders_url,
+            json=[
+                order_json(1, "FILLED", entered),
+                order_json(2, "WORKING", entered),
+                order_json(3, "CANCELED", entered),
+            ],
+            status=200,
+        )
+
+        order_events = []
+        filled_events = []
+        self.watcher.watch(first, lambda o, prev: order_events.append((o, prev)))
+        self.watcher.watch(second)
+        self.watcher.add_callback(
+            lambda o, prev: filled_events.append(o.orderId), [Status.FILLED]
+        )
+
+        transitions = self.watcher.poll()
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(len(transitions), 1)
+        self.assertEqual(order_events[0][0].status, Status.FILLED)
+        self.assertEqual(order_events[0][1], Status.WORKING)
+        self.assertEqual(filled_events, [1])
+        self.assertEqual(self.watcher.watching, [2])
+
+    @responses.activate
+    def test_poll_without_orders_makes_no_request(self):
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(len(responses.calls), 0)
+
+    @responses.activate
+    def test_poll_error_keeps_orders(self):
+        self.watcher.watch(Order(**order_json(1, "WORKING", self.now)))
+        responses.add(
+            responses.GET, self.orders_url, json={"message": "Unauthorized"}, status=401
+        )
+
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.watcher.watching, [1])
+
+    @responses.activate
+    def test_next_interval_adapts_to_order_age(self):
+        responses.add(
+            responses.GET,
+            f"{MARKET_HOURS_URL}/{MarketID.EQUITY.value}",
+            json=market_hours_json(self.now, True),
+            status=200,
+        )
+
+        self.watcher.watch(Order(**order_json(1, "WORKING", self.now)))
+        self.assertAlmostEqual(self.watcher.next_interval(self.now), 1.0)
+
+        later = self.now + timedelta(seconds=30)
+        self.assertAlmostEqual(self.watcher.next_interval(later), 1.5)
+
+        self.watcher.max_interval = 1.2
+        self.assertEqual(self.watcher.next_interval(later), 1.2)
+
+        self.assertEqual(len(responses.calls), 1)  # session hours fetched once a day
+
+    @responses.activate
+    def test_next_interval_market_closed(self):
+        responses.add(
+            responses.GET,
+            f"{MARKET_HOURS_URL}/{MarketID.EQUITY.value}",
+            json=market_hours_json(self.now, False),
+            status=200,
+        )
+
+        self.watcher.watch(Order(**order_json(1, "WORKING", self.now)))
+        self.assertEqual(self.watcher.next_interval(self.now), 300.0)
+
+    @responses.activate
+    def test_next_interval_without_orders_fetches_no_hours(self):
+        self.assertEqual(self.watcher.next_interval(self.now), 30.0)
+        self.assertEqual(len(responses.calls), 0)
+
+    @responses.activate
+    def test_market_hours_failure_is_backed_off(self):
+        responses.add(
+            responses.GET,
+            f"{MARKET_HOURS_URL}/{MarketID.EQUITY.value}",
+            body=requests.exceptions.ConnectionError(),
+        )
+        self.watcher.watch(Order(**order_json(1, "WORKING", self.now)))
+
+        for _ in range(3):
+            self.assertAlmostEqual(self.watcher.next_interval(self.now), 1.0)
+
+        self.assertEqual(len(responses.calls), 1)
+
+        self.watcher._hours_retry_at = time.monotonic()
+        responses.replace(
+            responses.GET,
+            f"{MARKET_HOURS_URL}/{MarketID.EQUITY.value}",
+            json=market_hours_json(self.now, False),
+            status=200,
+        )
+        self.assertEqual(self.watcher.next_interval(self.now), 300.0)
+        self.assertEqual(len(responses.calls), 2)
+
+    def test_run_survives_market_hours_errors(self):
+        self.watcher = OrderWatcher(
+            self.api,
+            self.encrypted_account_number,
+            min_interval=0.01,
+            hours_retry_delay=0.01,
+        )
+        self.watcher.watch(Order(**order_json(1, "WORKING", self.now)))
+
+        with (
+            patch.object(self.watcher, "poll", return_value=[]),
+            patch.object(
+                self.api,
+                "single_market_hours",
+                side_effect=requests.exceptions.ConnectionError(),
+            ) as single_market_hours,
+        ):
+            self.watcher.start()
+            time.sleep(0.2)
+            alive = self.watcher._thread.is_alive()
+            self.watcher.stop(timeout=5)
+
+        self.assertTrue(alive)
+        self.assertGreater(single_market_hours.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+from schwab_api_wrapper.portfolio import PositionsFrame
+from schwab_api_wrapper.schemas.trader_api import AccountsResponse
+
+from tests.fixtures import account_json, position_json
+
+
+def option_position_json(symbol: str, underlying: str, contracts: float) -> dict:
+    position = position_json(symbol, contracts, 300.0 * contracts)
+    position["averagePrice"] = 2.5
+    position["instrument"] = {
+        "assetType": "OPTION",
+        "cusip": "0AAPL.AA40000000",
+        "symbol": symbol,
+        "description": "AAPL 01/17/2025 200.00 C",
+        "instrumentId": 1,
+        "netChange": 0,
+        "optionDeliverables": {
+            "symbol": 1,
+            "deliverableUnits": 100,
+            "apiCurrencyType": "USD",
+            "assetType": "EQUITY",
+        },
+        "putCall": "CALL",
+        "optionMultiplier": 100,
+        "type": "VANILLA",
+        "underlyingSymbol": underlying,
+    }
+    return position
+
+
+class TestPositionsFrame(unittest.TestCase):
+    def setUp(self) -> None:
+        accounts = AccountsResponse(
+            [
+                account_json(
+                    "111",
+                    [
+                        position_json("AAPL", 10, 2000.0),
+                        position_json("F", 100, 1200.0),
+                        option_position_json("AAPL  250117C00200000", "AAPL", 2),
+                    ],
+                ),
+                account_json("222", [position_json("AAPL", 5, 1000.0)]),
+                account_json("333", []),
+            ]
+        )
+        self.frame = PositionsFrame.from_accounts(accounts)
+
+    def test_columns(self):
+        self.assertEqual(len(self.frame), 4)
+        np.testing.assert_array_equal(self.frame["quantity"], [10, 100, 2, 5])
+        self.assertEqual(self.frame["cost_basis"][2], 2.5 * 2 * 100)
+
+    def test_aggregates(self):
+        self.assertEqual(
+            self.frame.by_asset_type(), {"EQUITY": 4200.0, "OPTION": 600.0}
+        )
+        self.assertEqual(self.frame.by_account(), {"111": 3800.0, "222": 1000.0})
+        self.assertEqual(self.frame.by_underlying(), {"AAPL": 3600.0, "F": 1200.0})
+        self.assertEqual(self.frame.by_symbol("quantity")["AAPL"], 15)
+        self.assertEqual(self.frame.totals()["market_value"], 4800.0)
+        self.assertAlmostEqual(sum(self.frame.weights("underlying").values()), 1.0)
+
+    def test_aggregate_multiple_columns(self):
+        labels, sums = self.frame.aggregate(
+            "account", ("market_value", "day_profit_loss")
+        )
+        self.assertEqual(labels.tolist(), ["111", "222"])
+        np.testing.assert_allclose(
+            sums["day_profit_loss"], [1900.0 + 200.0 + 580.0, 950.0]
+        )
+
+    def test_empty(self):
+        frame = PositionsFrame.from_accounts([])
+        self.assertEqual(len(frame), 0)
+        self.assertEqual(frame.by_asset_type(), {})
+        self.assertEqual(frame.weights(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
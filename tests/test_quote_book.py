@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import patch, mock_open
+import json
+import math
+
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.quote_book import QuoteBook
+from schwab_api_wrapper.streaming import StreamClient
+from schwab_api_wrapper.schemas.market_data import EquityResponse, QuoteResponse
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME, data_json
+
+
+class TestQuoteBook(unittest.TestCase):
+    def setUp(self) -> None:
+        self.book = QuoteBook(capacity=2)
+
+    def test_deltas_are_applied_in_place(self):
+        self.book.apply(
+            {
+                "timestamp": 1,
+                "content": [
+                    {"key": "AAPL", "delayed": False, "1": 189.5, "2": 189.6, "4": 3}
+                ],
+            }
+        )
+        values = self.book.values
+
+        self.book.apply({"timestamp": 2, "content": [{"key": "AAPL", "2": 189.7}]})
+
+        self.assertIs(self.book.values, values)
+        self.assertEqual(self.book.get("AAPL", "bidPrice"), 189.5)
+        self.assertEqual(self.book.get("AAPL", "askPrice"), 189.7)
+        self.assertIsNone(self.book.get("AAPL", "lastPrice"))
+        self.assertIsNone(self.book.get("MSFT", "lastPrice"))
+        self.assertEqual(self.book.updated[0], 2)
+
+    def test_book_grows(self):
+        for index, symbol in enumerate(["A", "B", "C", "D", "E"]):
+            self.book.apply(
+                {"timestamp": index, "content": [{"key": symbol, "3": float(index)}]}
+            )
+
+        self.assertEqual(len(self.book), 5)
+        self.assertEqual(len(self.book.values), 8)
+        self.assertEqual(
+            self.book.column("lastPrice").tolist(), [0.0, 1.0, 2.0, 3.0, 4.0]
+        )
+        self.assertEqual(self.book.symbols, ["A", "B", "C", "D", "E"])
+
+    def test_snapshot(self):
+        self.book.apply(
+            {
+                "timestamp": 1,
+                "content": [
+                    {
+                        "key": "AAPL",
+                        "delayed": False,
+                        "assetMainType": "EQUITY",
+                        "cusip": "037833100",
+                        "1": 189.5,
+                        "2": 189.6,
+                        "3": 189.55,
+                        "4": 3,
+                        "8": 1000,
+                        "13": "Q",
+                        "15": "Apple Inc",
+                        "25": "NASDAQ",
+                        "32": "Normal",
+                        "48": False,
+                    },
+                    {"key": "$SPX", "assetMainType": "INDEX", "3": 5000.0},
+                ],
+            }
+        )
+
+        snapshot = self.book.snapshot()
+
+        self.assertIsInstance(snapshot, QuoteResponse)
+        self.assertEqual(list(snapshot), ["AAPL"])
+        quote = snapshot["AAPL"]
+        self.assertIsInstance(quote, EquityResponse)
+        self.assertTrue(quote.realtime)
+        self.assertEqual(quote.quote.bidPrice, 189.5)
+        self.assertEqual(quote.quote.totalVolume, 1000)
+        self.assertEqual(quote.quote.highPrice, 0)
+        self.assertEqual(quote.quote.securityStatus, "Normal")
+        self.assertEqual(quote.reference.exchangeName, "NASDAQ")
+        self.assertFalse(quote.reference.isHardToBorrow)
+        self.assertIsNone(quote.regular)
+
+        self.assertEqual(len(self.book.snapshot(["$SPX", "MSFT"])), 0)
+
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def test_attach_skips_models(self, mock_file):
+        stream = StreamClient(FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False))
+        self.book.attach(stream)
+
+        with patch("schwab_api_wrapper.streaming.StreamData") as stream_data:
+            stream._dispatch(data_json("LEVELONE_EQUITIES", [{"key": "F", "3": 12.1}]))
+            stream_data.assert_not_called()
+
+        self.assertEqual(self.book.get("F", "lastPrice"), 12.1)
+        self.assertTrue(math.isnan(self.book.values[0, 1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -104,6 +104,19 @@ class TestRedisClient(unittest.TestCase):
         loaded_token = client.load_parameters()
         self.assertEqual(FAKE_TOKEN, loaded_token)
 
+    @responses.activate
+    def test_account_hashes_stored_encrypted(self):
+        client = RedisClient("dummy_path")
+        client.dump_account_hashes({"12345": "abcde"})
+
+        key, encrypted = client.redis.set.call_args.args
+        self.assertEqual(key, "account_hashes")
+        self.assertNotIn(b"12345", encrypted)
+
+        client.redis.get.return_value = encrypted
+        self.assertEqual(client.load_account_hashes(), {"12345": "abcde"})
+        self.assertEqual(client.encrypted_account_number("12345"), "abcde")
+
     @responses.activate
     def test_refresh_connection(self):
         client = RedisClient("dummy_path")
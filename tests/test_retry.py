@@ -0,0 +1,254 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import requests
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.retry import RetryBudget, RetryPolicy, retry_after
+from schwab_api_wrapper.schemas.market_data import MarketDataError
+from schwab_api_wrapper.schemas.trader_api import OrderResponse
+from schwab_api_wrapper.schemas.trader_api.orders_schemas import OrderRequest
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME
+
+ACCOUNT_HASH = "encrypted_account_number"
+ORDER_URL = f"{TRADER_API_ENDPOINT}/accounts/{ACCOUNT_HASH}/orders"
+
+order_request = OrderRequest(
+    orderType="LIMIT",
+    session="NORMAL",
+    price=10.0,
+    duration="DAY",
+    orderStrategyType="SINGLE",
+    orderLegCollection=[
+        {
+            "instruction": "BUY",
+            "quantity": 1,
+            "instrument": {"symbol": "F", "assetType": "EQUITY"},
+        }
+    ],
+)
+
+
+def response(status: int, headers: dict = None) -> requests.Response:
+    result = requests.Response()
+    result.status_code = status
+    result.headers.update(headers or {})
+    return result
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.policy = RetryPolicy(backoff_factor=1, max_backoff=5, rng=random.Random(1))
+
+    def test_backoff_is_jittered_and_capped(self):
+        for retry, ceiling in ((1, 1), (2, 2), (3, 4), (4, 5), (10, 5)):
+            delays = {self.policy.backoff(retry) for _ in range(50)}
+            self.assertTrue(all(0 <= delay <= ceiling for delay in delays))
+            self.assertGreater(len(delays), 1)
+
+    def test_retry_after(self):
+        self.assertEqual(retry_after(response(503, {"Retry-After": "7"})), 7)
+        self.assertIsNone(retry_after(response(503)))
+        self.assertIsNone(retry_after(response(503, {"Retry-After": "soon"})))
+
+        moment = datetime.now(timezone.utc) + timedelta(seconds=30)
+        asked = retry_after(
+            response(503, {"Retry-After": format_datetime(moment, usegmt=True)})
+        )
+        self.assertTrue(28 <= asked <= 30)
+
+    def test_backoff_honors_retry_after(self):
+        self.assertEqual(
+            self.policy.backoff(1, response(429, {"Retry-After": "20"})), 20
+        )
+        self.assertIsNone(self.policy.backoff(1, response(429, {"Retry-After": "600"})))
+
+        self.policy.respect_retry_after = False
+        self.assertLessEqual(
+            self.policy.backoff(1, response(429, {"Retry-After": "20"})), 1
+        )
+
+    def test_idempotent_methods_are_retried(self):
+        for method in ("GET", "DELETE"):
+            self.assertTrue(self.policy.retryable(method, response(500)))
+            self.assertTrue(
+                self.policy.retryable(
+                    method, exception=requests.exceptions.ReadTimeout()
+                )
+            )
+        self.assertFalse(self.policy.retryable("GET", response(400)))
+        self.assertFalse(self.policy.retryable("GET", exception=ValueError()))
+
+    def test_order_mutations_are_only_retried_when_not_processed(self):
+        for method in ("POST", "PUT"):
+            self.assertFalse(self.policy.retryable(method, response(500)))
+            self.assertFalse(self.policy.retryable(method, response(503)))
+            self.assertTrue(self.policy.retryable(method, response(429)))
+            self.assertFalse(
+                self.policy.retryable(
+                    method, exception=requests.exceptions.ReadTimeout()
+                )
+            )
+            self.assertTrue(
+                self.policy.retryable(
+                    method, exception=requests.exceptions.ConnectTimeout()
+                )
+            )
+        self.assertTrue(self.policy.retryable("POST", response(500), idempotent=True))
+
+    def test_budget(self):
+        budget = RetryBudget(ratio=0.5, burst=2)
+
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+
+        budget.deposit()
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+
+class TestClientRetries(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.delays = []
+        self.api.retry_policy.sleep = self.delays.append
+
+    @responses.activate
+    def test_orders_are_retried(self):
+        responses.add(responses.GET, ORDERS_URL, json={}, status=503)
+        responses.add(responses.GET, ORDERS_URL, json=[], status=200)
+
+        result, error = self.api.get_all_orders(
+            datetime(2024, 1, 2), datetime(2024, 1, 3), retry=True
+        )
+
+        self.assertIsNone(error)
+        self.assertIsInstance(result, OrderResponse)
+        self.assertEqual(len(self.delays), 1)
+        self.assertEqual(
+            self.api.metrics.snapshot()["GET get_all_orders"]["retries"], 1
+        )
+
+    @responses.activate
+    def test_no_retry_by_default(self):
+        responses.add(responses.GET, ORDERS_URL, json={"errors": []}, status=503)
+
+        result, error = self.api.get_all_orders(
+            datetime(2024, 1, 2), datetime(2024, 1, 3)
+        )
+
+        self.assertIsNotNone(error)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_retry_after_is_honored(self):
+        responses.add(
+            responses.GET,
+            QUOTES_URL,
+            json={},
+            status=429,
+            headers={"Retry-After": "3"},
+        )
+        responses.add(responses.GET, QUOTES_URL, json={}, status=200)
+
+        result, error = self.api.quotes(["F"], retry=True)
+
+        self.assertIsNone(error)
+        self.assertEqual(self.delays, [3])
+
+    @responses.activate
+    def test_exhausted_retries(self):
+        responses.add(responses.GET, QUOTES_URL, json={"errors": []}, status=500)
+
+        result, error = self.api.quotes(["F"], retry=True)
+
+        self.assertIsInstance(error, MarketDataError)
+        self.assertEqual(error.message, "Maximum number of retries reached")
+        self.assertEqual(len(responses.calls), 4)
+
+    @responses.activate
+    def test_endpoint_retries(self):
+        responses.add(responses.GET, QUOTES_URL, json={"errors": []}, status=500)
+        self.api.retry_policy.endpoint_retries["quotes"] = 1
+
+        self.api.quotes(["F"], retry=True)
+
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_budget_limits_retries(self):
+        responses.add(responses.GET, QUOTES_URL, json={"errors": []}, status=500)
+        self.api.retry_policy = RetryPolicy(
+            budget_ratio=0, budget_burst=2, sleep=self.delays.append
+        )
+
+        self.api.quotes(["F"], retry=True)
+        self.api.quotes(["F"], retry=True)
+
+        self.assertEqual(len(responses.calls), 4)  # 2 requests, 2 retries
+
+    @responses.activate
+    def test_connection_error_is_retried(self):
+        responses.add(
+            responses.GET, QUOTES_URL, body=requests.exceptions.ConnectionError()
+        )
+        responses.add(responses.GET, QUOTES_URL, json={}, status=200)
+
+        result, error = self.api.quotes(["F"], retry=True)
+
+        self.assertIsNone(error)
+        self.assertEqual(len(self.delays), 1)
+
+    @responses.activate
+    def test_place_order_is_not_repeated_after_server_error(self):
+        responses.add(responses.POST, ORDER_URL, json={"errors": []}, status=500)
+
+        result, error = self.api.place_order(ACCOUNT_HASH, order_request, retry=True)
+
+        self.assertIsNotNone(error)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_place_order_is_repeated_after_rate_limit(self):
+        responses.add(responses.POST, ORDER_URL, json={}, status=429)
+        responses.add(
+            responses.POST,
+            ORDER_URL,
+            headers={"Location": f"{ORDER_URL}/1"},
+            status=201,
+        )
+        responses.add(responses.GET, f"{ORDER_URL}/1", json={}, status=503)
+        responses.add(
+            responses.GET,
+            f"{ORDER_URL}/1",
+            json={"errors": []},
+            status=404,
+        )
+
+        result, error = self.api.place_order(ACCOUNT_HASH, order_request, retry=True)
+
+        methods = [call.request.method for call in responses.calls]
+        self.assertEqual(methods, ["POST", "POST", "GET", "GET"])
+
+    @responses.activate
+    def test_cancel_order_is_retried(self):
+        responses.add(responses.DELETE, f"{ORDER_URL}/1", json={}, status=502)
+        responses.add(responses.DELETE, f"{ORDER_URL}/1", status=200)
+
+        result, error = self.api.cancel_order(ACCOUNT_HASH, 1, retry=True)
+
+        self.assertIsNone(error)
+        self.assertEqual(len(responses.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,13 +6,19 @@ from datetime import datetime, timedelta
 import os
 from pathlib import Path
 import logging
+from urllib.parse import urlparse, parse_qs
 from zoneinfo import ZoneInfo
 
 from schwab_api_wrapper.utils import *
 
-from schwab_api_wrapper.schemas.trader_api.accounts_schemas import AccountNumbersResponse
+from schwab_api_wrapper.schemas.trader_api.accounts_schemas import (
+    AccountNumbersResponse,
+)
 from schwab_api_wrapper.schemas.trader_api import AccountsAndTradingError
-from schwab_api_wrapper.schemas.trader_api.accounts_schemas import AccountsResponse, Account
+from schwab_api_wrapper.schemas.trader_api.accounts_schemas import (
+    AccountsResponse,
+    Account,
+)
 from schwab_api_wrapper.schemas.trader_api import (
     OrderResponse,
     Order,
@@ -35,31 +41,16 @@ from schwab_api_wrapper.file_client import FileClient
 
 from schwab_api_wrapper.oauth_exception import OAuthException
 
-logging.basicConfig(level=logging.INFO)
-
-
-PARAMETERS_FILE_NAME = "fakefile.json"
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME
 
-fake_json = {
-    KEY_CLIENT_ID: "your_client_id",
-    KEY_CLIENT_SECRET: "your_client_secret",
-    KEY_URI_REDIRECT: "your_redirect_uri",
-    KEY_TOKEN_REFRESH: "your_refresh_token",
-    KEY_TOKEN_ACCESS: "your_access_token",
-    KEY_TOKEN_ID: "your_id_token",
-    KEY_ACCESS_TOKEN_VALID_UNTIL: (
-        datetime.now(ZoneInfo("America/New_York")) + timedelta(minutes=30)
-    ).isoformat(),
-    KEY_REFRESH_TOKEN_VALID_UNTIL: (
-        datetime.now(ZoneInfo("America/New_York")) + timedelta(days=7)
-    ).isoformat(),
-}
+logging.basicConfig(level=logging.INFO)
 
 
 class TestSchwabAPI(unittest.TestCase):
     @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
     def setUp(self, mock_file) -> None:  # mock_file is required for the @patch wrapper
         self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.api.retry_policy.sleep = lambda seconds: None
         self.encrypted_account_number = "encrypted_account_number"
         self.order_id = 1324354657
         self.transaction_id = 20240424145200
@@ -1516,6 +1507,202 @@ class TestSchwabAPI(unittest.TestCase):
         self.assertEqual(error.errors[0].detail, "Symbol cannot be null or empty.")
         self.assertEqual(error.errors[0].source.parameter, "symbol")
 
+    @responses.activate
+    def test_instruments_multiple_symbols_are_parsed(self):
+        responses.add(
+            responses.GET,
+            INSTRUMENTS_URL,
+            json={
+                "instruments": [
+                    {
+                        "cusip": "037833100",
+                        "symbol": "AAPL",
+                        "description": "Apple Inc",
+                        "exchange": "NASDAQ",
+                        "assetType": "EQUITY",
+                    },
+                    {
+                        "cusip": "00206R102",
+                        "symbol": "T",
+                        "description": "A T & T Inc",
+                        "exchange": "NYSE",
+                        "assetType": "EQUITY",
+                    },
+                ],
+            },
+            status=200,
+        )
+
+        result, error = self.api.instruments(
+            ["AAPL", "T", "NOPE"], Projection.SYMBOL_SEARCH
+        )
+
+        self.assertIsNone(error)
+        self.assertEqual(
+            [instrument.symbol for instrument in result.instruments],
+            ["AAPL", "T", "NOPE"],
+        )
+        self.assertEqual(result.instruments[1].description, "A T & T Inc")
+        self.assertEqual(result.instruments[2].assetType.value, "UNKNOWN")
+
+    @responses.activate
+    def test_instruments_map(self):
+        def callback(request):
+            symbols = parse_qs(urlparse(request.url).query)["symbol"][0].split(",")
+            instruments = [
+                {
+                    "cusip": f"{symbol}CUSIP",
+                    "symbol": symbol,
+                    "description": f"{symbol} Inc",
+                    "exchange": "NYSE",
+                    "assetType": "EQUITY",
+                }
+                for symbol in symbols
+                if symbol != "NOPE"
+            ]
+            return 200, {}, json.dumps({"instruments": instruments})
+
+        responses.add_callback(responses.GET, INSTRUMENTS_URL, callback=callback)
+
+        symbols = [f"S{index}" for index in range(25)] + ["NOPE", "s0"]
+        result, error = self.api.instruments_map(
+            symbols, Projection.SYMBOL_SEARCH, chunk_size=10
+        )
+
+        self.assertIsNone(error)
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(sorted(result), sorted(f"S{index}" for index in range(25)))
+        self.assertEqual(result["S7"].cusip, "S7CUSIP")
+
+    @responses.activate
+    def test_instruments_map_error(self):
+        responses.add(
+            responses.GET,
+            INSTRUMENTS_URL,
+            json={"errors": [{"id": "1", "status": "400", "title": "Bad Request"}]},
+            status=400,
+        )
+
+        result, error = self.api.instruments_map(["AAPL", "T"], chunk_size=1)
+
+        self.assertIsNone(result)
+        self.assertIsInstance(error, MarketDataError)
+
+    @responses.activate
+    def test_plain_account_number_is_resolved(self):
+        responses.add(
+            responses.GET,
+            ACCOUNT_NUMBERS_URL,
+            json=[{"accountNumber": "12345", "hashValue": "abcde"}],
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            f"{TRADER_API_ENDPOINT}/accounts/abcde/orders",
+            json=[],
+            status=200,
+        )
+
+        for _ in range(2):
+            result, error = self.api.get_account_orders(
+                "12345", datetime(2023, 1, 1), datetime(2023, 12, 31)
+            )
+            self.assertIsInstance(result, OrderResponse)
+            self.assertIsNone(error)
+
+        self.assertEqual(len(responses.calls), 3)  # account numbers fetched once
+        self.assertEqual(self.api.encrypted_account_number("abcde"), "abcde")
+
+    @responses.activate
+    def test_plain_account_number_refreshed_after_failure(self):
+        responses.add(
+            responses.GET,
+            ACCOUNT_NUMBERS_URL,
+            json=[{"accountNumber": "12345", "hashValue": "stale"}],
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            ACCOUNT_NUMBERS_URL,
+            json=[{"accountNumber": "12345", "hashValue": "fresh"}],
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            f"{TRADER_API_ENDPOINT}/accounts/stale/orders/{self.order_id}",
+            json={"message": "Unauthorized"},
+            status=401,
+        )
+        responses.add(
+            responses.GET,
+            f"{TRADER_API_ENDPOINT}/accounts/fresh/orders/{self.order_id}",
+            json={"message": "Order not found"},
+            status=404,
+        )
+        responses.add(
+            responses.GET,
+            f"{TRADER_API_ENDPOINT}/accounts/fresh/orders",
+            json=[],
+            status=200,
+        )
+
+        result, error = self.api.get_single_order("12345", self.order_id)
+        self.assertIsNone(result)
+        self.assertEqual(error.message, "Order not found")  # retried with new hash
+
+        result, error = self.api.get_account_orders(
+            encrypted_account_number="12345",
+            from_entered_time=datetime(2023, 1, 1),
+            to_entered_time=datetime(2023, 12, 31),
+        )
+        self.assertIsInstance(result, OrderResponse)
+        self.assertEqual(self.api.account_hashes, {"12345": "fresh"})
+
+    @responses.activate
+    def test_plain_account_number_as_int(self):
+        responses.add(
+            responses.GET,
+            ACCOUNT_NUMBERS_URL,
+            json=[{"accountNumber": "12345", "hashValue": "abcde"}],
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            f"{TRADER_API_ENDPOINT}/accounts/abcde/orders",
+            json=[],
+            status=200,
+        )
+
+        result, error = self.api.get_account_orders(
+            12345, datetime(2023, 1, 1), datetime(2023, 12, 31)
+        )
+
+        self.assertIsInstance(result, OrderResponse)
+        self.assertEqual(self.api.encrypted_account_number(12345), "abcde")
+
+    @responses.activate
+    def test_plain_account_number_not_refreshed_after_other_errors(self):
+        responses.add(
+            responses.GET,
+            ACCOUNT_NUMBERS_URL,
+            json=[{"accountNumber": "12345", "hashValue": "abcde"}],
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            f"{TRADER_API_ENDPOINT}/accounts/abcde/orders",
+            json={"message": "Invalid time range"},
+            status=400,
+        )
+
+        for _ in range(2):
+            result, error = self.api.get_account_orders(
+                "12345", datetime(2023, 12, 31), datetime(2023, 1, 1)
+            )
+            self.assertEqual(error.message, "Invalid time range")
+
+        self.assertEqual(len(responses.calls), 3)  # account numbers fetched once
+
 
 if __name__ == "__main__":
     unittest.main()
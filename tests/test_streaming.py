@@ -0,0 +1,241 @@
+import unittest
+from unittest.mock import patch, mock_open, PropertyMock
+import responses
+import json
+import queue
+import threading
+
+from websockets.sync.server import serve
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.streaming import StreamClient
+from schwab_api_wrapper.oauth_exception import OAuthException
+from schwab_api_wrapper.schemas.streaming import (
+    ChartEquity,
+    LevelOneEquity,
+    Service,
+)
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME, data_json
+
+
+def user_preference_json(url: str) -> dict:
+    return {
+        "accounts": [{"accountNumber": "12345", "primaryAccount": True}],
+        "streamerInfo": [
+            {
+                "streamerSocketUrl": url,
+                "schwabClientCustomerId": "customer",
+                "schwabClientCorrelId": "correl",
+                "schwabClientChannel": "N9",
+                "schwabClientFunctionId": "APIAPP",
+            }
+        ],
+        "offers": [{"level2Permissions": False, "mktDataPermission": "NP"}],
+    }
+
+
+def response_json(request: dict, code: int = 0) -> dict:
+    return {
+        "response": [
+            {
+                "service": request["service"],
+                "command": request["command"],
+                "requestid": request["requestid"],
+                "SchwabClientCorrelId": "correl",
+                "timestamp": 1700000000000,
+                "content": {"code": code, "msg": "ok"},
+            }
+        ]
+    }
+
+
+class StreamerStandIn:
+    """
+    Local WebSocket server answering LOGIN and recording every request
+    """
+
+    def __init__(self, login_code: int = 0):
+        self.login_code = login_code
+        self.requests: queue.Queue = queue.Queue()
+        self.connections = []
+        self.server = serve(self.handler, "localhost", 0)
+        self.url = f"ws://localhost:{self.server.socket.getsockname()[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def handler(self, websocket):
+        self.connections.append(websocket)
+        for message in websocket:
+            for request in json.loads(message)["requests"]:
+                self.requests.put(request)
+                if request["command"] == "LOGIN":
+                    websocket.send(json.dumps(response_json(request, self.login_code)))
+                elif request["command"] != "LOGOUT":
+                    websocket.send(json.dumps(response_json(request, 26)))
+
+    def next_request(self) -> dict:
+        return self.requests.get(timeout=5)
+
+    def send(self, message: dict):
+        self.connections[-1].send(json.dumps(message))
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.thread.join(5)
+
+
+class TestStreamClient(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.server = StreamerStandIn()
+        self.stream = StreamClient(self.api, reconnect_delay=0.05)
+
+        self.mock = responses.RequestsMock()
+        self.mock.start()
+        self.mock.add(
+            responses.GET,
+            USER_PREFERENCE_URL,
+            json=user_preference_json(self.server.url),
+            status=200,
+        )
+
+    def tearDown(self) -> None:
+        self.stream.stop(timeout=5)
+        self.server.shutdown()
+        self.mock.stop()
+        self.mock.reset()
+
+    def test_user_preference(self):
+        preference, error = self.api.user_preference()
+
+        self.assertIsNone(error)
+        self.assertEqual(preference.streamerInfo[0].streamerSocketUrl, self.server.url)
+        self.assertEqual(preference.accounts[0].accountNumber, "12345")
+
+    def test_login_subscribe_and_typed_data(self):
+        received = queue.Queue()
+        self.stream.add_handler(received.put, Service.LEVELONE_EQUITIES)
+        self.stream.subscribe(Service.LEVELONE_EQUITIES, ["AAPL"], fields=[0, 1, 2, 3])
+        self.stream.start()
+
+        login = self.server.next_request()
+        self.assertEqual(login["command"], "LOGIN")
+        self.assertEqual(login["parameters"]["Authorization"], "your_access_token")
+        self.assertEqual(login["SchwabClientCustomerId"], "customer")
+
+        subs = self.server.next_request()
+        self.assertEqual(subs["command"], "SUBS")
+        self.assertEqual(subs["parameters"], {"keys": "AAPL", "fields": "0,1,2,3"})
+
+        self.server.send(
+            data_json(
+                "LEVELONE_EQUITIES",
+                [{"key": "AAPL", "1": 189.5, "2": 189.6, "3": 189.55}],
+            )
+        )
+        data = received.get(timeout=5)
+        quote = data.content[0]
+        self.assertIsInstance(quote, LevelOneEquity)
+        self.assertEqual((quote.bidPrice, quote.askPrice), (189.5, 189.6))
+        self.assertIsNone(quote.totalVolume)
+
+        self.stream.subscribe(Service.LEVELONE_EQUITIES, ["MSFT"])
+        add = self.server.next_request()
+        self.assertEqual(add["command"], "ADD")
+        self.assertEqual(add["parameters"], {"keys": "AAPL,MSFT", "fields": "0,1,2,3"})
+
+        self.stream.unsubscribe(Service.LEVELONE_EQUITIES, ["AAPL"])
+        unsubs = self.server.next_request()
+        self.assertEqual(unsubs["command"], "UNSUBS")
+        self.assertEqual(unsubs["parameters"], {"keys": "AAPL"})
+
+    def test_reconnect_resubscribes(self):
+        connected = threading.Semaphore(0)
+        received = queue.Queue()
+        self.stream.add_connection_listener(connected.release)
+        self.stream.add_handler(received.put)
+        self.stream.subscribe(Service.CHART_EQUITY, ["F"])
+        self.stream.start()
+
+        self.assertTrue(connected.acquire(timeout=5))
+        self.assertEqual(self.server.next_request()["command"], "LOGIN")
+        self.assertEqual(self.server.next_request()["command"], "SUBS")
+
+        self.server.connections[-1].close()
+
+        self.assertTrue(connected.acquire(timeout=5))
+        self.assertEqual(self.server.next_request()["command"], "LOGIN")
+        subs = self.server.next_request()
+        self.assertEqual(subs["command"], "SUBS")
+        self.assertEqual(subs["parameters"]["keys"], "F")
+        self.assertEqual(subs["parameters"]["fields"], "0,1,2,3,4,5,6,7,8")
+
+        self.server.send(data_json("CHART_EQUITY", [{"key": "F", "seq": 1, "4": 12.1}]))
+        candle = received.get(timeout=5).content[0]
+        self.assertIsInstance(candle, ChartEquity)
+        self.assertEqual(candle.closePrice, 12.1)
+
+    def test_malformed_messages_are_skipped(self):
+        connected = threading.Semaphore(0)
+        received = queue.Queue()
+        self.stream.add_connection_listener(connected.release)
+        self.stream.add_handler(received.put, Service.LEVELONE_EQUITIES)
+        self.stream.start()
+        self.assertTrue(connected.acquire(timeout=5))
+
+        with self.assertLogs("schwab_api_wrapper.streaming", "WARNING") as logs:
+            self.server.connections[-1].send("not json")
+            self.server.send(["not", "an", "object"])
+            self.server.send({"notify": [{"heartbeat": "soon"}], "response": [{}]})
+            self.server.send(
+                data_json("LEVELONE_EQUITIES", [{"key": "F", "1": "not a price"}])
+            )
+            self.server.send(data_json("LEVELONE_EQUITIES", [{"key": "F", "1": 12.1}]))
+
+            quote = received.get(timeout=5).content[0]
+
+        self.assertEqual(quote.bidPrice, 12.1)
+        self.assertEqual(len(logs.records), 5)
+        self.assertTrue(self.stream.connected.is_set())
+        self.assertFalse(connected.acquire(timeout=0.1))  # no reconnect
+
+    def test_unexpected_errors_reconnect(self):
+        attempts = []
+
+        def headers():
+            attempts.append(None)
+            if len(attempts) == 1:
+                raise OAuthException("Token refresh failed", None, {})
+            return {"Authorization": "Bearer your_access_token"}
+
+        connected = threading.Event()
+        self.stream.add_connection_listener(connected.set)
+
+        with patch.object(
+            FileClient, "headers", new_callable=PropertyMock
+        ) as mock_headers:
+            mock_headers.side_effect = headers
+            with self.assertLogs("schwab_api_wrapper.streaming", "ERROR"):
+                self.stream.start()
+                self.assertTrue(connected.wait(5))
+
+        # the first connection failed before its login, the next one logged in
+        self.assertGreaterEqual(len(attempts), 2)
+        self.assertEqual(self.server.next_request()["command"], "LOGIN")
+
+    def test_login_denied_retries(self):
+        self.server.login_code = 3
+        self.stream.start()
+
+        self.assertEqual(self.server.next_request()["command"], "LOGIN")
+        self.assertEqual(self.server.next_request()["command"], "LOGIN")
+        self.assertFalse(self.stream.connected.is_set())
+        # streamer info is fetched again after a denied login
+        self.assertGreaterEqual(len(self.mock.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
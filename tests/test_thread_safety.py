@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.base_client import TokenSnapshot
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME
+
+CALLS = 400
+WORKERS = 32
+
+
+class TestThreadSafety(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.old_token = self.api.access_token
+
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def test_clients_have_their_own_session(self, mock_file):
+        other = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+
+        self.assertIsNot(self.api.session, other.session)
+
+    def test_token_fields_replace_the_snapshot(self):
+        tokens = self.api.tokens
+
+        self.api.access_token = "changed"
+
+        self.assertIsInstance(self.api.tokens, TokenSnapshot)
+        self.assertIsNot(self.api.tokens, tokens)
+        self.assertEqual(self.api.tokens.access_token, "changed")
+        self.assertEqual(tokens.access_token, self.old_token)
+
+    def test_concurrent_calls_across_a_forced_refresh(self):
+        lock = threading.Lock()
+        token_requests = []
+        authorizations = []
+        expired = threading.Event()
+
+        def token_callback(request):
+            with lock:
+                token_requests.append(request)
+            time.sleep(0.05)  # widen the window other threads could race in
+            token = {
+                "expires_in": 1800,
+                "token_type": "Bearer",
+                "scope": "api",
+                "refresh_token": "new_refresh_token",
+                "access_token": "new_access_token",
+                "id_token": "new_id_token",
+            }
+            return 200, {}, json.dumps(token)
+
+        def quotes_callback(request):
+            with lock:
+                authorizations.append(request.headers["Authorization"])
+            return 200, {}, "{}"
+
+        def call(index: int):
+            if index == CALLS // 4:
+                self.api.access_token_valid_until = datetime.now(
+                    ZoneInfo("America/New_York")
+                ) - timedelta(seconds=1)
+                expired.set()
+            return self.api.quotes(["F"])
+
+        with (
+            responses.RequestsMock() as mock,
+            patch.object(self.api, "dump_parameters"),
+        ):
+            mock.add_callback(responses.POST, TOKEN_URL, callback=token_callback)
+            mock.add_callback(responses.GET, QUOTES_URL, callback=quotes_callback)
+
+            with ThreadPoolExecutor(WORKERS) as executor:
+                results = list(executor.map(call, range(CALLS)))
+
+        self.assertTrue(expired.is_set())
+        self.assertEqual(len(token_requests), 1)
+        self.assertTrue(all(error is None for _, error in results))
+        self.assertEqual(len(authorizations), CALLS)
+        self.assertTrue(
+            set(authorizations)
+            <= {f"Bearer {self.old_token}", "Bearer new_access_token"}
+        )
+        self.assertIn("Bearer new_access_token", authorizations)
+        self.assertEqual(self.api.tokens.access_token, "new_access_token")
+        self.assertEqual(self.api.tokens.refresh_token, "new_refresh_token")
+        self.assertEqual(self.api.metrics.snapshot()["GET quotes"]["requests"], CALLS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import requests
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.timeouts import (
+    DeadlineExceeded,
+    Timeouts,
+    deadline,
+    remaining,
+)
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME
+
+
+class TestTimeouts(unittest.TestCase):
+    def test_endpoint_timeouts(self):
+        timeouts = Timeouts(connect=2, read=10, endpoints={"price_history": (2, 60)})
+
+        self.assertEqual(timeouts.timeout("quotes"), (2, 10))
+        self.assertEqual(timeouts.timeout("price_history"), (2, 60))
+        self.assertEqual(timeouts.timeout("price_history", 5), (2, 5))
+        self.assertEqual(timeouts.timeout("quotes", 1), (1, 1))
+
+    def test_nested_deadline_cannot_extend(self):
+        self.assertIsNone(remaining())
+
+        with deadline(1):
+            with deadline(60):
+                self.assertLessEqual(remaining(), 1)
+            with deadline(0.5):
+                self.assertLessEqual(remaining(), 0.5)
+            self.assertGreater(remaining(), 0.5)
+
+        self.assertIsNone(remaining())
+
+
+class TestClientTimeouts(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.delays = []
+        self.api.retry_policy.sleep = self.delays.append
+
+    @responses.activate
+    def test_requests_have_timeouts(self):
+        responses.add(responses.GET, QUOTES_URL, json={}, status=200)
+        self.api.timeouts = Timeouts(connect=1, read=4)
+
+        self.api.quotes(["F"])
+        with deadline(2):
+            self.api.quotes(["F"])
+
+        self.assertEqual(responses.calls[0].request.req_kwargs["timeout"], (1, 4))
+        connect, read = responses.calls[1].request.req_kwargs["timeout"]
+        self.assertLessEqual(connect, 1)
+        self.assertLessEqual(read, 2)
+
+    @responses.activate
+    def test_passed_deadline_fails_fast(self):
+        responses.add(responses.GET, QUOTES_URL, json={}, status=200)
+
+        with deadline(0):
+            with self.assertRaises(DeadlineExceeded):
+                self.api.quotes(["F"])
+
+        self.assertEqual(len(responses.calls), 0)
+
+    @responses.activate
+    def test_deadline_shrinks_retries(self):
+        responses.add(
+            responses.GET,
+            QUOTES_URL,
+            json={"errors": []},
+            status=503,
+            headers={"Retry-After": "3"},
+        )
+
+        with deadline(1):
+            result, error = self.api.quotes(["F"], retry=True)
+
+        self.assertEqual(error.message, "Maximum number of retries reached")
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(self.delays, [])
+
+    def test_stalled_read_times_out(self):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(1)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.api.timeouts = Timeouts(read=0.1)
+
+        start = time.perf_counter()
+        try:
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                self.api._BaseClient__request(
+                    "GET", f"http://127.0.0.1:{server.server_address[1]}", "quotes"
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertLess(time.perf_counter() - start, 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
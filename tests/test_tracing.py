@@ -0,0 +1,139 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import json
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.tracing import NOOP_SPAN, NOOP_TRACER, RecordingTracer
+from schwab_api_wrapper.schemas.trader_api import Order, OrderRequest
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME, order_json
+
+
+class TestTracing(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.tracer = RecordingTracer()
+        self.api.tracer = self.tracer
+        self.encrypted_account_number = "encrypted_account_number"
+
+    def names(self, spans) -> list[str]:
+        return [span.name for span in spans]
+
+    def test_noop_by_default(self):
+        self.assertIs(FileClient.tracer, NOOP_TRACER)
+        self.assertIs(NOOP_TRACER.start_span("schwab_api.http"), NOOP_SPAN)
+
+    @responses.activate
+    def test_pipeline_phases(self):
+        responses.add(responses.GET, QUOTES_URL, json={}, status=200)
+
+        self.api.quotes(["F"])
+
+        (root,) = self.tracer.find("schwab_api.quotes")
+        self.assertIsNone(root.parent_id)
+        self.assertIsNone(root.error)
+        self.assertEqual(
+            self.names(self.tracer.children(root)),
+            [
+                "schwab_api.auth",
+                "schwab_api.http",
+                "schwab_api.decode",
+                "schwab_api.validate",
+            ],
+        )
+
+        (http,) = self.tracer.find("schwab_api.http")
+        self.assertEqual(http.trace_id, root.trace_id)
+        self.assertEqual(http.attributes["http.request.method"], "GET")
+        self.assertEqual(http.attributes["http.response.status_code"], 200)
+        self.assertEqual(http.attributes["schwab_api.endpoint"], "quotes")
+        self.assertGreaterEqual(http.duration, 0)
+
+        (validate,) = self.tracer.find("schwab_api.validate")
+        self.assertEqual(validate.attributes["schwab_api.model"], "QuoteResponse")
+
+    @responses.activate
+    def test_error_marks_the_call(self):
+        responses.add(responses.GET, QUOTES_URL, json={"errors": []}, status=400)
+
+        self.api.quotes(["F"])
+
+        (root,) = self.tracer.find("schwab_api.quotes")
+        self.assertIsNotNone(root.error)
+        (validate,) = self.tracer.find("schwab_api.validate")
+        self.assertEqual(validate.attributes["schwab_api.model"], "MarketDataError")
+
+    @responses.activate
+    def test_place_order_nests_the_follow_up_fetch(self):
+        orders_url = (
+            f"{TRADER_API_ENDPOINT}/accounts/{self.encrypted_account_number}/orders"
+        )
+        responses.add(
+            responses.POST,
+            orders_url,
+            headers={"Location": f"{orders_url}/1"},
+            status=201,
+        )
+        responses.add(
+            responses.GET,
+            f"{orders_url}/1",
+            json=order_json(1, "WORKING", datetime.now(ZoneInfo("America/New_York"))),
+            status=200,
+        )
+        order_request = OrderRequest(
+            orderType="LIMIT",
+            session="NORMAL",
+            price=10.0,
+            duration="DAY",
+            orderStrategyType="SINGLE",
+            orderLegCollection=[
+                {
+                    "instruction": "BUY",
+                    "quantity": 1,
+                    "instrument": {"symbol": "F", "assetType": "EQUITY"},
+                }
+            ],
+        )
+
+        result, error = self.api.place_order(
+            self.encrypted_account_number, order_request
+        )
+
+        self.assertIsInstance(result, Order)
+        (root,) = self.tracer.find("schwab_api.place_order")
+        self.assertEqual(
+            self.names(self.tracer.children(root)),
+            ["schwab_api.auth", "schwab_api.http", "schwab_api.get_single_order"],
+        )
+        (fetch,) = self.tracer.find("schwab_api.get_single_order")
+        self.assertEqual(
+            [
+                span.attributes["http.request.method"]
+                for span in self.tracer.children(fetch)
+                if span.name == "schwab_api.http"
+            ],
+            ["GET"],
+        )
+
+    @responses.activate
+    def test_concurrent_requests_keep_their_parent(self):
+        responses.add(
+            responses.GET, INSTRUMENTS_URL, json={"instruments": []}, status=200
+        )
+
+        self.api.instruments_map(["F", "AAPL", "MSFT"], chunk_size=1)
+
+        (root,) = self.tracer.find("schwab_api.instruments_map")
+        children = self.tracer.find("schwab_api.instruments")
+        self.assertEqual(len(children), 3)
+        self.assertTrue(all(child.parent_id == root.span_id for child in children))
+        self.assertTrue(all(child.trace_id == root.trace_id for child in children))
+
+
+if __name__ == "__main__":
+    unittest.main()
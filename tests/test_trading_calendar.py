@@ -0,0 +1,261 @@
+import unittest
+from unittest.mock import patch, mock_open
+import responses
+import json
+import os
+import tempfile
+from datetime import datetime, date, timedelta
+from urllib.parse import urlparse, parse_qs
+from zoneinfo import ZoneInfo
+
+from schwab_api_wrapper.utils import *
+from schwab_api_wrapper.file_client import FileClient
+from schwab_api_wrapper.trading_calendar import TradingCalendar
+from schwab_api_wrapper.market_hours_cache import MarketHoursCache
+from schwab_api_wrapper.schemas.market_data import MarketHoursResponse
+
+from tests.fixtures import fake_json, PARAMETERS_FILE_NAME
+
+
+def equity_hours(query_date: date) -> dict:
+    """
+    Weekdays open 09:30-16:00 New York time, weekends closed
+    """
+    if query_date.weekday() >= 5:
+        return {
+            "date": query_date.isoformat(),
+            "marketType": "EQUITY",
+            "product": "equity",
+            "isOpen": False,
+        }
+
+    def at(hour: int, minute: int) -> str:
+        return datetime(
+            query_date.year,
+            query_date.month,
+            query_date.day,
+            hour,
+            minute,
+            tzinfo=ZoneInfo("America/New_York"),
+        ).isoformat()
+
+    return {
+        "date": query_date.isoformat(),
+        "marketType": "EQUITY",
+        "product": "EQ",
+        "isOpen": True,
+        "sessionHours": {
+            "preMarket": [{"start": at(7, 0), "end": at(9, 30)}],
+            "regularMarket": [{"start": at(9, 30), "end": at(16, 0)}],
+            "postMarket": [{"start": at(16, 0), "end": at(20, 0)}],
+        },
+    }
+
+
+def market_hours_callback(request):
+    query_date = date.fromisoformat(parse_qs(urlparse(request.url).query)["date"][0])
+    return 200, {}, json.dumps({"equity": {"EQ": equity_hours(query_date)}})
+
+
+class TestTradingCalendar(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.calendar = TradingCalendar(self.api, markets=[MarketID.EQUITY], days=20)
+        self.today = datetime.now(ZoneInfo("America/New_York")).date()
+        self.monday = self.today + timedelta(days=7 - self.today.weekday())
+
+    def at(self, day: date, hour: int, minute: int = 0) -> datetime:
+        return datetime(
+            day.year,
+            day.month,
+            day.day,
+            hour,
+            minute,
+            tzinfo=ZoneInfo("America/New_York"),
+        )
+
+    @responses.activate
+    def test_queries_are_answered_locally(self):
+        responses.add_callback(
+            responses.GET, MARKET_HOURS_URL, callback=market_hours_callback
+        )
+
+        self.assertTrue(self.calendar.is_open(at=self.at(self.monday, 10)))
+        self.assertFalse(self.calendar.is_open(at=self.at(self.monday, 8)))
+        self.assertFalse(self.calendar.is_open(at=self.at(self.monday, 16)))
+
+        self.assertEqual(
+            self.calendar.next_open(after=self.at(self.monday, 17)),
+            self.at(self.monday + timedelta(days=1), 9, 30),
+        )
+        self.assertEqual(
+            self.calendar.next_close(after=self.at(self.monday, 12)),
+            self.at(self.monday, 16),
+        )
+
+        friday = self.monday + timedelta(days=4)
+        self.assertEqual(
+            self.calendar.next_open(after=self.at(friday, 16, 30)),
+            self.at(friday + timedelta(days=3), 9, 30),
+        )
+
+        self.assertEqual(
+            self.calendar.trading_days_between(
+                self.monday, self.monday + timedelta(days=7)
+            ),
+            5,
+        )
+
+        self.assertEqual(
+            len(responses.calls), 21
+        )  # loaded once, all later queries local
+
+    @responses.activate
+    def test_extended_sessions(self):
+        responses.add_callback(
+            responses.GET, MARKET_HOURS_URL, callback=market_hours_callback
+        )
+        calendar = TradingCalendar(
+            self.api,
+            markets=[MarketID.EQUITY],
+            sessions=("preMarket", "regularMarket", "postMarket"),
+            days=20,
+        )
+
+        self.assertTrue(calendar.is_open(at=self.at(self.monday, 8)))
+        self.assertEqual(
+            calendar.next_close(after=self.at(self.monday, 8)),
+            self.at(self.monday, 20),
+        )
+
+    @responses.activate
+    def test_failed_load(self):
+        responses.add(
+            responses.GET,
+            MARKET_HOURS_URL,
+            json={"errors": [{"id": "1", "status": 400, "title": "Bad Request"}]},
+            status=400,
+        )
+
+        self.assertFalse(self.calendar.is_open(at=self.at(self.monday, 10)))
+        calls = len(responses.calls)
+
+        self.assertIsNone(self.calendar.next_open(after=self.at(self.monday, 10)))
+        self.assertEqual(len(responses.calls), calls)  # no reload until retry_after
+
+    @responses.activate
+    def test_reload_uses_cache(self):
+        responses.add_callback(
+            responses.GET, MARKET_HOURS_URL, callback=market_hours_callback
+        )
+
+        self.assertIsNone(self.calendar.load())
+        self.assertIsNone(self.calendar.load())
+
+        self.assertEqual(len(responses.calls), 21)
+
+
+class TestMarketHoursRange(unittest.TestCase):
+    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(fake_json))
+    def setUp(self, mock_file) -> None:
+        self.api = FileClient(PARAMETERS_FILE_NAME, immediate_refresh=False)
+        self.today = datetime.now(ZoneInfo("America/New_York")).date()
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.directory.name, "market_hours.json")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    @responses.activate
+    def test_range_is_date_indexed(self):
+        responses.add_callback(
+            responses.GET, MARKET_HOURS_URL, callback=market_hours_callback
+        )
+        end = self.today + timedelta(days=9)
+
+        hours, error = self.api.market_hours_range([MarketID.EQUITY], self.today, end)
+
+        self.assertIsNone(error)
+        self.assertEqual(
+            list(hours), [self.today + timedelta(days=i) for i in range(10)]
+        )
+        for query_date, response in hours.items():
+            self.assertEqual(response.root["equity"]["EQ"].date, query_date)
+
+    @responses.activate
+    def test_cached_dates_are_not_refetched_after_restart(self):
+        responses.add_callback(
+            responses.GET, MARKET_HOURS_URL, callback=market_hours_callback
+        )
+
+        first, _ = self.api.market_hours_range(
+            [MarketID.EQUITY],
+            self.today,
+            self.today + timedelta(days=4),
+            cache=MarketHoursCache(self.cache_file),
+        )
+        self.assertEqual(len(responses.calls), 5)
+
+        restarted_cache = MarketHoursCache(self.cache_file)
+        second, error = self.api.market_hours_range(
+            [MarketID.EQUITY],
+            self.today,
+            self.today + timedelta(days=6),
+            cache=restarted_cache,
+        )
+
+        self.assertIsNone(error)
+        self.assertEqual(len(responses.calls), 7)  # only the two new dates
+        self.assertEqual(len(second), 7)
+        self.assertEqual(second[self.today], first[self.today])
+
+    @responses.activate
+    def test_range_error(self):
+        responses.add(
+            responses.GET,
+            MARKET_HOURS_URL,
+            json={"errors": [{"id": "1", "status": 400, "title": "Bad Request"}]},
+            status=400,
+        )
+
+        hours, error = self.api.market_hours_range(
+            [MarketID.EQUITY], self.today, self.today + timedelta(days=2), retry=False
+        )
+
+        self.assertIsNone(hours)
+        self.assertEqual(error.errors[0].title, "Bad Request")
+
+    @responses.activate
+    def test_invalid_range_raises_before_any_request(self):
+        with self.assertRaises(ValueError):
+            self.api.market_hours_range(
+                [MarketID.EQUITY], self.today, self.today - timedelta(days=1)
+            )
+        with self.assertRaises(ValueError):
+            self.api.market_hours_range(
+                [MarketID.EQUITY],
+                self.today + timedelta(days=360),
+                self.today + timedelta(days=370),
+            )
+
+        self.assertEqual(len(responses.calls), 0)
+
+    @responses.activate
+    def test_cached_past_dates_are_valid(self):
+        cache = MarketHoursCache(self.cache_file)
+        yesterday = self.today - timedelta(days=1)
+        response = MarketHoursResponse({"equity": {"EQ": equity_hours(yesterday)}})
+        cache.put(yesterday, [MarketID.EQUITY], response)
+
+        hours, error = self.api.market_hours_range(
+            [MarketID.EQUITY], yesterday, yesterday, cache=cache
+        )
+
+        self.assertIsNone(error)
+        self.assertEqual(list(hours), [yesterday])
+        self.assertEqual(len(responses.calls), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()